@@ -0,0 +1,22 @@
+"""
+Timing helper shared by the benchmarks. The benchmarks are run as scripts from the dblp-fetcher directory, which puts
+this directory on the import path.
+"""
+
+import time
+from typing import Callable, Optional
+
+
+def best_of(repetitions: int, function: Callable, setup: Optional[Callable] = None) -> float:
+    """
+    Returns the shortest wall time of the function in the given number of runs. If setup is given, its result is passed
+    to the function, and it is not measured.
+    """
+
+    best = float("inf")
+    for _ in range(repetitions):
+        arguments = (setup(),) if setup is not None else ()
+        start = time.perf_counter()
+        function(*arguments)
+        best = min(best, time.perf_counter() - start)
+    return best
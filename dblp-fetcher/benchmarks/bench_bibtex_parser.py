@@ -0,0 +1,30 @@
+"""
+Compares the parsing engines of Bibliography.from_bibtex on data/sda.bib. Run from the dblp-fetcher directory:
+
+    poetry run python benchmarks/bench_bibtex_parser.py
+"""
+
+from dblp_fetcher.publications.model import Bibliography
+
+from _timing import best_of
+
+_BIBTEX_PATH = "data/sda.bib"
+_REPETITIONS = 3
+
+
+def main() -> None:
+    with open(_BIBTEX_PATH, "r", encoding="UTF-8") as bib:
+        bibtex_string = bib.read()
+
+    results = {}
+    for engine in ["bibtexparser", "streaming"]:
+        seconds = best_of(_REPETITIONS, lambda: Bibliography.from_bibtex(bibtex_string, engine=engine))
+        results[engine] = seconds
+        print(f"{engine:>12}: {seconds:.3f}s")
+
+    print(f"Speedup of the streaming engine: {results['bibtexparser'] / results['streaming']:.1f}x")
+
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Compares the SubstitutionEngine with applying the replacement rules one after another with re.sub, on all property
+values of data/sda.bib. Run from the dblp-fetcher directory:
+
+    poetry run python benchmarks/bench_global_replacements.py
+"""
+
+import json
+import re
+
+from dblp_fetcher.publications.model import Bibliography
+from dblp_fetcher.util import SubstitutionEngine
+
+from _timing import best_of
+
+_BIBTEX_PATH = "data/sda.bib"
+_REPLACEMENTS_PATH = "data/replacements.json"
+_REPETITIONS = 5
+
+
+def main() -> None:
+    with open(_BIBTEX_PATH, "r", encoding="UTF-8") as bib:
+        bibliography = Bibliography.from_bibtex_file(bib)
+    with open(_REPLACEMENTS_PATH, "r", encoding="UTF-8") as file:
+        rules = [(pattern, replacement) for pattern, replacement in json.load(file)]
+
+    values = [value for publication in bibliography.publications for value in publication.bibtex_dict.values()]
+    print(f"{len(values)} values, {len(rules)} rules")
+
+    sequential = best_of(_REPETITIONS, lambda: [_apply_sequentially(rules, value) for value in values])
+    print(f"  sequential re.sub: {sequential:.4f}s")
+
+    engine = SubstitutionEngine(rules)
+    single_pass = best_of(_REPETITIONS, lambda: [engine.apply(value) for value in values])
+    print(f"SubstitutionEngine: {single_pass:.4f}s")
+
+    print(f"Speedup: {sequential / single_pass:.1f}x")
+
+
+def _apply_sequentially(rules: list[tuple[str, str]], value: str) -> str:
+    for pattern, replacement in rules:
+        value = re.sub(pattern, replacement, value)
+    return value
+
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+"""
+Measures the stages of the fetch-merge-write pipeline on synthetic bibliographies of growing size. The entries are
+variations of the entries in data/sda.bib. DBLP is replaced by a local HTTP server, which serves the bibliographies of
+a synthetic roster of associates and answers conditional requests like DBLP. Run from the dblp-fetcher directory:
+
+    poetry run python benchmarks/bench_pipeline.py --output results.json
+
+The results are written as JSON. If a previous result file is passed with --baseline, every measurement that is more
+than --tolerance slower than in the baseline is reported as a regression, and the script exits with status 1:
+
+    poetry run python benchmarks/bench_pipeline.py --baseline results.json
+"""
+
+import argparse
+import hashlib
+import json
+import platform
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from dblp_fetcher.main import _postprocess_bibliography
+from dblp_fetcher.persons.model import Person
+from dblp_fetcher.publications import DblpSession, fetch_and_merge_bibliographies, fetch_bibliographies
+from dblp_fetcher.publications.model import Bibliography, Publication
+from dblp_fetcher.util import HttpCache
+
+from _timing import best_of
+
+_BIBTEX_PATH = "data/sda.bib"
+_SIZES = [1_000, 10_000, 100_000]
+_ASSOCIATES = 50
+_REPETITIONS = 3
+_TOLERANCE = 0.25
+
+
+def main() -> None:
+    arguments = _parse_arguments()
+
+    with open(_BIBTEX_PATH, "r", encoding="UTF-8") as bib:
+        templates = [publication.bibtex_dict for publication in Bibliography.from_bibtex_file(bib).publications]
+
+    measurements = {}
+    for size in arguments.sizes:
+        print(f"{size} entries:")
+        for name, seconds in _measure_size(templates, size, arguments.associates, arguments.repetitions).items():
+            measurements[f"{name}[{size}]"] = seconds
+            print(f"  {name:>18}: {seconds:.3f}s")
+
+    results = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repetitions": arguments.repetitions,
+        "measurements": measurements,
+    }
+    if arguments.output is not None:
+        with open(arguments.output, "w", encoding="UTF-8") as file:
+            json.dump(results, file, indent=2)
+            file.write("\n")
+
+    if arguments.baseline is not None:
+        with open(arguments.baseline, "r", encoding="UTF-8") as file:
+            baseline = json.load(file)["measurements"]
+        regressions = _find_regressions(measurements, baseline, arguments.tolerance)
+        for name, seconds, baseline_seconds in regressions:
+            print(f"Regression: {name} took {seconds:.3f}s instead of {baseline_seconds:.3f}s")
+        if len(regressions) > 0:
+            sys.exit(1)
+        print(f"No regressions compared to {arguments.baseline}.")
+
+
+def _parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmarks the fetch-merge-write pipeline.")
+    parser.add_argument(
+        "--sizes",
+        type=lambda value: [int(size) for size in value.split(",")],
+        default=_SIZES,
+        help="comma-separated numbers of entries"
+    )
+    parser.add_argument("--associates", type=int, default=_ASSOCIATES, help="number of associates in the roster")
+    parser.add_argument("--repetitions", type=int, default=_REPETITIONS, help="the best of this many runs is reported")
+    parser.add_argument("--output", help="JSON file the results are written to")
+    parser.add_argument("--baseline", help="JSON file with previous results to compare against")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=_TOLERANCE,
+        help="relative slowdown compared to the baseline that counts as a regression"
+    )
+    return parser.parse_args()
+
+
+def _measure_size(templates: list[dict[str, str]], size: int, associates: int, repetitions: int) -> dict[str, float]:
+    """
+    Returns the best wall time of each stage on a bibliography with the given number of entries.
+    """
+
+    known_dicts = _synthetic_bibtex_dicts(templates, 0, size)
+    # Half of the fetched entries are already known, the other half is new.
+    fetched_dicts = _synthetic_bibtex_dicts(templates, size // 2, size)
+    known_bibtex = Bibliography([Publication(bibtex_dict) for bibtex_dict in known_dicts]).to_bibtex()
+    roster, responses = _synthetic_roster(fetched_dicts, associates)
+
+    results = {
+        "from_bibtex": best_of(repetitions, lambda: Bibliography.from_bibtex(known_bibtex)),
+        "update": best_of(
+            repetitions,
+            lambda bibliographies: bibliographies[0].update(bibliographies[1]),
+            lambda: (_bibliography(known_dicts), _bibliography(fetched_dicts))
+        ),
+        "postprocess": best_of(repetitions, _postprocess_bibliography, lambda: _bibliography(known_dicts)),
+        "to_bibtex": best_of(repetitions, Bibliography.to_bibtex, lambda: _bibliography(known_dicts)),
+    }
+
+    with _DblpStandIn(responses) as stand_in:
+        for person in roster:
+            person.dblp_url = f"{stand_in.url}/pid/{person.author_id}"
+
+        results["fetch"] = best_of(repetitions, lambda: fetch_bibliographies(roster, session=DblpSession()))
+        results["fetch_and_merge"] = best_of(
+            repetitions,
+            lambda known: fetch_and_merge_bibliographies(roster, lambda: known, session=DblpSession()),
+            lambda: _bibliography(known_dicts)
+        )
+
+        with tempfile.TemporaryDirectory() as cache_directory:
+            cache = HttpCache(cache_directory)
+            fetch_bibliographies(roster, session=DblpSession(), cache=cache)
+            results["fetch_revalidated"] = best_of(
+                repetitions,
+                lambda: fetch_bibliographies(roster, session=DblpSession(), cache=cache)
+            )
+
+    return results
+
+
+def _synthetic_bibtex_dicts(templates: list[dict[str, str]], start: int, count: int) -> list[dict[str, str]]:
+    """
+    Returns count bibtex dictionaries with distinct titles, numbered from start. Entries with the same number have the
+    same title, so they are merged.
+    """
+
+    result = []
+    for number in range(start, start + count):
+        bibtex_dict = dict(templates[number % len(templates)])
+        bibtex_dict["ID"] = f"{bibtex_dict['ID']}-{number}"
+        bibtex_dict["title"] = f"{bibtex_dict.get('title', 'Untitled')} Variant {_number_to_words(number)}"
+        result.append(bibtex_dict)
+    return result
+
+
+def _number_to_words(number: int) -> str:
+    """
+    Spells the digits of the number, e.g. "One Two" for 12. The normalized title keeps digits, but titles that only
+    differ in a number would look like near duplicates with a different edition otherwise.
+    """
+
+    words = ["Zero", "One", "Two", "Three", "Four", "Five", "Six", "Seven", "Eight", "Nine"]
+    return " ".join(words[int(digit)] for digit in str(number))
+
+
+def _synthetic_roster(
+        bibtex_dicts: list[dict[str, str]],
+        associates: int
+) -> tuple[list[Person], dict[str, bytes]]:
+    """
+    Distributes the entries among the given number of associates. Returns the associates and the bibtex response of
+    each, keyed by the path under which the stand-in serves it.
+    """
+
+    roster = []
+    responses = {}
+    for index in range(associates):
+        author_id = f"associate-{index}"
+        roster.append(Person(author_id, start_year=1990))
+        bibliography = _bibliography(bibtex_dicts[index::associates])
+        responses[f"/pid/{author_id}.bib"] = bibliography.to_bibtex().encode("UTF-8")
+    return roster, responses
+
+
+def _bibliography(bibtex_dicts: list[dict[str, str]]) -> Bibliography:
+    return Bibliography(Publication(dict(bibtex_dict)) for bibtex_dict in bibtex_dicts)
+
+
+class _DblpStandIn:
+    """
+    Serves fixed bibtex responses on a free local port like DBLP does, including ETags and 304 responses to conditional
+    requests.
+    """
+
+    def __init__(self, responses: dict[str, bytes]):
+        etags = {path: f'"{hashlib.sha256(body).hexdigest()}"' for path, body in responses.items()}
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                body = responses.get(self.path)
+                if body is None:
+                    self.send_response(404)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                elif self.headers.get("If-None-Match") == etags[self.path]:
+                    self.send_response(304)
+                    self.send_header("ETag", etags[self.path])
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                else:
+                    self.send_response(200)
+                    self.send_header("ETag", etags[self.path])
+                    self.send_header("Content-Type", "application/x-bibtex")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+
+            def log_message(self, *_):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *_):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def _find_regressions(
+        measurements: dict[str, float],
+        baseline: dict[str, float],
+        tolerance: float
+) -> list[tuple[str, float, float]]:
+    """
+    Returns the name, the time, and the baseline time of all measurements that are more than the tolerance slower than
+    the baseline. Measurements that are missing from the baseline are ignored.
+    """
+
+    return [
+        (name, seconds, baseline[name])
+        for name, seconds in measurements.items()
+        if name in baseline and seconds > baseline[name] * (1 + tolerance)
+    ]
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,21 @@
+import argparse
+import hashlib
+import io
+import json
 import logging
-import re
+import os
+from typing import Callable, Optional
 
-from dblp_fetcher.persons import fetch_sda_associates
+from dblp_fetcher.persons import RosterSnapshot, fetch_sda_associates, read_sda_associates
+from dblp_fetcher.postprocessing import PostprocessingPipeline, Stage, remove_property, remove_unwanted_publications, \
+    run_substitutions
 
 # The ID and range of the DBLP spreadsheet.
-from dblp_fetcher.publications import fetch_bibliography
-from dblp_fetcher.publications.model import Bibliography, TitleBlacklist, Publication
+from dblp_fetcher.publications import DblpSession, FingerprintStore, PersonResolver, \
+    fetch_and_merge_bibliographies, read_bibliographies_from_dump
+from dblp_fetcher.publications.model import Bibliography, BibliographyDiff, BibliographyStore, NearDuplicateIndex, \
+    TitleBlacklist, diff_bibliographies, merge_near_duplicates
+from dblp_fetcher.util import HttpCache, RateLimiter, SubstitutionEngine, atomic_write, metrics
 
 _SPREADSHEET_ID = '1YJCn0a30M6aQBra9LgcfrNZ9rGudpjU62SiaBVyFgec'
 _RANGE_NAME = 'Data!B2:E'
@@ -14,119 +24,488 @@ _RANGE_NAME = 'Data!B2:E'
 _CREDENTIALS_PATH = 'secret/credentials.json'
 _TOKEN_PATH = 'secret/token.pickle'
 
+# Snapshot of the spreadsheet, which is used instead of reading the spreadsheet again as long as the spreadsheet was not
+# modified since. Within the maximum age in seconds, it is used without checking for modifications.
+_ROSTER_SNAPSHOT_PATH = "cache/roster.json"
+_ROSTER_MAX_AGE = 0
+
 # Bibtex file with publications we already know.
 _KNOWN_PUBLICATION_PATH = "data/sda.bib"
 
 # Text file with titles of publications that should be ignored (e.g. because they are included with a different title).
 _BLACKLIST_PATH = "data/blacklist.txt"
 
+# Directory in which the compiled blacklist is cached.
+_BLACKLIST_CACHE_PATH = "cache"
+
+# JSON file with [pattern, replacement] pairs that are applied to all properties of all publications.
+_REPLACEMENTS_PATH = "data/replacements.json"
+
+# Maximum number of concurrent requests and maximum number of requests per second to the same host.
+_MAX_WORKERS = 8
+_REQUESTS_PER_SECOND = 4.0
+
+# Connect and read timeouts for requests to DBLP in seconds, and how often failed requests are retried.
+_CONNECT_TIMEOUT = 10.0
+_READ_TIMEOUT = 60.0
+_MAX_RETRIES = 5
+
+# Directory with cached DBLP responses. Responses that were not revalidated for 30 days are evicted, and the cache is
+# kept below 256 MB.
+_CACHE_PATH = "cache/dblp"
+_CACHE_TTL = 30 * 24 * 60 * 60
+_CACHE_MAX_SIZE = 256 * 1024 * 1024
+
+# Snapshot of the parsed known publications, which is loaded instead of parsing them as long as sda.bib is unchanged.
+_SNAPSHOT_PATH = "cache/sda.snapshot"
+
+# Index that maps author names to DBLP person keys. Used for associates without a DBLP URL in the spreadsheet.
+_PERSON_INDEX_PATH = "cache/persons.json"
+
+# Fingerprints of the DBLP content that was merged in the last run. Used by the incremental mode.
+_FINGERPRINTS_PATH = "cache/fingerprints.json"
+
 
 def main() -> None:
     logging.basicConfig(level=logging.INFO)
-
-    # Fetch all SDA associates.
-    logging.info("Fetching SDA associates...")
-    sda_associates = fetch_sda_associates(
-        spreadsheet_id=_SPREADSHEET_ID,
-        range_name=_RANGE_NAME,
-        credentials_path=_CREDENTIALS_PATH,
-        token_path=_TOKEN_PATH
+    arguments = _parse_arguments()
+
+    try:
+        with metrics.timer("run"):
+            _run(arguments)
+    finally:
+        if arguments.metrics_output is not None:
+            _write_metrics(arguments.metrics_output, arguments.metrics_format)
+
+
+def _run(arguments: argparse.Namespace) -> None:
+    session = DblpSession(
+        pool_size=arguments.max_workers,
+        timeout=(_CONNECT_TIMEOUT, arguments.timeout),
+        max_retries=_MAX_RETRIES,
+        rate_limiter=RateLimiter(arguments.requests_per_second)
     )
 
-    # Update bibliography
-    logging.info("Parsing known publications...")
-    complete_bibliography = _read_known_publications()
-
-    for sda_associate in sda_associates:
-        logging.info(f"Fetching publications for {sda_associate.author_id}...")
-        associate_bibliography = fetch_bibliography(sda_associate)
-        complete_bibliography.update(associate_bibliography)
+    # Fetch all SDA associates. With a dump, unknown DBLP profiles are only resolved from the names in the dump.
+    logging.info("Fetching SDA associates...")
+    with metrics.timer("stage", stage="associates"):
+        resolver = PersonResolver(
+            _PERSON_INDEX_PATH,
+            session=None if arguments.offline or arguments.dblp_dump is not None else session,
+            max_workers=arguments.max_workers
+        )
+        if arguments.dblp_dump is not None:
+            resolver.add_names_from_dump(arguments.dblp_dump)
+        if arguments.roster is not None:
+            sda_associates = read_sda_associates(arguments.roster, resolver=resolver)
+        else:
+            sda_associates = fetch_sda_associates(
+                spreadsheet_id=_SPREADSHEET_ID,
+                range_name=_RANGE_NAME,
+                credentials_path=_CREDENTIALS_PATH,
+                token_path=_TOKEN_PATH,
+                resolver=resolver,
+                snapshot=RosterSnapshot(_ROSTER_SNAPSHOT_PATH),
+                max_age=arguments.roster_max_age * 60 * 60,
+                offline=arguments.offline
+            )
+        resolver.save()
+    metrics.increment("associates", len(sda_associates))
+
+    # Fetch bibliographies of all associates
+    cache = HttpCache(_CACHE_PATH, ttl=_CACHE_TTL, max_size=_CACHE_MAX_SIZE)
+    fingerprints = None
+    if arguments.incremental and arguments.dblp_dump is None:
+        fingerprints = FingerprintStore(_FINGERPRINTS_PATH, _fingerprint_context(arguments.store))
+
+    store = BibliographyStore(arguments.store) if arguments.store is not None else None
+
+    # The known publications as they were before the merge, which the diff is computed against. Without a store, they
+    # also tell whether sda.bib needs to be rewritten.
+    known_bibliography = None
+
+    def read_known_publications() -> Bibliography:
+        nonlocal known_bibliography
+        bibliography = _read_known_publications(store)
+        if arguments.diff_output is not None or store is None:
+            known_bibliography = PostprocessingPipeline(_create_rewriting_stages()).run(bibliography.copy())
+        return bibliography
+
+    # Merging happens in spreadsheet order, so the result does not depend on the order in which downloads finish.
+    if arguments.dblp_dump is not None:
+        with metrics.timer("stage", stage="fetch"):
+            # The names of the associates were read with the names of all persons, so the dump is only read once more.
+            person_names = resolver.person_names_from_dump(arguments.dblp_dump, sda_associates)
+            resolver.save()
+            associate_bibliographies = read_bibliographies_from_dump(
+                arguments.dblp_dump,
+                sda_associates,
+                person_names=person_names
+            )
+
+        complete_bibliography = _read_and_merge(read_known_publications, associate_bibliographies)
+    else:
+        # Downloads, parsing, and merging overlap, so the fetch stage includes the merge stage.
+        with metrics.timer("stage", stage="fetch"):
+            complete_bibliography = fetch_and_merge_bibliographies(
+                sda_associates,
+                read_known_publications,
+                session=session,
+                max_workers=arguments.max_workers,
+                cache=cache,
+                offline=arguments.offline,
+                fingerprints=fingerprints
+            )
+            if not arguments.offline:
+                cache.evict()
+
+        if complete_bibliography is None and fingerprints is not None:
+            logging.info("No publications changed since the last run.")
+            fingerprints.save(_fingerprint_context(arguments.store))
+            if arguments.diff_output is not None:
+                _write_diff(arguments.diff_output, BibliographyDiff())
+            if store is not None:
+                store.close()
+            session.log_statistics()
+            return
+
+        if complete_bibliography is None:
+            complete_bibliography = _read_and_merge(read_known_publications, [])
 
     # Postprocess bibliography
     logging.info("Postprocessing bibliography...")
-    _postprocess_bibliography(complete_bibliography)
+    with metrics.timer("stage", stage="postprocess"):
+        merged_count = len(complete_bibliography.publications)
+        _postprocess_bibliography(complete_bibliography)
+        metrics.increment("publications_dropped", merged_count - len(complete_bibliography.publications))
+
+    # Detect publications that were not merged because their titles differ slightly
+    logging.info("Detecting near-duplicate publications...")
+    with metrics.timer("stage", stage="near_duplicates"):
+        _handle_near_duplicates(complete_bibliography, arguments.merge_near_duplicates)
+
+    if arguments.diff_output is not None:
+        with metrics.timer("stage", stage="diff"):
+            diff = diff_bibliographies(known_bibliography, complete_bibliography)
+            _log_diff(diff)
+            _write_diff(arguments.diff_output, diff)
 
     # Write bibliography to file
-    logging.info("Writing updated bibliography to file...")
-    _write_updated_bibliography(complete_bibliography)
+    if store is not None:
+        logging.info("Saving updated bibliography to the store...")
+        with metrics.timer("stage", stage="store"):
+            written, removed = store.save(complete_bibliography)
+        logging.info(f"Wrote {written} and removed {removed} publications.")
+        store.close()
+
+    if store is None and _has_same_content(known_bibliography, complete_bibliography):
+        logging.info("No publications changed, keeping the file of known publications.")
+    elif store is None or arguments.export_bibtex:
+        logging.info("Writing updated bibliography to file...")
+        with metrics.timer("stage", stage="write"):
+            _write_updated_bibliography(complete_bibliography)
+        metrics.increment("publications_written", len(complete_bibliography.publications))
+
+    if fingerprints is not None:
+        fingerprints.save(_fingerprint_context(arguments.store))
+
+    session.log_statistics()
+
+
+def _parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Fetches the publications of all SDA associates from DBLP.")
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=_MAX_WORKERS,
+        help="maximum number of concurrent requests to DBLP"
+    )
+    parser.add_argument(
+        "--requests-per-second",
+        type=float,
+        default=_REQUESTS_PER_SECOND,
+        help="maximum number of requests per second to the same host, 0 for no limit"
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=_READ_TIMEOUT,
+        help="read timeout for requests to DBLP in seconds"
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="only use cached DBLP responses and the roster snapshot instead of sending requests"
+    )
+    parser.add_argument(
+        "--roster",
+        help="read the SDA associates from a local CSV or JSON file instead of the spreadsheet"
+    )
+    parser.add_argument(
+        "--roster-max-age",
+        type=float,
+        default=_ROSTER_MAX_AGE / (60 * 60),
+        help="maximum age of the roster snapshot in hours during which it is used without checking the spreadsheet for "
+             "changes"
+    )
+    parser.add_argument(
+        "--dblp-dump",
+        help="read the publications from a local dblp.xml or dblp.xml.gz dump instead of fetching them"
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="only merge publications that changed on DBLP since the last incremental run"
+    )
+    parser.add_argument(
+        "--merge-near-duplicates",
+        action="store_true",
+        help="merge publications with nearly identical titles instead of only reporting them"
+    )
+    parser.add_argument(
+        "--store",
+        help="SQLite database that keeps the known publications instead of sda.bib, created from sda.bib if it is empty"
+    )
+    parser.add_argument(
+        "--export-bibtex",
+        action="store_true",
+        help="also write all publications to sda.bib when using --store"
+    )
+    parser.add_argument(
+        "--diff-output",
+        help="file to which the added and changed publications are written, as JSON if it ends with .json and as "
+             "bibtex otherwise"
+    )
+    parser.add_argument(
+        "--metrics-output",
+        help="file to which timings and counters of the run are written at the end"
+    )
+    parser.add_argument(
+        "--metrics-format",
+        choices=["json", "prometheus"],
+        default="json",
+        help="format of the metrics file"
+    )
+    return parser.parse_args()
+
+
+def _fingerprint_context(store_path: Optional[str]) -> str:
+    """
+    Returns a fingerprint of the known publications, the blacklist, the replacements, and the store of publications if
+    one is used. The fingerprints of the incremental mode are only valid as long as none of them is changed by anything
+    but this program.
+    """
 
+    digest = hashlib.sha256()
+    for path in [_KNOWN_PUBLICATION_PATH, _BLACKLIST_PATH, _REPLACEMENTS_PATH, store_path]:
+        if path is None or not os.path.exists(path):
+            digest.update(b"missing")
+            continue
+        with open(path, "rb") as file:
+            digest.update(hashlib.sha256(file.read()).digest())
+    return digest.hexdigest()
 
-def _read_known_publications() -> Bibliography:
+
+def _has_same_content(first: Bibliography, second: Bibliography) -> bool:
+    """
+    Checks if both bibliographies contain publications with the same IDs and content hashes.
+    """
+
+    if len(first.publications) != len(second.publications):
+        return False
+
+    hashes = {publication.id: publication.content_hash for publication in first.publications}
+    return all(hashes.get(publication.id) == publication.content_hash for publication in second.publications)
+
+
+def _read_and_merge(
+        read_known_publications: Callable[[], Bibliography],
+        associate_bibliographies: list[Bibliography]
+) -> Bibliography:
     """
-    Reads the known publications from the file.
+    Reads the known publications and merges the bibliographies of the associates into them in the given order.
     """
 
-    with open(_KNOWN_PUBLICATION_PATH, "r", encoding="UTF-8") as bib:
-        return Bibliography.from_bibtex(bib.read())
+    logging.info("Reading known publications...")
+    with metrics.timer("stage", stage="read_known_publications"):
+        complete_bibliography = read_known_publications()
+
+    with metrics.timer("stage", stage="merge"):
+        known_count = len(complete_bibliography.publications)
+        for associate_bibliography in associate_bibliographies:
+            complete_bibliography.update(associate_bibliography)
+            metrics.increment("publications_merged", len(associate_bibliography.publications))
+        metrics.increment("publications_added", len(complete_bibliography.publications) - known_count)
+
+    return complete_bibliography
+
+
+def _read_known_publications(store: Optional[BibliographyStore] = None) -> Bibliography:
+    """
+    Reads the known publications from the store, or from the file if no store is given. An empty store is filled with
+    the publications from the file first.
+    """
+
+    if store is not None and len(store) > 0:
+        return store.load()
+
+    bibliography = _read_known_publication_file()
+
+    if store is not None:
+        store.save(bibliography)
+
+    return bibliography
+
+
+def _read_known_publication_file() -> Bibliography:
+    """
+    Reads the known publications from the snapshot if it was created from the current file, and from the file itself
+    otherwise. In the latter case, the snapshot is recreated for the next run.
+    """
+
+    with open(_KNOWN_PUBLICATION_PATH, "rb") as bib:
+        content = bib.read()
+    digest = hashlib.sha256(content).digest()
+
+    try:
+        with open(_SNAPSHOT_PATH, "rb") as snapshot:
+            bibliography = Bibliography.from_snapshot(snapshot, digest)
+    except FileNotFoundError:
+        bibliography = None
+
+    if bibliography is not None:
+        logging.info("Loaded known publications from snapshot.")
+        return bibliography
+
+    bibliography = Bibliography.from_bibtex_file(io.BytesIO(content))
+
+    os.makedirs(os.path.dirname(_SNAPSHOT_PATH), exist_ok=True)
+    with atomic_write(_SNAPSHOT_PATH, "wb") as snapshot:
+        bibliography.write_snapshot(snapshot, digest)
+
+    return bibliography
 
 
 def _postprocess_bibliography(bibliography: Bibliography) -> None:
-    _remove_unwanted_publications(bibliography)
-    _remove_editor_property(bibliography)
-    _run_global_replacements(bibliography)
+    _create_postprocessing_pipeline().run(bibliography)
 
 
-def _remove_unwanted_publications(bibliography: Bibliography) -> None:
-    blacklist = _read_blacklist()
+def _create_postprocessing_pipeline() -> PostprocessingPipeline:
+    """
+    Returns the pipeline that removes unwanted publications and the editor property, and runs global replacements.
+    """
 
-    for publication in bibliography.publications:
-        if _is_unwanted(publication, blacklist):
-            bibliography.remove_publication_by_id(publication.id)
+    return PostprocessingPipeline([
+        remove_unwanted_publications(_read_blacklist()),
+        *_create_rewriting_stages(),
+    ])
 
 
-def _is_unwanted(publication: Publication, blacklist: TitleBlacklist) -> bool:
+def _create_rewriting_stages() -> list[Stage]:
     """
-    Returns whether the given publication is unwanted. This is the case if the publication has no author or title, if
-    the title is blacklisted, or if the publication is an arXiv preprint.
+    Returns the stages of the postprocessing pipeline that rewrite properties. They are also applied to the known
+    publications before these are compared with the updated ones, since the bibtex parser undoes some of the
+    replacements, e.g. it turns \\textquotesingle{} into \\textquotesingle.
     """
 
-    return publication.author is None or publication.title is None or blacklist.is_blacklisted(publication.title) or \
-           publication.is_arxiv_preprint()
+    return [
+        remove_property("editor"),
+        run_substitutions(SubstitutionEngine.from_file(_REPLACEMENTS_PATH)),
+    ]
 
 
 def _read_blacklist() -> TitleBlacklist:
     """
-    Reads titles from the blacklist file.
+    Reads the blacklist rules from the file, or the compiled blacklist from the cache if the file did not change.
     """
 
-    with open(_BLACKLIST_PATH, "r", encoding="UTF-8") as blacklist:
-        return TitleBlacklist([
-            line.strip()
-            for line in blacklist
-            if line.strip() != ""
-        ])
+    return TitleBlacklist.from_file(_BLACKLIST_PATH, cache_directory=_BLACKLIST_CACHE_PATH)
 
 
-def _remove_editor_property(bibliography) -> None:
+def _handle_near_duplicates(bibliography: Bibliography, merge: bool) -> None:
     """
-    Removes the editor property from all publications.
+    Logs all pairs of publications with nearly identical titles, and merges them if merge is set. Pairs that were only
+    found by their title prefix are never merged.
     """
 
-    for publication in bibliography.publications:
-        publication.remove_property("editor")
+    index = NearDuplicateIndex().add_all(bibliography.publications)
+    near_duplicates = index.find_near_duplicates()
 
+    statistics = index.statistics
+    metrics.increment("near_duplicates_found", len(near_duplicates))
+    logging.info(
+        f"Compared {statistics.candidate_pairs} candidate pairs of {statistics.publications} publications and found "
+        f"{statistics.near_duplicates} near duplicates in {statistics.index_seconds + statistics.search_seconds:.2f}s."
+    )
+
+    for near_duplicate in near_duplicates:
+        reason = "title prefix, not merged" if near_duplicate.by_prefix else "similar titles"
+        logging.warning(
+            f"Possible duplicate ({reason}, similarity {near_duplicate.similarity:.2f}): "
+            f"{near_duplicate.first.title!r} and {near_duplicate.second.title!r}"
+        )
+
+    if merge:
+        removed = merge_near_duplicates(bibliography, near_duplicates)
+        metrics.increment("near_duplicates_merged", removed)
+        logging.info(f"Merged {removed} near-duplicate publications.")
 
-def _run_global_replacements(bibliography: Bibliography) -> None:
+
+def _log_diff(diff: BibliographyDiff) -> None:
     """
-    Replaces all occurrences of a string in the bibliography with another string.
+    Logs the added, changed, and removed publications, and the changed fields of the changed ones.
     """
 
-    substitutions = [
-        ("\\\\textasciigrave\\s*", "\\\\textasciigrave{}"),
-        ("\\\\textasciitilde\\s*", "\\\\textasciitilde{}"),
-        ("\\\\textbackslash\\s*", "\\\\textbackslash{}"),
-        ("\\\\textendash\\s*", "\\\\textendash "),
-        ("\\\\textquotesingle\\s*", "\\\\textquotesingle{}"),
-        ("\\\\ast\\s*", "* "),
-    ]
+    for publication in diff.added:
+        logging.info(f"Added publication {publication.id}")
+    for changed in diff.changed:
+        fields = ", ".join(change.field for change in changed.changes)
+        logging.info(f"Changed publication {changed.new.id} ({fields})")
+    for publication in diff.removed:
+        logging.info(f"Removed publication {publication.id}")
+
+    metrics.increment("publications_diff_added", len(diff.added))
+    metrics.increment("publications_diff_changed", len(diff.changed))
+    metrics.increment("publications_diff_removed", len(diff.removed))
+    logging.info(f"Added {len(diff.added)}, changed {len(diff.changed)}, and removed {len(diff.removed)} publications.")
+
+
+def _write_diff(path: str, diff: BibliographyDiff) -> None:
+    """
+    Writes the added and changed publications to the file, as JSON with the changed fields and the removed IDs if it
+    ends with .json, and as bibtex otherwise.
+    """
 
-    for publication in bibliography.publications:
-        for key, value in publication.bibtex_dict.items():
-            for pattern, replacement in substitutions:
-                value = re.sub(pattern, replacement, value)
-            publication.bibtex_dict[key] = value
+    directory = os.path.dirname(path)
+    if directory != "":
+        os.makedirs(directory, exist_ok=True)
+
+    with atomic_write(path, encoding="UTF-8") as file:
+        if path.endswith(".json"):
+            json.dump(diff.to_json(), file, indent=2)
+            file.write("\n")
+        else:
+            diff.to_bibliography().write_bibtex(file)
+
+
+def _write_metrics(path: str, metrics_format: str) -> None:
+    """
+    Writes all metrics recorded during the run to the file in the given format.
+    """
+
+    directory = os.path.dirname(path)
+    if directory != "":
+        os.makedirs(directory, exist_ok=True)
+
+    with atomic_write(path, encoding="UTF-8") as file:
+        metrics.write(file, metrics_format)
 
 
 def _write_updated_bibliography(bibliography: Bibliography) -> None:
-    with open(_KNOWN_PUBLICATION_PATH, "w", encoding="UTF-8") as bib:
-        bib.write(bibliography.to_bibtex())
+    """
+    Writes the bibliography to the file of known publications. The file is replaced atomically, so it is never left
+    truncated.
+    """
+
+    with atomic_write(_KNOWN_PUBLICATION_PATH, encoding="UTF-8") as bib:
+        bibliography.write_bibtex(bib)
@@ -1 +1,2 @@
-from ._fetch_sda_associates import fetch_sda_associates
+from ._fetch_sda_associates import fetch_sda_associates, read_sda_associates
+from ._roster import RosterSnapshot, read_roster_file
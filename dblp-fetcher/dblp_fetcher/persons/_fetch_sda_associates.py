@@ -1,38 +1,111 @@
+from __future__ import annotations
+
 import logging
+import re
+from typing import TYPE_CHECKING, Optional
 
+from dblp_fetcher.persons._roster import RosterSnapshot, read_roster_file
 from dblp_fetcher.persons.model import Person
-from dblp_fetcher.util import url_from_string, year_from_string, fetch_data_from_google_sheets, fetch_google_credentials
+from dblp_fetcher.util import SCOPE_METADATA_READONLY, SCOPE_READONLY, url_from_string, year_from_string, \
+    fetch_data_from_google_sheets, fetch_google_credentials, fetch_spreadsheet_revision
+
+# The publications package depends on the persons package, so the resolver is only imported for type checking.
+if TYPE_CHECKING:
+    from dblp_fetcher.publications import PersonResolver
+
+# Author IDs that are a DBLP person key with "/" replaced by "-", e.g. "71-4882", "81-4530-1", or "l-ChristophLange2".
+_PID_AUTHOR_ID = re.compile(r"^(\d+|[a-z])-(\d+(-\d+)?|[A-Za-z]+\d*)$")
 
 
 def fetch_sda_associates(
         spreadsheet_id: str,
         range_name: str,
         credentials_path: str,
-        token_path: str
+        token_path: str,
+        resolver: Optional[PersonResolver] = None,
+        snapshot: Optional[RosterSnapshot] = None,
+        max_age: float = 0,
+        offline: bool = False
 ) -> list[Person]:
     """
-    Fetches a list of current and former SDA members from the Google Sheets API.
+    Fetches a list of current and former SDA members from the Google Sheets API. If a resolver is given, the DBLP
+    profiles of members without a DBLP URL are derived from their author ID.
+
+    If a snapshot is given, the roster is taken from it as long as the spreadsheet was not modified since, which only
+    requests the revision of the spreadsheet from Google Drive. If the snapshot is at most max_age seconds old, it is
+    taken without requesting anything. In offline mode, the snapshot is used regardless of its age. If the spreadsheet
+    cannot be read, an outdated snapshot is used as well.
     """
 
-    data = fetch_data_from_google_sheets(
-        spreadsheet_id=spreadsheet_id,
-        range_name=range_name,
-        credentials=fetch_google_credentials(
+    data = None
+    if snapshot is not None:
+        data = snapshot.load(spreadsheet_id, range_name, max_age=None if offline else max_age)
+        if data is not None:
+            logging.info("Using the roster snapshot instead of reading the spreadsheet.")
+
+    if data is None and not offline:
+        credentials = fetch_google_credentials(
             credentials_path=credentials_path,
             token_path=token_path,
-            scopes=['https://www.googleapis.com/auth/spreadsheets.readonly']
+            scopes=[SCOPE_READONLY, SCOPE_METADATA_READONLY]
         )
-    )
+
+        revision = None
+        if snapshot is not None and not _has_scope(credentials, SCOPE_METADATA_READONLY):
+            logging.warning(
+                f"The Google token in {token_path} was created without access to the modification time of the "
+                f"spreadsheet, so the spreadsheet is read on every run. Delete {token_path} to log in again."
+            )
+        elif snapshot is not None:
+            revision = fetch_spreadsheet_revision(spreadsheet_id=spreadsheet_id, credentials=credentials)
+            if revision is not None:
+                data = snapshot.load(spreadsheet_id, range_name, revision=revision)
+                if data is not None:
+                    logging.info("The spreadsheet was not modified, using the roster snapshot.")
+
+        if data is None:
+            data = fetch_data_from_google_sheets(
+                spreadsheet_id=spreadsheet_id,
+                range_name=range_name,
+                credentials=credentials
+            )
+
+            if data and snapshot is not None:
+                if not snapshot.store(spreadsheet_id, range_name, data, revision=revision):
+                    logging.info("The roster did not change since the last snapshot.")
+            elif not data and snapshot is not None:
+                data = snapshot.load(spreadsheet_id, range_name)
+                if data is not None:
+                    logging.warning("Could not read the spreadsheet, using the outdated roster snapshot.")
 
     if not data:
         logging.error('Error: Could not load DBLP spreadsheet from Google.')
         exit(1)
 
-    return [
+    return _persons_from_rows(data, resolver)
+
+
+def read_sda_associates(path: str, resolver: Optional[PersonResolver] = None) -> list[Person]:
+    """
+    Reads a list of current and former SDA members from a local CSV or JSON roster with the same columns as the
+    spreadsheet. If a resolver is given, the DBLP profiles of members without a DBLP URL are derived from their author
+    ID.
+    """
+
+    return _persons_from_rows(read_roster_file(path), resolver)
+
+
+def _persons_from_rows(data: list[list[str]], resolver: Optional[PersonResolver]) -> list[Person]:
+    persons = [
         _person_from_spreadsheet_row(dblp_url, start_year, end_year, author_id)
         for [dblp_url, start_year, end_year, author_id] in data
     ]
 
+    if resolver is not None:
+        _resolve_dblp_urls([person for person in persons if not person.has_dblp_profile()], resolver)
+
+    return persons
+
 
 def _person_from_spreadsheet_row(dblp_url: str, start_year_string: str, end_year_string: str, author_id: str) -> Person:
     """
@@ -45,3 +118,45 @@ def _person_from_spreadsheet_row(dblp_url: str, start_year_string: str, end_year
         start_year=year_from_string(start_year_string),
         end_year=year_from_string(end_year_string)
     )
+
+
+def _resolve_dblp_urls(persons: list[Person], resolver: PersonResolver) -> None:
+    """
+    Sets the DBLP URL of the given persons if it can be derived from their author ID. Author IDs that are a person key
+    are used directly, all others are resolved by the derived name in one batch.
+    """
+
+    names = {}
+    for person in persons:
+        match = _PID_AUTHOR_ID.match(person.author_id)
+        if match is not None:
+            person.dblp_url = f"https://dblp.org/pid/{match.group(1)}/{match.group(2)}"
+        else:
+            names[person.author_id] = _name_from_author_id(person.author_id)
+
+    pids = resolver.resolve(list(names.values()))
+
+    for person in persons:
+        pid = pids.get(names.get(person.author_id))
+        if pid is not None:
+            logging.info(f"Resolved DBLP profile of {person.author_id} to {pid}.")
+            person.dblp_url = f"https://dblp.org/pid/{pid}"
+
+
+def _name_from_author_id(author_id: str) -> str:
+    """
+    Derives an author name from an author ID like "ChristophLange2" or "christoph-lange": Words are split at dashes,
+    underscores, and camel case, and digits are removed.
+    """
+
+    words = re.findall(r"[A-Z]?[a-z\u00C0-\u024F]+|[A-Z]+(?![a-z])", author_id)
+    return " ".join(word[0].upper() + word[1:] for word in words)
+
+
+def _has_scope(credentials, scope: str) -> bool:
+    """
+    Checks if the credentials were granted the scope. Credentials that do not list their scopes are assumed to have it.
+    """
+
+    scopes = getattr(credentials, "scopes", None)
+    return scopes is None or scope in scopes
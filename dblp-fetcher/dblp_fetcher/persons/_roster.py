@@ -0,0 +1,120 @@
+import csv
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Optional
+
+from dblp_fetcher.util import atomic_write
+
+# The columns of the roster, in the order of the spreadsheet.
+_ROSTER_COLUMNS = ["dblp_url", "start_year", "end_year", "author_id"]
+
+
+class RosterSnapshot:
+    """
+    Keeps the last roster that was read from the spreadsheet in a JSON file, so the spreadsheet is only read again once
+    its revision changed or the snapshot is older than a maximum age. The snapshot belongs to one spreadsheet range and
+    is ignored for others.
+
+    Parameters
+    ----------
+    path:
+        The JSON file the snapshot is persisted in.
+    """
+
+    def __init__(self, path: str):
+        self._path: str = path
+
+    def load(
+            self,
+            spreadsheet_id: str,
+            range_name: str,
+            max_age: Optional[float] = None,
+            revision: Optional[str] = None
+    ) -> Optional[list[list[str]]]:
+        """
+        Returns the rows of the snapshot if it belongs to the given range, is at most max_age seconds old, and was read
+        at the given revision of the spreadsheet, or None otherwise. If max_age or revision is None, the snapshot is
+        returned regardless of its age or revision.
+        """
+
+        snapshot = self._read()
+        if snapshot is None or snapshot["spreadsheet_id"] != spreadsheet_id or snapshot["range_name"] != range_name:
+            return None
+        if max_age is not None and time.time() - snapshot["fetched_at"] > max_age:
+            return None
+        if revision is not None and snapshot.get("revision") != revision:
+            return None
+        return snapshot["rows"]
+
+    def store(
+            self,
+            spreadsheet_id: str,
+            range_name: str,
+            rows: list[list[str]],
+            revision: Optional[str] = None
+    ) -> bool:
+        """
+        Stores the rows as the new snapshot of the given range, read at the given revision of the spreadsheet. Returns
+        whether they differ from the previous snapshot.
+        """
+
+        digest = hashlib.sha256(json.dumps(rows).encode("UTF-8")).hexdigest()
+        previous = self._read()
+        changed = previous is None or previous.get("digest") != digest
+
+        directory = os.path.dirname(self._path)
+        if directory != "":
+            os.makedirs(directory, exist_ok=True)
+
+        with atomic_write(self._path, encoding="UTF-8") as file:
+            json.dump({
+                "spreadsheet_id": spreadsheet_id,
+                "range_name": range_name,
+                "fetched_at": time.time(),
+                "revision": revision,
+                "digest": digest,
+                "rows": rows
+            }, file)
+
+        return changed
+
+    def _read(self) -> Optional[dict]:
+        try:
+            with open(self._path, "r", encoding="UTF-8") as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as error:
+            logging.warning(f"Ignoring unreadable roster snapshot {self._path}: {error}")
+            return None
+
+
+def read_roster_file(path: str) -> list[list[str]]:
+    """
+    Reads a roster from a local CSV or JSON file and returns its rows like the spreadsheet does, i.e. with the columns
+    dblp_url, start_year, end_year, and author_id. A CSV file may start with a header row with these names. A JSON file
+    contains a list of rows, each either a list of cells or an object with the column names as keys.
+    """
+
+    with open(path, "r", encoding="UTF-8", newline="") as file:
+        if path.endswith(".json"):
+            rows = [_json_row(row) for row in json.load(file)]
+        else:
+            rows = [row for row in csv.reader(file) if len(row) > 0]
+            if len(rows) > 0 and [cell.strip() for cell in rows[0]] == _ROSTER_COLUMNS:
+                rows = rows[1:]
+
+    for row in rows:
+        if len(row) != len(_ROSTER_COLUMNS):
+            raise ValueError(f"Roster row {row} in {path} does not have the columns {', '.join(_ROSTER_COLUMNS)}")
+
+    return rows
+
+
+def _json_row(row) -> list[str]:
+    if isinstance(row, dict):
+        return [str(row.get(column) or "") for column in _ROSTER_COLUMNS]
+    return ["" if cell is None else str(cell) for cell in row]
@@ -0,0 +1,2 @@
+from ._pipeline import PostprocessingPipeline, Stage, filter_stage, transform_stage
+from ._stages import remove_property, remove_unwanted_publications, run_substitutions
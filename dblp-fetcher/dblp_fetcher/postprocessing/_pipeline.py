@@ -0,0 +1,71 @@
+from typing import Callable, Iterable, Iterator, Optional
+
+from dblp_fetcher.publications.model import Bibliography, Publication
+
+# A stage receives a publication and returns it (possibly changed), or None if the publication should be dropped.
+Stage = Callable[[Publication], Optional[Publication]]
+
+
+class PostprocessingPipeline:
+    """
+    Runs a sequence of stages on each publication. All stages are applied to one publication before the next one is
+    processed, so a bibliography is traversed only once, and publications can also be processed as a stream.
+
+    Parameters
+    ----------
+    stages:
+        The stages in the order they are applied.
+    """
+
+    def __init__(self, stages: list[Stage]):
+        self._stages: list[Stage] = stages
+
+    def process(self, publication: Publication) -> Optional[Publication]:
+        """
+        Applies all stages to the publication. Returns the result, or None if a stage dropped the publication.
+        """
+
+        for stage in self._stages:
+            publication = stage(publication)
+            if publication is None:
+                return None
+
+        return publication
+
+    def run(self, bibliography: Bibliography) -> Bibliography:
+        """
+        Applies all stages to all publications of the bibliography in a single pass and removes dropped publications.
+        Returns the bibliography.
+        """
+
+        return bibliography.map_publications(self.process)
+
+    def stream(self, publications: Iterable[Publication]) -> Iterator[Publication]:
+        """
+        Lazily applies all stages to the given publications, e.g. between parsing and writing, and skips dropped ones.
+        """
+
+        for publication in publications:
+            result = self.process(publication)
+            if result is not None:
+                yield result
+
+
+def filter_stage(predicate: Callable[[Publication], bool]) -> Stage:
+    """
+    Returns a stage that keeps publications for which the predicate holds and drops all others.
+    """
+
+    return lambda publication: publication if predicate(publication) else None
+
+
+def transform_stage(transform: Callable[[Publication], None]) -> Stage:
+    """
+    Returns a stage that changes each publication in place with the given function.
+    """
+
+    def stage(publication: Publication) -> Publication:
+        transform(publication)
+        return publication
+
+    return stage
@@ -0,0 +1,42 @@
+from dblp_fetcher.postprocessing._pipeline import Stage, filter_stage, transform_stage
+from dblp_fetcher.publications.model import Publication, TitleBlacklist
+from dblp_fetcher.util import SubstitutionEngine
+
+
+def remove_unwanted_publications(blacklist: TitleBlacklist) -> Stage:
+    """
+    Returns a stage that drops unwanted publications. This is the case if the publication has no author or title, if
+    the title is blacklisted, or if the publication is an arXiv preprint.
+    """
+
+    def is_wanted(publication: Publication) -> bool:
+        return not (
+                publication.author is None or
+                publication.title is None or
+                blacklist.matches(publication) or
+                publication.is_arxiv_preprint()
+        )
+
+    return filter_stage(is_wanted)
+
+
+def remove_property(key: str) -> Stage:
+    """
+    Returns a stage that removes the property with the given key from all publications.
+    """
+
+    return transform_stage(lambda publication: publication.remove_property(key))
+
+
+def run_substitutions(substitutions: SubstitutionEngine) -> Stage:
+    """
+    Returns a stage that applies the substitutions to all properties of all publications.
+    """
+
+    def substitute(publication: Publication) -> None:
+        for key, value in publication.bibtex_dict.items():
+            new_value = substitutions.apply(value)
+            if new_value != value:
+                publication.set_property(key, new_value)
+
+    return transform_stage(substitute)
@@ -1 +1,6 @@
-from dblp_fetcher.publications._fetch_publications import fetch_bibliography
+from dblp_fetcher.publications._dblp_dump import read_bibliographies_from_dump, read_person_names_from_dump
+from dblp_fetcher.publications._fetch_pipeline import fetch_and_merge_bibliographies
+from dblp_fetcher.publications._fetch_publications import fetch_bibliographies, fetch_bibliography
+from dblp_fetcher.publications._fingerprints import FingerprintStore
+from dblp_fetcher.publications._person_resolver import PersonResolver
+from dblp_fetcher.publications._session import DblpSession, RequestRecord
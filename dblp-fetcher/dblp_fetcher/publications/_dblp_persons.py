@@ -0,0 +1,25 @@
+import re
+from typing import Optional
+
+# The person key in the URL of a DBLP profile, e.g. "272/2782" in "https://dblp.org/pid/272/2782.html".
+_PID = re.compile(r"/pid/(.+?)(\.html)?$")
+
+# The number DBLP appends to names that several persons share, e.g. " 0002" in "John Doe 0002".
+_NAME_DISAMBIGUATION = re.compile(r" \d{4}$")
+
+
+def pid_from_dblp_url(dblp_url: str) -> Optional[str]:
+    """
+    Returns the person key of a DBLP profile URL, e.g. "272/2782", or None if the URL is not one.
+    """
+
+    match = _PID.search(dblp_url)
+    return match.group(1) if match is not None else None
+
+
+def without_name_disambiguation(name: str) -> str:
+    """
+    Returns the name without the number DBLP appends to tell persons of the same name apart.
+    """
+
+    return _NAME_DISAMBIGUATION.sub("", name)
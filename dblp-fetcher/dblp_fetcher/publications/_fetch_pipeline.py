@@ -0,0 +1,131 @@
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, Optional
+
+from dblp_fetcher.persons.model import Person
+from dblp_fetcher.publications._fetch_publications import _download_bibtex, _parse_bibliography
+from dblp_fetcher.publications._fingerprints import FingerprintStore
+from dblp_fetcher.publications._session import DblpSession
+from dblp_fetcher.publications.model import Bibliography
+from dblp_fetcher.util import HttpCache, metrics
+
+
+def fetch_and_merge_bibliographies(
+        authors: list[Person],
+        read_known_bibliography: Callable[[], Bibliography],
+        session: Optional[DblpSession] = None,
+        max_workers: int = 8,
+        cache: Optional[HttpCache] = None,
+        offline: bool = False,
+        fingerprints: Optional[FingerprintStore] = None,
+        max_pending: int = 32
+) -> Optional[Bibliography]:
+    """
+    Fetches the bibliographies of all given authors and merges them into the known bibliography while the remaining
+    downloads are still running. Downloads run concurrently in max_workers threads, and each downloaded bibliography is
+    parsed in a separate thread as soon as it arrives. The parsed bibliographies are merged in the order of the given
+    authors, so the result is the same as that of fetch_bibliographies followed by merging the bibliographies in order.
+
+    At most max_pending authors are downloaded, parsed, or waiting to be merged at the same time, which bounds the
+    memory for large rosters. The known bibliography is only read once the first author has publications, and None is
+    returned if none of them has any. It is read in the parsing thread, so the downloads go on meanwhile, and merging
+    starts once it is read. read_known_bibliography must therefore not use objects that are bound to the calling
+    thread.
+    """
+
+    if max_pending < 1:
+        raise ValueError(f"max_pending must be at least 1, but is {max_pending}")
+
+    if session is None:
+        session = DblpSession(pool_size=max_workers)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as download_executor, \
+            ThreadPoolExecutor(max_workers=1) as parse_executor:
+        return asyncio.run(_fetch_and_merge(
+            authors,
+            lambda: asyncio.get_running_loop().run_in_executor(parse_executor, _timed_read, read_known_bibliography),
+            lambda author: _fetch(author, session, cache, offline, fingerprints, download_executor, parse_executor),
+            max_pending
+        ))
+
+
+async def _fetch_and_merge(
+        authors: list[Person],
+        read_known_bibliography: Callable[[], Awaitable[Bibliography]],
+        fetch: Callable,
+        max_pending: int
+) -> Optional[Bibliography]:
+    """
+    Starts a task per author as long as fewer than max_pending are unmerged, and merges their results in order.
+    """
+
+    slots = asyncio.Semaphore(max_pending)
+    tasks: asyncio.Queue = asyncio.Queue()
+
+    async def start_tasks():
+        for author in authors:
+            await slots.acquire()
+            tasks.put_nowait(asyncio.ensure_future(fetch(author)))
+
+    producer = asyncio.ensure_future(start_tasks())
+    complete_bibliography = None
+    known_count = 0
+    merge_seconds = 0.0
+    try:
+        for _ in authors:
+            bibliography = await (await tasks.get())
+
+            if len(bibliography.publications) > 0:
+                if complete_bibliography is None:
+                    complete_bibliography = await read_known_bibliography()
+                    known_count = len(complete_bibliography.publications)
+
+                start = time.perf_counter()
+                complete_bibliography.update(bibliography)
+                merge_seconds += time.perf_counter() - start
+                metrics.increment("publications_merged", len(bibliography.publications))
+
+            slots.release()
+    finally:
+        producer.cancel()
+        while not tasks.empty():
+            tasks.get_nowait().cancel()
+
+    if complete_bibliography is not None:
+        metrics.observe("stage", merge_seconds, stage="merge")
+        metrics.increment("publications_added", len(complete_bibliography.publications) - known_count)
+
+    return complete_bibliography
+
+
+async def _fetch(
+        author: Person,
+        session: DblpSession,
+        cache: Optional[HttpCache],
+        offline: bool,
+        fingerprints: Optional[FingerprintStore],
+        download_executor: ThreadPoolExecutor,
+        parse_executor: ThreadPoolExecutor
+) -> Bibliography:
+    if not author.has_dblp_profile():
+        return Bibliography()
+
+    loop = asyncio.get_running_loop()
+    bibtex_string = await loop.run_in_executor(download_executor, _timed_download, author, session, cache, offline)
+    if bibtex_string is None:
+        return Bibliography()
+
+    return await loop.run_in_executor(parse_executor, _parse_bibliography, author, bibtex_string, fingerprints)
+
+
+def _timed_read(read_known_bibliography: Callable[[], Bibliography]) -> Bibliography:
+    logging.info("Reading known publications...")
+    with metrics.timer("stage", stage="read_known_publications"):
+        return read_known_bibliography()
+
+
+def _timed_download(author: Person, session: DblpSession, cache: Optional[HttpCache], offline: bool) -> Optional[str]:
+    with metrics.timer("associate_fetch", author_id=author.author_id):
+        return _download_bibtex(author, session, cache, offline)
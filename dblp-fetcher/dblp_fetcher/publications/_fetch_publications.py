@@ -1,24 +1,169 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
 import requests
 
 from dblp_fetcher.persons.model import Person
+from dblp_fetcher.publications._fingerprints import FingerprintStore
+from dblp_fetcher.publications._session import DblpSession
 from dblp_fetcher.publications.model import Bibliography, Publication
+from dblp_fetcher.util import HttpCache, metrics
+
+
+def fetch_bibliographies(
+        authors: list[Person],
+        session: Optional[DblpSession] = None,
+        max_workers: int = 8,
+        cache: Optional[HttpCache] = None,
+        offline: bool = False,
+        fingerprints: Optional[FingerprintStore] = None
+) -> list[Bibliography]:
+    """
+    Fetches the bibliographies of all given authors concurrently, with at most max_workers requests in flight at the
+    same time. The bibliographies are returned in the order of the given authors, so merging them yields the same
+    result as fetching them one after another.
+
+    The command line tool uses fetch_and_merge_bibliographies, which merges each bibliography while the others are
+    still being fetched. This function is kept as the unpipelined baseline that the pipeline benchmark and the tests
+    compare it against.
+    """
 
+    if session is None:
+        session = DblpSession(pool_size=max_workers)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(
+            lambda author: fetch_bibliography(author, session, cache, offline, fingerprints),
+            authors
+        ))
+
+
+def fetch_bibliography(
+        author: Person,
+        session: Optional[DblpSession] = None,
+        cache: Optional[HttpCache] = None,
+        offline: bool = False,
+        fingerprints: Optional[FingerprintStore] = None
+) -> Bibliography:
+    """
+    Fetches the bibliography of the given author from DBLP. If a cache is given, responses are stored in it and
+    revalidated with conditional requests, and the cached response is used if the request fails. In offline mode, only
+    the cache is used and authors without a cached response get an empty bibliography. If the request fails and there
+    is no cached response, the error is logged and the bibliography is empty, too.
+
+    If fingerprints are given, only the publications that changed since the fingerprints were last saved are returned.
+    """
 
-def fetch_bibliography(author: Person) -> Bibliography:
     if not author.has_dblp_profile():
         return Bibliography()
 
-    bibtex_string = _fetch_bibtex_from_dblp(author.dblp_url)
+    if session is None:
+        session = DblpSession()
+
+    with metrics.timer("associate_fetch", author_id=author.author_id):
+        return _fetch_bibliography(author, session, cache, offline, fingerprints)
+
+
+def _fetch_bibliography(
+        author: Person,
+        session: DblpSession,
+        cache: Optional[HttpCache],
+        offline: bool,
+        fingerprints: Optional[FingerprintStore]
+) -> Bibliography:
+    bibtex_string = _download_bibtex(author, session, cache, offline)
+    if bibtex_string is None:
+        return Bibliography()
+
+    return _parse_bibliography(author, bibtex_string, fingerprints)
+
+
+def _download_bibtex(
+        author: Person,
+        session: DblpSession,
+        cache: Optional[HttpCache],
+        offline: bool
+) -> Optional[str]:
+    """
+    Returns the bibtex string of the author, or None if it could not be fetched. Errors are logged.
+    """
+
+    logging.info(f"Fetching publications for {author.author_id}...")
+    try:
+        bibtex_string = _fetch_bibtex_from_dblp(author.dblp_url, session, cache, offline)
+    except requests.RequestException as error:
+        logging.error(f"Could not fetch publications for {author.author_id}: {error}")
+        return None
+
+    if bibtex_string is None:
+        logging.warning(f"No cached publications for {author.author_id}, skipping them in offline mode.")
+
+    return bibtex_string
+
+
+def _parse_bibliography(
+        author: Person,
+        bibtex_string: str,
+        fingerprints: Optional[FingerprintStore]
+) -> Bibliography:
+    """
+    Parses the bibtex string of the author and adds the keywords of the author to all publications. If fingerprints are
+    given, only the publications that changed since the fingerprints were last saved are returned.
+    """
+
+    if fingerprints is not None and fingerprints.is_unchanged(author, bibtex_string):
+        logging.info(f"Publications of {author.author_id} are unchanged, skipping them.")
+        return Bibliography()
+
     bibliography = Bibliography.from_bibtex(bibtex_string)
 
     for publication in bibliography.publications:
         _add_keywords(publication, author)
 
+    if fingerprints is not None:
+        bibliography = fingerprints.record(author, bibtex_string, bibliography)
+
     return bibliography
 
 
-def _fetch_bibtex_from_dblp(dblp_url: str) -> str:
-    return requests.get(f"{dblp_url}.bib").content.decode("utf-8")
+def _fetch_bibtex_from_dblp(
+        dblp_url: str,
+        session: DblpSession,
+        cache: Optional[HttpCache] = None,
+        offline: bool = False
+) -> Optional[str]:
+    """
+    Returns the bibtex string of the DBLP profile, or None if offline is set and the cache has no response for it.
+    Cached responses are revalidated even if they expired, and are returned if the request fails. Raises
+    requests.RequestException if the request fails and there is no cached response.
+    """
+
+    url = f"{dblp_url}.bib"
+
+    cached_response = cache.get(url) if cache is not None else None
+    if offline:
+        return cached_response.body.decode("utf-8") if cached_response is not None else None
+
+    headers = cached_response.conditional_headers() if cached_response is not None else {}
+    try:
+        response = session.get(url, headers=headers)
+
+        if response.status_code == 304 and cached_response is not None:
+            cache.revalidate(cached_response)
+            return cached_response.body.decode("utf-8")
+
+        response.raise_for_status()
+    except requests.RequestException as error:
+        if cached_response is None:
+            raise
+        logging.warning(f"Could not fetch {url}, using the cached response instead: {error}")
+        return cached_response.body.decode("utf-8")
+
+    if cache is not None:
+        cache.put(url, response.content, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+
+    return response.content.decode("utf-8")
 
 
 def _add_keywords(publication: Publication, author: Person) -> None:
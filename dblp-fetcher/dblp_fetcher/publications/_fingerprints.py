@@ -0,0 +1,98 @@
+import hashlib
+import json
+import os
+import threading
+
+from dblp_fetcher.persons.model import Person
+from dblp_fetcher.publications.model import Bibliography
+from dblp_fetcher.util import atomic_write
+
+
+class FingerprintStore:
+    """
+    Remembers a fingerprint of the DBLP content that was last merged for each associate, and of each of their
+    publications. This allows skipping associates whose content did not change and merging only the publications that
+    changed for the others.
+
+    The fingerprints are only valid for the state of the known bibliography they were saved with. If the context passed
+    on construction differs from the one they were saved with, all fingerprints are discarded.
+
+    Parameters
+    ----------
+    path:
+        The JSON file the fingerprints are persisted in.
+    context:
+        A fingerprint of everything else the merge result depends on, e.g. the known bibliography and the blacklist.
+    """
+
+    def __init__(self, path: str, context: str):
+        self._path: str = path
+        self._associates: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+        if os.path.exists(path):
+            with open(path, "r", encoding="UTF-8") as file:
+                data = json.load(file)
+            if data.get("context") == context:
+                self._associates = data.get("associates", {})
+
+    def is_unchanged(self, author: Person, bibtex_string: str) -> bool:
+        """
+        Checks if the given DBLP content of the author was already merged in the last saved run.
+        """
+
+        with self._lock:
+            associate = self._associates.get(author.author_id)
+
+        return associate is not None and associate["fingerprint"] == _associate_fingerprint(author, bibtex_string)
+
+    def record(self, author: Person, bibtex_string: str, bibliography: Bibliography) -> Bibliography:
+        """
+        Remembers the DBLP content of the author and returns a bibliography with only the publications that are new or
+        changed since the last saved run.
+        """
+
+        with self._lock:
+            old_fingerprints = self._associates.get(author.author_id, {}).get("publications", {})
+
+        new_fingerprints = {
+            publication.id: publication.content_hash
+            for publication in bibliography.publications
+        }
+        changed = Bibliography([
+            publication
+            for publication in bibliography.publications
+            if old_fingerprints.get(publication.id) != new_fingerprints[publication.id]
+        ])
+
+        with self._lock:
+            self._associates[author.author_id] = {
+                "fingerprint": _associate_fingerprint(author, bibtex_string),
+                "publications": new_fingerprints
+            }
+
+        return changed
+
+    def save(self, context: str) -> None:
+        """
+        Persists the fingerprints for the given context, which should describe the known bibliography after the merge.
+        """
+
+        directory = os.path.dirname(self._path)
+        if directory != "":
+            os.makedirs(directory, exist_ok=True)
+
+        with self._lock:
+            data = {"context": context, "associates": self._associates}
+
+        with atomic_write(self._path, encoding="UTF-8") as file:
+            json.dump(data, file)
+
+
+def _associate_fingerprint(author: Person, bibtex_string: str) -> str:
+    """
+    Returns a fingerprint of the DBLP content of the author and the data of the author that is used when merging.
+    """
+
+    header = json.dumps([author.author_id, author.dblp_url, author.start_year, author.end_year])
+    return hashlib.sha256(f"{header}\n{bibtex_string}".encode("utf-8")).hexdigest()
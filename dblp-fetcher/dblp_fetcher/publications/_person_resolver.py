@@ -0,0 +1,219 @@
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+from urllib.parse import urlencode
+
+import requests
+
+from dblp_fetcher.persons.model import Person
+from dblp_fetcher.publications._dblp_dump import iter_person_profiles_from_dump, read_person_names_from_dump
+from dblp_fetcher.publications._dblp_persons import pid_from_dblp_url, without_name_disambiguation
+from dblp_fetcher.publications._session import DblpSession
+from dblp_fetcher.util import atomic_write
+
+_SEARCH_URL = "https://dblp.org/search/author/api"
+_MAX_HITS = 100
+
+
+class PersonResolver:
+    """
+    Maps author names to DBLP person keys (e.g. "272/2782"). Results are kept in a persistent JSON index, so each name
+    is only looked up once. Names that are not in the index are looked up concurrently with the DBLP author search.
+    A name resolves to a person key if exactly one DBLP person has it as their name, otherwise it is unresolved.
+
+    The index can also be filled from a DBLP XML dump, which lists the names of every person. Names from the dump never
+    expire, so no requests are needed for them. The names of the persons that are read from the dump are kept as well,
+    so the dump does not have to be read again to match their publications by name.
+
+    Parameters
+    ----------
+    path:
+        The JSON file the index is persisted in.
+    session:
+        The session used for searches. Set to None to never search, e.g. in offline mode.
+    max_workers:
+        The maximum number of concurrent searches.
+    retry_after:
+        Names that could not be resolved by a search are searched again after this many seconds.
+    """
+
+    def __init__(
+            self,
+            path: str,
+            session: Optional[DblpSession] = None,
+            max_workers: int = 8,
+            retry_after: float = 30 * 24 * 60 * 60
+    ):
+        self._path: str = path
+        self._session: Optional[DblpSession] = session
+        self._max_workers: int = max_workers
+        self._retry_after: float = retry_after
+        self._lock = threading.Lock()
+
+        self._names: dict[str, dict] = {}
+        self._dump: Optional[dict] = None
+        # The names in the dump of persons whose publications were read from it, keyed by their person key.
+        self._person_names: dict[str, list[str]] = {}
+        # The names of all persons in the dump, if it was read in this run.
+        self._dump_person_names: Optional[dict[str, list[str]]] = None
+        if os.path.exists(path):
+            with open(path, "r", encoding="UTF-8") as file:
+                data = json.load(file)
+            self._names = data.get("names", {})
+            self._dump = data.get("dump")
+            self._person_names = data.get("person_names", {})
+
+    def resolve(self, names: list[str]) -> dict[str, Optional[str]]:
+        """
+        Returns the person key for each of the given names, or None if it cannot be resolved. Names that are neither in
+        the index nor resolved recently are searched for in one batch of concurrent requests.
+        """
+
+        # Names that only differ in case or whitespace are searched once.
+        names_by_normalized_name = {}
+        for name in names:
+            normalized_name = _normalized_name(name)
+            if self._needs_search(normalized_name):
+                names_by_normalized_name.setdefault(normalized_name, name)
+        missing_names = list(names_by_normalized_name.values())
+        if len(missing_names) > 0 and self._session is not None:
+            logging.info(f"Searching DBLP for {len(missing_names)} authors...")
+            with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+                for name, (succeeded, pid) in zip(missing_names, executor.map(self._search, missing_names)):
+                    # Failed searches are not remembered, so they are repeated in the next run.
+                    if succeeded:
+                        self._put(name, pid, "search")
+
+        result = {}
+        for name in names:
+            entry = self._names.get(_normalized_name(name))
+            result[name] = entry["pid"] if entry is not None else None
+        return result
+
+    def add_names_from_dump(self, dump_path: str) -> None:
+        """
+        Adds the names of all persons in the DBLP XML dump to the index. Names that several persons share are marked
+        as unresolvable. Nothing happens if the index was already filled from the same version of the dump.
+        """
+
+        dump = _dump_identity(dump_path)
+        if dump == self._dump:
+            return
+
+        pids_by_name: dict[str, set[str]] = {}
+        names_by_pid: dict[str, list[str]] = {}
+        for pid, names in iter_person_profiles_from_dump(dump_path):
+            names_by_pid[pid] = names
+            for name in names:
+                pids_by_name.setdefault(_normalized_name(name), set()).add(pid)
+
+        with self._lock:
+            for name, pids in pids_by_name.items():
+                self._names[name] = {
+                    "pid": next(iter(pids)) if len(pids) == 1 else None,
+                    "source": "dump",
+                    "resolved_at": time.time()
+                }
+            self._dump = dump
+            self._person_names = {}
+            self._dump_person_names = names_by_pid
+
+        logging.info(f"Added {len(pids_by_name)} author names from the DBLP dump to the person index.")
+
+    def person_names_from_dump(self, dump_path: str, authors: list[Person]) -> dict[str, list[str]]:
+        """
+        Returns the names the DBLP XML dump lists for the person key of each author with a DBLP profile, like
+        read_person_names_from_dump. The names are taken from the pass of add_names_from_dump or from the index if they
+        were read from the same dump before, and the dump is only read again for the remaining persons.
+        """
+
+        pids = {pid_from_dblp_url(author.dblp_url) for author in authors if author.has_dblp_profile()}
+        pids.discard(None)
+
+        if _dump_identity(dump_path) != self._dump:
+            return read_person_names_from_dump(dump_path, list(pids))
+
+        with self._lock:
+            for pid in pids:
+                if pid not in self._person_names and self._dump_person_names is not None:
+                    self._person_names[pid] = self._dump_person_names.get(pid, [])
+            missing_pids = [pid for pid in pids if pid not in self._person_names]
+
+        if len(missing_pids) > 0:
+            names_by_pid = read_person_names_from_dump(dump_path, missing_pids)
+            with self._lock:
+                for pid in missing_pids:
+                    # Persons without a profile in the dump are remembered too, so the dump is not read again for them.
+                    self._person_names[pid] = names_by_pid.get(pid, [])
+
+        return {pid: self._person_names[pid] for pid in pids if len(self._person_names[pid]) > 0}
+
+    def save(self) -> None:
+        """
+        Writes the index to its file.
+        """
+
+        directory = os.path.dirname(self._path)
+        if directory != "":
+            os.makedirs(directory, exist_ok=True)
+
+        with self._lock:
+            data = {"dump": self._dump, "names": self._names, "person_names": self._person_names}
+            with atomic_write(self._path, encoding="UTF-8") as file:
+                json.dump(data, file)
+
+    def _needs_search(self, normalized_name: str) -> bool:
+        entry = self._names.get(normalized_name)
+        if entry is None:
+            return True
+        if entry["pid"] is not None or entry["source"] == "dump":
+            return False
+        return time.time() - entry["resolved_at"] > self._retry_after
+
+    def _put(self, name: str, pid: Optional[str], source: str) -> None:
+        with self._lock:
+            self._names[_normalized_name(name)] = {"pid": pid, "source": source, "resolved_at": time.time()}
+
+    def _search(self, name: str) -> tuple[bool, Optional[str]]:
+        """
+        Returns whether the search succeeded, and the person key of the only DBLP person with the given name, or None if
+        there is none or more than one.
+        """
+
+        url = f"{_SEARCH_URL}?{urlencode({'q': name, 'format': 'json', 'h': _MAX_HITS})}"
+        try:
+            response = self._session.get(url)
+            response.raise_for_status()
+            hits = response.json().get("result", {}).get("hits", {}).get("hit", [])
+        except (requests.RequestException, ValueError) as error:
+            logging.error(f"Could not search DBLP for {name}: {error}")
+            return False, None
+
+        normalized_name = _normalized_name(name)
+        pids = set()
+        for hit in hits:
+            info = hit.get("info", {})
+            pid = pid_from_dblp_url(info.get("url", ""))
+            if pid is not None and _normalized_name(info.get("author", "")) == normalized_name:
+                pids.add(pid)
+
+        if len(pids) > 1:
+            logging.warning(f"Several DBLP persons are named {name}, leaving them unresolved.")
+        return True, next(iter(pids)) if len(pids) == 1 else None
+
+
+def _dump_identity(dump_path: str) -> dict:
+    stat = os.stat(dump_path)
+    return {"path": os.path.abspath(dump_path), "size": stat.st_size, "mtime": stat.st_mtime}
+
+
+def _normalized_name(name: str) -> str:
+    """
+    Returns the name without DBLP's disambiguation number, in lower case and with whitespace collapsed.
+    """
+
+    return without_name_disambiguation(" ".join(name.split())).casefold()
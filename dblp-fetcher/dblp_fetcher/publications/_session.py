@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import email.utils
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from dblp_fetcher.util import RateLimiter, metrics
+
+# Status codes after which a request is retried.
+_RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+@dataclass
+class RequestRecord:
+    """
+    Parameters
+    ----------
+    url:
+        The requested URL.
+    status_code:
+        The status code of the final response. Set to None if no response was received.
+    seconds:
+        The wall time of the request including all retries.
+    bytes:
+        The number of bytes received over the wire for the final response.
+    attempts:
+        The number of attempts that were made.
+    """
+
+    url: str
+    status_code: Optional[int]
+    seconds: float
+    bytes: int
+    attempts: int
+
+
+class DblpSession:
+    """
+    A thread-safe HTTP session for all traffic to DBLP. Connections are kept alive and pooled, responses are requested
+    gzip-compressed, and failed requests are retried with exponential backoff. Every request is recorded.
+
+    Parameters
+    ----------
+    pool_size:
+        The maximum number of connections that are kept open per host. Should be at least the number of threads that
+        use this session.
+    timeout:
+        The connect and read timeouts in seconds.
+    max_retries:
+        How often a request is retried after a connection error or a status code in 429, 500, 502, 503 and 504.
+    backoff_factor:
+        The delay before the n-th retry is backoff_factor * 2 ** (n - 1) seconds, unless the server sends a Retry-After
+        header.
+    max_backoff:
+        The maximum delay before a retry in seconds, even if the server asks for a longer one.
+    rate_limiter:
+        Limits the number of requests per host. Set to None to disable rate limiting.
+    """
+
+    def __init__(
+            self,
+            pool_size: int = 8,
+            timeout: tuple[float, float] = (10, 60),
+            max_retries: int = 5,
+            backoff_factor: float = 1,
+            max_backoff: float = 120,
+            rate_limiter: Optional[RateLimiter] = None
+    ):
+        self._timeout: tuple[float, float] = timeout
+        self._max_retries: int = max_retries
+        self._backoff_factor: float = backoff_factor
+        self._max_backoff: float = max_backoff
+        self._rate_limiter: RateLimiter = rate_limiter if rate_limiter is not None else RateLimiter()
+
+        self._session = requests.Session()
+        self._session.headers["Accept-Encoding"] = "gzip"
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+
+        self._records: list[RequestRecord] = []
+        self._records_lock = threading.Lock()
+
+    @property
+    def records(self) -> list[RequestRecord]:
+        """
+        Returns a list of all requests sent by this session so far.
+        """
+
+        with self._records_lock:
+            return list(self._records)
+
+    def get(self, url: str, headers: Optional[dict[str, str]] = None) -> requests.Response:
+        """
+        Sends a GET request and returns the final response. Raises requests.RequestException if the last attempt failed
+        with a connection error or a timeout.
+        """
+
+        start = time.monotonic()
+        attempt = 0
+
+        while True:
+            attempt += 1
+            self._rate_limiter.wait(url)
+
+            try:
+                response = self._session.get(url, headers=headers, timeout=self._timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt > self._max_retries:
+                    self._record(url, None, start, 0, attempt)
+                    raise
+
+                delay = self._backoff_delay(attempt)
+                logging.warning(f"Request to {url} failed, retrying in {delay:.1f}s...")
+                time.sleep(delay)
+                continue
+
+            if response.status_code not in _RETRY_STATUS_CODES or attempt > self._max_retries:
+                self._record(url, response.status_code, start, _bytes_received(response), attempt)
+                return response
+
+            delay = self._retry_after(response)
+            if delay is None:
+                delay = self._backoff_delay(attempt)
+            logging.warning(f"Request to {url} returned {response.status_code}, retrying in {delay:.1f}s...")
+            time.sleep(delay)
+
+    def log_statistics(self) -> None:
+        """
+        Logs the number of requests, the bytes received, and the latency of all requests sent so far.
+        """
+
+        records = self.records
+        if len(records) == 0:
+            logging.info("No requests were sent to DBLP.")
+            return
+
+        total_bytes = sum(record.bytes for record in records)
+        latencies = sorted(record.seconds for record in records)
+        retries = sum(record.attempts - 1 for record in records)
+        slowest = max(records, key=lambda record: record.seconds)
+
+        logging.info(
+            f"Sent {len(records)} requests to DBLP ({retries} retries), received {total_bytes / 1024:.1f} KiB. "
+            f"Latency: median {latencies[len(latencies) // 2]:.2f}s, max {slowest.seconds:.2f}s ({slowest.url})."
+        )
+        for record in records:
+            logging.debug(
+                f"{record.url}: status {record.status_code}, {record.seconds:.2f}s, {record.bytes} bytes, "
+                f"{record.attempts} attempts"
+            )
+
+    def _backoff_delay(self, attempt: int) -> float:
+        return min(self._backoff_factor * 2 ** (attempt - 1), self._max_backoff)
+
+    def _retry_after(self, response: requests.Response) -> Optional[float]:
+        """
+        Returns the delay requested by the Retry-After header of the response, or None if it has no valid one. The
+        header may either contain a number of seconds or an HTTP date.
+        """
+
+        value = response.headers.get("Retry-After")
+        if value is None:
+            return None
+
+        if value.strip().isdigit():
+            return min(float(value), self._max_backoff)
+
+        try:
+            retry_at = email.utils.parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+
+        return min(max(retry_at.timestamp() - time.time(), 0), self._max_backoff)
+
+    def _record(self, url: str, status_code: Optional[int], start: float, received: int, attempts: int) -> None:
+        record = RequestRecord(url, status_code, time.monotonic() - start, received, attempts)
+        with self._records_lock:
+            self._records.append(record)
+
+        metrics.increment("dblp_requests")
+        metrics.increment("dblp_retries", attempts - 1)
+        metrics.increment("dblp_bytes_received", received)
+
+
+def _bytes_received(response: requests.Response) -> int:
+    """
+    Returns the number of bytes of the response body that were transferred, i.e. before decompression if possible.
+    """
+
+    try:
+        return response.raw.tell()
+    except AttributeError:
+        return len(response.content)
@@ -1,2 +1,6 @@
+from ._bibtex_parser import iter_bibtex_entries
 from ._blacklist import TitleBlacklist
+from ._diff import BibliographyDiff, ChangedPublication, FieldChange, diff_bibliographies
+from ._near_duplicates import NearDuplicate, NearDuplicateIndex, NearDuplicateStatistics, merge_near_duplicates
 from ._publications import Bibliography, Publication
+from ._store import BibliographyStore
@@ -0,0 +1,351 @@
+from __future__ import annotations
+
+import io
+import logging
+import re
+from typing import BinaryIO, Iterator, Optional, TextIO, Union
+
+from bibtexparser.bibdatabase import COMMON_STRINGS
+from bibtexparser.customization import homogenize_latex_encoding
+
+# Alternative field names that are replaced by their canonical form, like bibtexparser does with homogenize_fields.
+_FIELD_ALIASES = {
+    'keyw': 'keyword',
+    'keywords': 'keyword',
+    'authors': 'author',
+    'editors': 'editor',
+    'urls': 'url',
+    'link': 'url',
+    'links': 'url',
+    'subjects': 'subject',
+    'xref': 'crossref'
+}
+
+_WHITESPACE = " \t\r\n"
+_ITEM_START = re.compile(r"\n[ \t\r\n]*@")
+_ENTRY_TYPE = re.compile(r"@[ \t\r\n]*([A-Za-z]+)")
+_FIELD_NAME = re.compile(r"[A-Za-z0-9_\-().+]+")
+_STRING_NAME = re.compile(r"[A-Za-z0-9_\-:]+")
+_INTEGER = re.compile(r"[0-9]+")
+_BRACE_OR_QUOTE = re.compile(r'[{}"]')
+_BRACE = re.compile(r"[{}]")
+
+_CHUNK_SIZE = 1 << 16
+
+
+def iter_bibtex_entries(source: Union[str, bytes, TextIO, BinaryIO]) -> Iterator[dict[str, str]]:
+    """
+    Parses BibTeX from a string, bytes, or a text or binary file object and yields one dictionary per entry as soon as
+    it is complete. The dictionaries are the same that bibtexparser creates with common strings, homogenized fields, and
+    homogenize_latex_encoding as customization. File objects are read in chunks, so the whole input is never held in
+    memory at once.
+
+    Malformed entries are skipped up to the next line that starts with "@", like bibtexparser treats them as comments.
+    """
+
+    reader = _BibtexReader()
+
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+    if isinstance(source, str):
+        yield from reader.read(source, final=True)
+        return
+
+    if isinstance(source, io.TextIOBase):
+        text_file = source
+    else:
+        text_file = io.TextIOWrapper(source, encoding="utf-8-sig")
+
+    pending = ""
+    while True:
+        chunk = text_file.read(_CHUNK_SIZE)
+        final = chunk == ""
+        yield from reader.read(pending + chunk, final=final)
+        if final:
+            return
+        pending = reader.unconsumed
+
+
+class _Incomplete(Exception):
+    """
+    Raised if the end of the buffer is reached before the current item is complete.
+    """
+
+
+class _Malformed(Exception):
+    """
+    Raised if the current item is not valid BibTeX.
+    """
+
+
+class _BibtexReader:
+    def __init__(self):
+        self._strings: dict[str, str] = dict(COMMON_STRINGS)
+        self.unconsumed: str = ""
+
+    def read(self, text: str, final: bool) -> Iterator[dict[str, str]]:
+        """
+        Yields all entries in the text. If final is False, an incomplete item at the end of the text is not parsed but
+        kept in unconsumed, so it can be prepended to the next chunk.
+        """
+
+        if text.startswith("\ufeff"):
+            text = text[1:]
+
+        parser = _ItemParser(text, self._strings, final)
+        position = 0
+
+        while True:
+            position = _skip_whitespace(text, position)
+            if position >= len(text):
+                self.unconsumed = ""
+                return
+
+            try:
+                if text[position] == "@":
+                    entry, end = parser.parse_item(position)
+                else:
+                    entry, end = None, parser.skip_comment(position)
+            except _Incomplete:
+                self.unconsumed = text[position:]
+                return
+            except _Malformed:
+                logging.warning(f"Skipping malformed BibTeX: {text[position:position + 40]!r}...")
+                try:
+                    entry, end = None, parser.skip_comment(position)
+                except _Incomplete:
+                    self.unconsumed = text[position:]
+                    return
+
+            if entry is not None:
+                yield homogenize_latex_encoding(entry)
+
+            position = end
+
+
+class _ItemParser:
+    """
+    Parses items starting at a given position of the text. Every method raises _Incomplete if it reaches the end of a
+    text that is not final, and _Malformed if the input is not valid BibTeX.
+    """
+
+    def __init__(self, text: str, strings: dict[str, str], final: bool):
+        self._text: str = text
+        self._strings: dict[str, str] = strings
+        self._final: bool = final
+
+    def skip_comment(self, position: int) -> int:
+        """
+        Returns the position of the next "@" that starts a line, or the end of the text.
+        """
+
+        match = _ITEM_START.search(self._text, position)
+        if match is None:
+            if not self._final:
+                raise _Incomplete()
+            return len(self._text)
+
+        return match.end() - 1
+
+    def parse_item(self, position: int) -> tuple[Optional[dict[str, str]], int]:
+        """
+        Parses the item starting with the "@" at the given position. Returns the entry, or None if the item is a
+        comment, a preamble, or a string definition, and the position after the item.
+        """
+
+        text = self._text
+        keyword = text[position:position + 9].lower()
+
+        if keyword.startswith("@comment") and not _is_name_character(text, position + 8):
+            return None, self.skip_comment(position + 1)
+        if keyword.startswith("@preamble") and not _is_name_character(text, position + 9):
+            position, closing = self._expect_opening(position + 9)
+            position = self._parse_value(position)[1]
+            return None, self._expect(position, closing)
+        if keyword.startswith("@string") and not _is_name_character(text, position + 7):
+            return None, self._parse_string_definition(position + 7)
+
+        return self._parse_entry(position)
+
+    def _parse_entry(self, position: int) -> tuple[dict[str, str], int]:
+        text = self._text
+
+        match = _ENTRY_TYPE.match(text, position)
+        if match is None or match.end() == len(text):
+            self._fail_or_wait(match is None and len(text) - position > 64)
+        entry_type = match.group(1).lower()
+        position, closing = self._expect_opening(match.end())
+
+        key_end = text.find(",", position)
+        if key_end == -1:
+            self._fail_or_wait(False)
+        key = text[position:key_end].strip()
+        if key == "" or any(character.isspace() for character in key):
+            raise _Malformed()
+
+        fields: list[tuple[str, str]] = []
+        position = key_end + 1
+        while True:
+            position = self._skip_whitespace(position)
+            if text[position] == closing and len(fields) > 0:
+                position += 1
+                break
+
+            match = _FIELD_NAME.match(text, position)
+            if match is None:
+                raise _Malformed()
+            name = match.group()
+            position = self._expect(match.end(), "=")
+            value, position = self._parse_value(self._skip_whitespace(position))
+            fields.append((name, value))
+
+            position = self._skip_whitespace(position)
+            if text[position] == ",":
+                position += 1
+            elif text[position] == closing:
+                position += 1
+                break
+            else:
+                raise _Malformed()
+
+        # Replicate the field order and the handling of duplicate fields of bibtexparser.
+        field_dict = {name: value for name, value in reversed(fields)}
+        entry = {}
+        for name, value in field_dict.items():
+            name = name.lower()
+            entry[_FIELD_ALIASES.get(name, name)] = "" if value in ("", "{}") else value
+        entry["ENTRYTYPE"] = entry_type
+        entry["ID"] = key
+        return entry, position
+
+    def _parse_string_definition(self, position: int) -> int:
+        position, closing = self._expect_opening(position)
+        position = self._skip_whitespace(position)
+
+        match = _STRING_NAME.match(self._text, position)
+        if match is None:
+            raise _Malformed()
+        position = self._expect(match.end(), "=")
+        value, position = self._parse_value(self._skip_whitespace(position), strip=False)
+
+        self._strings[match.group().lower()] = "" if value in ("", "{}") else value
+        return self._expect(position, closing)
+
+    def _parse_value(self, position: int, strip: bool = True) -> tuple[str, int]:
+        """
+        Parses a number or a concatenation of braced values, quoted values and string names with "#". String names are
+        replaced by their values. If strip is set, leading whitespace is removed from all but the first line of every
+        braced or quoted value.
+        """
+
+        text = self._text
+
+        match = _INTEGER.match(text, position)
+        if match is not None:
+            if match.end() == len(text):
+                self._fail_or_wait(False)
+            return match.group(), match.end()
+
+        parts = []
+        while True:
+            self._check_end(position)
+            character = text[position]
+            if character == "{":
+                end = self._find_closing_brace(position + 1, _BRACE)
+                value = text[position + 1:end - 1]
+                parts.append(_strip_after_new_lines(value) if strip else value)
+            elif character == '"':
+                end = self._find_closing_brace(position + 1, _BRACE_OR_QUOTE, quoted=True)
+                value = text[position + 1:end - 1]
+                parts.append(_strip_after_new_lines(value) if strip else value)
+            else:
+                match = _STRING_NAME.match(text, position)
+                if match is None:
+                    raise _Malformed()
+                end = match.end()
+                self._check_end(end)
+                name = match.group().lower()
+                if name not in self._strings:
+                    raise _Malformed()
+                parts.append(self._strings[name])
+
+            position = self._skip_whitespace(end)
+            if text[position] != "#":
+                return "".join(parts), position
+            position = self._skip_whitespace(position + 1)
+
+    def _find_closing_brace(self, position: int, pattern: re.Pattern, quoted: bool = False) -> int:
+        """
+        Returns the position after the closing brace (or closing quote if quoted) that matches the opening one before
+        the given position.
+        """
+
+        depth = 0
+        for match in pattern.finditer(self._text, position):
+            character = match.group()
+            if character == "{":
+                depth += 1
+            elif character == "}":
+                if depth == 0:
+                    if quoted:
+                        raise _Malformed()
+                    return match.end()
+                depth -= 1
+            elif depth == 0:
+                return match.end()
+
+        self._fail_or_wait(False)
+
+    def _expect_opening(self, position: int) -> tuple[int, str]:
+        """
+        Expects an opening brace or parenthesis. Returns the position after it and the matching closing character.
+        """
+
+        position = self._skip_whitespace(position)
+        if self._text[position] == "{":
+            return position + 1, "}"
+        if self._text[position] == "(":
+            return position + 1, ")"
+        raise _Malformed()
+
+    def _expect(self, position: int, character: str) -> int:
+        position = self._skip_whitespace(position)
+        if self._text[position] != character:
+            raise _Malformed()
+        return position + 1
+
+    def _skip_whitespace(self, position: int) -> int:
+        position = _skip_whitespace(self._text, position)
+        self._check_end(position)
+        return position
+
+    def _check_end(self, position: int) -> None:
+        if position >= len(self._text):
+            self._fail_or_wait(False)
+
+    def _fail_or_wait(self, malformed: bool) -> None:
+        if malformed or self._final:
+            raise _Malformed()
+        raise _Incomplete()
+
+
+def _skip_whitespace(text: str, position: int) -> int:
+    length = len(text)
+    while position < length and text[position] in _WHITESPACE:
+        position += 1
+    return position
+
+
+def _is_name_character(text: str, position: int) -> bool:
+    return position < len(text) and (text[position].isalnum() or text[position] in "_$")
+
+
+def _strip_after_new_lines(value: str) -> str:
+    """
+    Removes leading whitespace from all but the first line, like bibtexparser does.
+    """
+
+    lines = value.splitlines()
+    if len(lines) > 1:
+        lines = [lines[0]] + [line.lstrip() for line in lines[1:]]
+    return "\n".join(lines)
@@ -1,37 +1,276 @@
-from dataclasses import dataclass, field
+from __future__ import annotations
 
-from dblp_fetcher.util import normalized_title
+import hashlib
+import logging
+import os
+import pickle
+import re
+import unicodedata
+from typing import Optional
+
+from bibtexparser.latexenc import latex_to_unicode
+
+from dblp_fetcher.util import TITLE_NORMALIZATION_VERSION, atomic_write, normalized_title
+from ._publications import Publication
+
+# Increased whenever the pickled form of the blacklist or the matching of rules changes, so outdated cache files are
+# not loaded. The cache files are also keyed by the version of the title normalization.
+_CACHE_VERSION = 2
+
+_DOI_PREFIX = re.compile(r"^(https?://(dx\.)?doi\.org/|doi:)", re.IGNORECASE)
+_DBLP_BIBURL = re.compile(r"^https?://dblp\.org/rec/(.+)\.bib$")
+
+# Inline flags at the start of a regex rule, e.g. "(?i)". They apply to the whole rule, but are only allowed at the
+# start of the combined expression, so they are turned into flags that are scoped to the rule.
+_GLOBAL_FLAGS = re.compile(r"^\(\?([aiLmsux]+)\)")
+
+# Marks the end of a prefix in the trie. It cannot clash with a character of a normalized title.
+_END = ""
 
 
 class TitleBlacklist:
     """
+    Matches publications against blacklist rules. A rule is either a plain title or has one of the following forms:
+
+    * "title:<title>" matches publications with this title, e.g. if the title itself starts with a rule prefix.
+    * "prefix:<title>" matches publications whose title starts with this title.
+    * "regex:<pattern>" matches publications whose title contains a match of the regular expression, ignoring case.
+      The expression is matched against the title after LaTeX markup was converted to Unicode, braces were removed, and
+      whitespace was collapsed, e.g. against "Front Matter" for "{F}ront {M}atter". Inline flags like "(?s)" are only
+      allowed at the start of the expression.
+    * "doi:<doi>" matches publications with this DOI.
+    * "dblp:<key>" matches publications with this DBLP key, e.g. "dblp:conf/esws/DoeR20".
+
+    Titles are compared after normalization, so case, whitespace, punctuation, and LaTeX markup do not matter. Exact
+    titles, DOIs and DBLP keys are kept in sets, prefixes in a trie over normalized titles, and all regular expressions
+    are combined into one once the rules are added, so a publication is checked against all rules in a single pass
+    over its title.
+
     Parameters
     ----------
     blacklist:
-        The set of blacklisted titles.
+        The list of rules.
     """
 
+    @staticmethod
+    def from_file(path: str, cache_directory: Optional[str] = None) -> TitleBlacklist:
+        """
+        Reads the rules from a text file with one rule per line. Empty lines and lines starting with "#" are ignored as
+        comments, so a title that starts with "#" has to be written as "title:#...".
+        If a cache directory is given, the compiled blacklist is stored there, keyed by the hash of the file, and loaded
+        instead of compiling the rules again as long as the file does not change. Raises ValueError if a regex rule is
+        not a valid regular expression.
+        """
+
+        with open(path, "rb") as file:
+            content = file.read()
+
+        cache_path = None
+        if cache_directory is not None:
+            digest = hashlib.sha256(content).hexdigest()
+            version = f"{_CACHE_VERSION}-{TITLE_NORMALIZATION_VERSION}"
+            cache_path = os.path.join(cache_directory, f"blacklist-{version}-{digest}.pickle")
+            blacklist = _load_cached_blacklist(cache_path)
+            if blacklist is not None:
+                return blacklist
+
+        blacklist = TitleBlacklist([
+            line.strip()
+            for line in content.decode("UTF-8").splitlines()
+            if line.strip() != "" and not line.strip().startswith("#")
+        ])
+
+        if cache_path is not None:
+            _store_cached_blacklist(cache_path, blacklist)
+
+        return blacklist
+
     def __init__(self, blacklist: list[str] = None):
         if blacklist is None:
             blacklist = list()
 
-        self._blacklist: set[str] = set()
+        self._titles: set[str] = set()
+        self._prefixes: dict = {}
+        self._patterns: list[str] = []
+        self._regex: Optional[re.Pattern] = None
+        self._dois: set[str] = set()
+        self._dblp_keys: set[str] = set()
 
-        for title in blacklist:
-            self.add(title)
-
-    _blacklist: set[str] = field(default_factory=set)
+        for rule in blacklist:
+            self.add_rule(rule)
+        self._compile_patterns()
 
     def add(self, title: str):
         """
         Adds the given title to the blacklist.
         """
 
-        self._blacklist.add(normalized_title(title))
+        self._titles.add(normalized_title(title))
+
+    def add_rule(self, rule: str):
+        """
+        Adds the given rule to the blacklist. Rules without a known prefix are treated as titles. Raises ValueError if a
+        regex rule is not a valid regular expression.
+        """
+
+        kind, separator, value = rule.partition(":")
+        value = value.strip()
+
+        if separator == "" or kind not in ("title", "prefix", "regex", "doi", "dblp"):
+            self.add(rule)
+        elif kind == "title":
+            self.add(value)
+        elif kind == "prefix":
+            prefix = normalized_title(value)
+            if prefix != "":
+                self._add_prefix(prefix)
+        elif kind == "regex":
+            self._patterns.append(_scoped_pattern(value))
+            # The combined expression is only compiled again when it is needed, so adding many rules stays linear.
+            self._regex = None
+        elif kind == "doi":
+            self._dois.add(_normalized_doi(value))
+        else:
+            self._dblp_keys.add(value)
 
     def is_blacklisted(self, title: str) -> bool:
         """
-        Checks if the given title is blacklisted.
+        Checks if the given title is blacklisted by a title, prefix, or regex rule.
+        """
+
+        normalized = normalized_title(title)
+        return normalized in self._titles or \
+            self._has_blacklisted_prefix(normalized) or \
+            (len(self._patterns) > 0 and self._compile_patterns().search(_plain_title(title)) is not None)
+
+    def matches(self, publication: Publication) -> bool:
         """
+        Checks if the given publication is blacklisted by any rule.
+        """
+
+        if self._dois:
+            doi = publication.get_property("doi")
+            if doi is not None and _normalized_doi(doi) in self._dois:
+                return True
+
+        if self._dblp_keys:
+            dblp_key = _dblp_key(publication)
+            if dblp_key is not None and dblp_key in self._dblp_keys:
+                return True
+
+        title = publication.title
+        return title is not None and self.is_blacklisted(title)
+
+    def _compile_patterns(self) -> Optional[re.Pattern]:
+        """
+        Returns the combination of all regex rules, which is compiled if rules were added since it was last compiled.
+        """
+
+        if self._regex is None and len(self._patterns) > 0:
+            self._regex = re.compile("|".join(self._patterns), re.IGNORECASE)
+        return self._regex
+
+    def _add_prefix(self, prefix: str) -> None:
+        node = self._prefixes
+        for character in prefix:
+            node = node.setdefault(character, {})
+        node[_END] = {}
+
+    def _has_blacklisted_prefix(self, normalized: str) -> bool:
+        node = self._prefixes
+        if not node:
+            return False
+
+        for character in normalized:
+            if _END in node:
+                return True
+            node = node.get(character)
+            if node is None:
+                return False
+
+        return _END in node
+
+
+def _scoped_pattern(pattern: str) -> str:
+    """
+    Returns the regex rule as a group that can be combined with other rules. Inline flags at its start are scoped to
+    the group. Raises ValueError if the rule is not a valid regular expression, e.g. because of inline flags elsewhere.
+    """
+
+    try:
+        re.compile(pattern)
+    except re.error as error:
+        raise ValueError(f"Invalid regex rule {pattern!r} in blacklist: {error}") from error
+
+    match = _GLOBAL_FLAGS.match(pattern)
+    if match is None:
+        return f"(?:{pattern})"
+
+    # The closing parenthesis of the group ends up in a trailing comment of a verbose rule, so check the group as well.
+    try:
+        scoped = f"(?{match.group(1)}:{pattern[match.end():]})"
+        re.compile(scoped)
+    except re.error as error:
+        raise ValueError(f"Unsupported inline flags in regex rule {pattern!r} in blacklist: {error}") from error
+    return scoped
+
+
+def _plain_title(title: str) -> str:
+    """
+    Returns the title with LaTeX markup converted to Unicode, without braces, and with whitespace collapsed.
+    """
+
+    if "\\" in title:
+        title = latex_to_unicode(title)
+    title = unicodedata.normalize("NFC", title.replace("{", "").replace("}", ""))
+    return " ".join(title.split())
+
+
+def _normalized_doi(doi: str) -> str:
+    return _DOI_PREFIX.sub("", doi.strip()).replace("\\_", "_").lower()
+
+
+def _dblp_key(publication: Publication) -> Optional[str]:
+    """
+    Returns the DBLP key of the publication from its bibtex key or its DBLP URL, or None if it has none.
+    """
+
+    bibtex_key = publication.get_property("ID")
+    if bibtex_key is not None and bibtex_key.startswith("DBLP:"):
+        return bibtex_key[len("DBLP:"):]
+
+    biburl = publication.get_property("biburl")
+    if biburl is not None:
+        match = _DBLP_BIBURL.match(biburl)
+        if match is not None:
+            return match.group(1)
+
+    return None
+
+
+def _store_cached_blacklist(path: str, blacklist: TitleBlacklist) -> None:
+    """
+    Stores the blacklist at the path and removes the cached blacklists of previous versions of the file.
+    """
+
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    for name in os.listdir(directory):
+        if name.startswith("blacklist-") and name.endswith(".pickle"):
+            os.remove(os.path.join(directory, name))
+
+    with atomic_write(path, "wb") as file:
+        pickle.dump(blacklist, file)
+
+
+def _load_cached_blacklist(path: str) -> Optional[TitleBlacklist]:
+    try:
+        with open(path, "rb") as file:
+            blacklist = pickle.load(file)
+    except FileNotFoundError:
+        return None
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError) as error:
+        logging.warning(f"Ignoring unreadable blacklist cache {path}: {error}")
+        return None
 
-        return normalized_title(title) in self._blacklist
+    return blacklist if isinstance(blacklist, TitleBlacklist) else None
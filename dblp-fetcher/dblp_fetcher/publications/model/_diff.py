@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Optional
+
+from ._publications import Bibliography, Publication
+
+
+@dataclass
+class FieldChange:
+    """
+    Parameters
+    ----------
+    field:
+        The name of the changed bibtex field.
+    old:
+        The previous value, or None if the field was added.
+    new:
+        The current value, or None if the field was removed.
+    """
+
+    field: str
+    old: Optional[str]
+    new: Optional[str]
+
+
+@dataclass
+class ChangedPublication:
+    """
+    Parameters
+    ----------
+    old:
+        The publication before the change.
+    new:
+        The publication after the change.
+    changes:
+        The changed fields, sorted by their name.
+    """
+
+    old: Publication
+    new: Publication
+    changes: list[FieldChange]
+
+
+@dataclass
+class BibliographyDiff:
+    """
+    Parameters
+    ----------
+    added:
+        The publications that are only in the new bibliography, in its order.
+    changed:
+        The publications whose fields differ between both bibliographies, in the order of the new bibliography.
+    removed:
+        The publications that are only in the old bibliography, in its order.
+    """
+
+    added: list[Publication] = field(default_factory=list)
+    changed: list[ChangedPublication] = field(default_factory=list)
+    removed: list[Publication] = field(default_factory=list)
+
+    def is_empty(self) -> bool:
+        return len(self.added) == 0 and len(self.changed) == 0 and len(self.removed) == 0
+
+    def to_bibliography(self) -> Bibliography:
+        """
+        Returns a bibliography with the added and changed publications in their current state.
+        """
+
+        return Bibliography(self.added + [changed.new for changed in self.changed])
+
+    def to_json(self) -> dict:
+        """
+        Returns the diff as a JSON-serializable dictionary. Added and changed publications contain their complete bibtex
+        entry, changed ones also the changed fields. Removed publications are only listed with their ID.
+        """
+
+        return {
+            "added": [{"id": publication.id, "entry": publication.bibtex_dict} for publication in self.added],
+            "changed": [
+                {
+                    "id": changed.new.id,
+                    "entry": changed.new.bibtex_dict,
+                    "changes": [
+                        {"field": change.field, "old": change.old, "new": change.new}
+                        for change in changed.changes
+                    ]
+                }
+                for changed in self.changed
+            ],
+            "removed": [{"id": publication.id} for publication in self.removed],
+        }
+
+
+def diff_bibliographies(old: Bibliography, new: Bibliography) -> BibliographyDiff:
+    """
+    Compares two bibliographies publication by publication. Publications are matched by their ID and compared by their
+    content hash, so the fields are only compared for publications whose hashes differ.
+    """
+
+    old_publications = {publication.id: publication for publication in old.publications}
+    new_ids = {publication.id for publication in new.publications}
+    diff = BibliographyDiff()
+
+    for publication in new.publications:
+        old_publication = old_publications.get(publication.id)
+        if old_publication is None:
+            diff.added.append(publication)
+            continue
+
+        if old_publication.content_hash != publication.content_hash:
+            changes = _field_changes(old_publication.bibtex_dict, publication.bibtex_dict)
+            diff.changed.append(ChangedPublication(old_publication, publication, changes))
+
+    diff.removed = [publication for publication in old.publications if publication.id not in new_ids]
+
+    return diff
+
+
+def _field_changes(old_entry: dict[str, str], new_entry: dict[str, str]) -> list[FieldChange]:
+    return [
+        FieldChange(key, old_entry.get(key), new_entry.get(key))
+        for key in sorted(old_entry.keys() | new_entry.keys())
+        if old_entry.get(key) != new_entry.get(key)
+    ]
@@ -0,0 +1,321 @@
+from __future__ import annotations
+
+import re
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+from dblp_fetcher.util import normalized_title
+from ._publications import Bibliography, Publication
+
+# Length of the character n-grams that titles are split into.
+_SHINGLE_LENGTH = 3
+
+# Numbers in titles, including ordinal words like "first", whose value is looked up in _ORDINALS.
+_NUMBER = re.compile(r"\d+|\b(?:first|second|third|fourth|fifth|sixth|seventh|eighth|ninth|tenth)\b", re.IGNORECASE)
+
+_ORDINALS = {
+    "first": 1, "second": 2, "third": 3, "fourth": 4, "fifth": 5,
+    "sixth": 6, "seventh": 7, "eighth": 8, "ninth": 9, "tenth": 10,
+}
+
+
+@dataclass
+class NearDuplicate:
+    """
+    Parameters
+    ----------
+    first:
+        The publication that was added to the index first.
+    second:
+        The publication that was added to the index later.
+    similarity:
+        The Jaccard similarity of the character n-grams of both normalized titles.
+    by_prefix:
+        Whether the pair was only found because one title is a prefix of the other, while the similarity is below the
+        threshold. Such pairs are often distinct publications, e.g. a report and the challenge it reports on.
+    """
+
+    first: Publication
+    second: Publication
+    similarity: float
+    by_prefix: bool = False
+
+
+@dataclass
+class NearDuplicateStatistics:
+    """
+    Parameters
+    ----------
+    publications:
+        The number of indexed publications.
+    candidate_pairs:
+        The number of pairs that shared a bucket and were compared.
+    near_duplicates:
+        The number of pairs that were confirmed as near duplicates.
+    index_seconds:
+        The time it took to build the index.
+    search_seconds:
+        The time it took to generate and verify the candidate pairs.
+    """
+
+    publications: int = 0
+    candidate_pairs: int = 0
+    near_duplicates: int = 0
+    index_seconds: float = 0
+    search_seconds: float = 0
+
+
+class NearDuplicateIndex:
+    """
+    Finds publications whose titles are nearly the same, e.g. because they differ by a typo, a subtitle, or LaTeX
+    markup. Instead of comparing all pairs, titles are put into buckets by locality-sensitive hashing of their MinHash
+    signatures and by their first characters. Only publications that share a bucket are compared, so the work grows
+    roughly linearly with the number of publications.
+
+    A candidate pair is a near duplicate if the Jaccard similarity of the titles' character n-grams reaches the
+    threshold or one title is a long prefix of the other, their years differ by at most max_year_difference, they share
+    an author last name, and the titles contain the same numbers, including ordinals like "first" or "2nd". The last check
+    keeps apart recurring publications like yearly challenge reports or workshop proceedings. Missing years or authors
+    do not prevent a match.
+
+    Parameters
+    ----------
+    threshold:
+        The minimum Jaccard similarity of two titles.
+    max_year_difference:
+        The maximum difference of the publication years.
+    prefix_length:
+        The number of normalized title characters used for prefix blocking. A title that is a prefix of another one must
+        be at least this long.
+    bands:
+        The number of LSH bands. Together with rows, this determines the similarity from which pairs likely collide.
+    rows:
+        The number of MinHash values per band.
+    max_bucket_size:
+        Buckets with more publications are skipped, since they stem from very common titles or prefixes.
+    """
+
+    def __init__(
+            self,
+            threshold: float = 0.8,
+            max_year_difference: int = 1,
+            prefix_length: int = 24,
+            bands: int = 8,
+            rows: int = 4,
+            max_bucket_size: int = 50
+    ):
+        self._threshold: float = threshold
+        self._max_year_difference: int = max_year_difference
+        self._prefix_length: int = prefix_length
+        self._bands: int = bands
+        self._rows: int = rows
+        self._max_bucket_size: int = max_bucket_size
+
+        self._publications: list[Publication] = []
+        self._shingles: list[frozenset[int]] = []
+        self._last_names: list[frozenset[str]] = []
+        self._numbers: list[tuple[int, ...]] = []
+        self._buckets: dict[tuple, list[int]] = {}
+
+        self.statistics: NearDuplicateStatistics = NearDuplicateStatistics()
+
+    def add(self, publication: Publication) -> None:
+        """
+        Adds a publication to the index. Publications without a title are ignored.
+        """
+
+        if publication.id is None:
+            return
+
+        start = time.perf_counter()
+
+        index = len(self._publications)
+        shingles = _shingles(publication.id)
+        self._publications.append(publication)
+        self._shingles.append(shingles)
+        self._last_names.append(_author_last_names(publication.authors))
+        self._numbers.append(_title_numbers(publication.title))
+
+        for key in self._bucket_keys(publication.id, shingles):
+            self._buckets.setdefault(key, []).append(index)
+
+        self.statistics.publications += 1
+        self.statistics.index_seconds += time.perf_counter() - start
+
+    def add_all(self, publications: Iterable[Publication]) -> NearDuplicateIndex:
+        """
+        Adds all publications to the index. Returns this index.
+        """
+
+        for publication in publications:
+            self.add(publication)
+
+        return self
+
+    def find_near_duplicates(self) -> list[NearDuplicate]:
+        """
+        Returns all pairs of near duplicates, ordered by the positions in which the publications were added.
+        """
+
+        start = time.perf_counter()
+
+        candidate_pairs: set[tuple[int, int]] = set()
+        for bucket in self._buckets.values():
+            if 1 < len(bucket) <= self._max_bucket_size:
+                for position, first in enumerate(bucket):
+                    for second in bucket[position + 1:]:
+                        candidate_pairs.add((first, second))
+
+        result = []
+        for first, second in sorted(candidate_pairs):
+            similarity = self._similarity(first, second)
+            if similarity is not None:
+                result.append(NearDuplicate(
+                    self._publications[first],
+                    self._publications[second],
+                    similarity,
+                    by_prefix=similarity < self._threshold
+                ))
+
+        self.statistics.candidate_pairs = len(candidate_pairs)
+        self.statistics.near_duplicates = len(result)
+        self.statistics.search_seconds = time.perf_counter() - start
+
+        return result
+
+    def _bucket_keys(self, publication_id: str, shingles: frozenset[int]) -> list[tuple]:
+        """
+        Returns the keys of the LSH band buckets and of the prefix bucket of a title.
+        """
+
+        # One-permutation MinHash: each hash value is assigned to one bin by its lowest bits and every bin keeps its
+        # minimum. This needs a single pass over the n-grams instead of one pass per hash function.
+        bin_count = self._bands * self._rows
+        signature = [None] * bin_count
+        for shingle in shingles:
+            bin_index = shingle % bin_count
+            value = shingle // bin_count
+            if signature[bin_index] is None or value < signature[bin_index]:
+                signature[bin_index] = value
+
+        keys = [
+            ("band", band, tuple(signature[band * self._rows:(band + 1) * self._rows]))
+            for band in range(self._bands)
+        ]
+        keys.append(("prefix", publication_id[:self._prefix_length]))
+        return keys
+
+    def _similarity(self, first: int, second: int) -> Optional[float]:
+        """
+        Returns the similarity of the titles of both publications if they are near duplicates, otherwise None.
+        """
+
+        first_publication = self._publications[first]
+        second_publication = self._publications[second]
+
+        first_year = first_publication.year
+        second_year = second_publication.year
+        if first_year is not None and second_year is not None and \
+                abs(first_year - second_year) > self._max_year_difference:
+            return None
+
+        first_last_names = self._last_names[first]
+        second_last_names = self._last_names[second]
+        if first_last_names and second_last_names and first_last_names.isdisjoint(second_last_names):
+            return None
+
+        if self._numbers[first] != self._numbers[second]:
+            return None
+
+        first_shingles = self._shingles[first]
+        second_shingles = self._shingles[second]
+        similarity = len(first_shingles & second_shingles) / len(first_shingles | second_shingles)
+        if similarity >= self._threshold:
+            return similarity
+
+        shorter, longer = sorted([first_publication.id, second_publication.id], key=len)
+        if len(shorter) >= self._prefix_length and longer.startswith(shorter):
+            return similarity
+
+        return None
+
+
+def merge_near_duplicates(bibliography: Bibliography, near_duplicates: Iterable[NearDuplicate]) -> int:
+    """
+    Merges each pair of near duplicates by adding the keywords of the second publication to the first one and removing
+    the second one from the bibliography. All other properties of the first publication are kept, since it is usually
+    the one that was curated by hand. If a publication was already merged into another one, its duplicates are merged
+    into that one as well. Pairs that were only found by their title prefix are skipped, since their similarity is
+    below the threshold. Returns the number of removed publications.
+    """
+
+    # Publications are tracked by identity, since their IDs may have changed since they were inserted.
+    merged_into: dict[int, Publication] = {}
+
+    for near_duplicate in near_duplicates:
+        if near_duplicate.by_prefix:
+            continue
+
+        target = near_duplicate.first
+        while id(target) in merged_into:
+            target = merged_into[id(target)]
+
+        source = near_duplicate.second
+        if id(source) in merged_into or source is target:
+            continue
+
+        for keyword in sorted(source.keywords):
+            target.add_keyword(keyword)
+        merged_into[id(source)] = target
+
+    bibliography.map_publications(lambda publication: None if id(publication) in merged_into else publication)
+    return len(merged_into)
+
+
+def _shingles(text: str) -> frozenset[int]:
+    """
+    Returns the hashes of all character n-grams of the text. Texts shorter than an n-gram form a single n-gram.
+    """
+
+    if len(text) <= _SHINGLE_LENGTH:
+        return frozenset([zlib.crc32(text.encode("utf-8"))])
+
+    return frozenset(
+        zlib.crc32(text[index:index + _SHINGLE_LENGTH].encode("utf-8"))
+        for index in range(len(text) - _SHINGLE_LENGTH + 1)
+    )
+
+
+def _title_numbers(title: Optional[str]) -> tuple[int, ...]:
+    """
+    Returns the numbers in the title in their order, with ordinal words like "third" as their value.
+    """
+
+    if title is None:
+        return ()
+
+    return tuple(
+        int(number) if number.isdigit() else _ORDINALS[number.lower()]
+        for number in _NUMBER.findall(title.replace("{", "").replace("}", ""))
+    )
+
+
+def _author_last_names(authors: list[str]) -> frozenset[str]:
+    """
+    Returns the normalized last names of the given author names, e.g. as returned by Publication.authors.
+    """
+
+    last_names = set()
+    for name in authors:
+        if "," in name:
+            last_name = name.split(",", 1)[0]
+        else:
+            last_name = name.rsplit(" ", 1)[-1]
+
+        normalized_last_name = normalized_title(last_name)
+        if normalized_last_name != "":
+            last_names.add(normalized_last_name)
+
+    return frozenset(last_names)
@@ -1,14 +1,30 @@
 from __future__ import annotations
 
+import hashlib
+import io
+import json
+import marshal
 import re
-from typing import Optional
+import struct
+from typing import BinaryIO, Callable, Iterable, Optional, TextIO, Union
 
-from bibtexparser.bibdatabase import BibDatabase
 from bibtexparser.bparser import BibTexParser
-from bibtexparser.bwriter import BibTexWriter
 from bibtexparser.customization import homogenize_latex_encoding
 
-from dblp_fetcher.util import year_from_string, normalized_title
+from dblp_fetcher.util import metrics, year_from_string, normalized_title
+from ._bibtex_parser import iter_bibtex_entries
+
+# Keys under which bibtex entries store their keywords.
+_KEYWORD_KEYS = ("keywords", "keyword")
+
+_AUTHOR_SEPARATOR = re.compile(r"\s+and\s+")
+
+# Header of bibliography snapshots: a magic string, the snapshot format version, the marshal version, and the SHA-256
+# digest of the source the snapshot was created from. The format version is increased whenever the layout of the
+# snapshot or of the publication state changes.
+_SNAPSHOT_MAGIC = b"SDABIB"
+_SNAPSHOT_VERSION = 1
+_SNAPSHOT_HEADER = struct.Struct(f">{len(_SNAPSHOT_MAGIC)}sHH32s")
 
 
 class Bibliography:
@@ -20,20 +36,78 @@ class Bibliography:
     """
 
     @staticmethod
-    def from_bibtex(bibtex_string: str) -> Bibliography:
+    def from_bibtex(bibtex_string: str, engine: str = "streaming") -> Bibliography:
+        """
+        Parses a bibtex string and returns a bibliography. The engine is either "streaming", which uses our own parser,
+        or "bibtexparser". Both produce the same publications.
+        """
+
+        with metrics.timer("bibtex_parse"):
+            if engine == "bibtexparser":
+                bibtex_dicts: list[dict[str, str]] = _create_bibtex_parser().parse(bibtex_string).entries
+            elif engine == "streaming":
+                bibtex_dicts: list[dict[str, str]] = list(iter_bibtex_entries(bibtex_string))
+            else:
+                raise ValueError(f"Unknown bibtex engine: {engine}")
+
+            publications: list[Publication] = [Publication(bibtex_dict) for bibtex_dict in bibtex_dicts]
+
+        metrics.increment("bibtex_entries_parsed", len(publications))
+        return Bibliography(publications)
+
+    @staticmethod
+    def from_bibtex_file(file: Union[TextIO, BinaryIO], engine: str = "streaming") -> Bibliography:
         """
-        Parses a bibtex string and returns a bibliography.
+        Parses a bibtex file and returns a bibliography. With the "streaming" engine, the file is read in chunks and
+        each entry is added as soon as it is parsed.
         """
 
-        bibtex_dicts: list[dict[str, str]] = _create_bibtex_parser().parse(bibtex_string).entries
-        publications: list[Publication] = [Publication(bibtex_dict) for bibtex_dict in bibtex_dicts]
+        if engine != "streaming":
+            if not isinstance(file, io.TextIOBase):
+                file = io.TextIOWrapper(file, encoding="utf-8-sig")
+            return Bibliography.from_bibtex(file.read(), engine)
+
+        with metrics.timer("bibtex_parse"):
+            publications = [Publication(bibtex_dict) for bibtex_dict in iter_bibtex_entries(file)]
+
+        metrics.increment("bibtex_entries_parsed", len(publications))
         return Bibliography(publications)
 
+    @staticmethod
+    def from_snapshot(file: BinaryIO, source_digest: bytes) -> Optional[Bibliography]:
+        """
+        Reads a bibliography from a snapshot written by write_snapshot. Returns None if the snapshot was created from a
+        source with another SHA-256 digest, by another snapshot format version, or is not a snapshot at all, so the
+        caller can fall back to parsing the source.
+        """
+
+        header = file.read(_SNAPSHOT_HEADER.size)
+        if len(header) != _SNAPSHOT_HEADER.size:
+            return None
+
+        magic, version, marshal_version, digest = _SNAPSHOT_HEADER.unpack(header)
+        if magic != _SNAPSHOT_MAGIC or version != _SNAPSHOT_VERSION or marshal_version != marshal.version or \
+                digest != source_digest:
+            return None
+
+        try:
+            states = marshal.load(file)
+        except (EOFError, ValueError, TypeError):
+            return None
+
+        bibliography = Bibliography()
+        bibliography._publications = {
+            publication_id: Publication._from_snapshot_state(state)
+            for publication_id, state in states
+        }
+        return bibliography
+
     def __init__(self, publications=None):
         if publications is None:
             publications = []
 
         self._publications: dict[str, Publication] = {}
+        self._indexes: Optional[_PublicationIndexes] = None
         for publication in publications:
             self.upsert_publication(publication)
 
@@ -61,7 +135,25 @@ class Bibliography:
 
         if publication_id in self._publications:
             del self._publications[publication_id]
+            if self._indexes is not None:
+                self._indexes.remove(publication_id)
+
+        return self
+
+    def map_publications(self, function: Callable[[Publication], Optional[Publication]]) -> Bibliography:
+        """
+        Replaces each publication by the result of the function in a single pass. Publications for which the function
+        returns None are removed. Publications stay under the ID they were inserted with. Returns this bibliography.
+        """
+
+        mapped_publications = {}
+        for publication_id, publication in self._publications.items():
+            result = function(publication)
+            if result is not None:
+                mapped_publications[publication_id] = result
 
+        self._publications = mapped_publications
+        self._indexes = None
         return self
 
     def upsert_publication(self, publication: Publication) -> Bibliography:
@@ -70,11 +162,18 @@ class Bibliography:
         updates the existing publication unless the new publication is an arXiv preprint. Returns this bibliography.
         """
 
-        if publication.id in self._publications:
+        publication_id = publication.id
+        existing_publication = self._publications.get(publication_id)
+
+        if existing_publication is not None:
             if not publication.is_arxiv_preprint():
-                self._publications[publication.id].update(publication)
+                existing_publication.update(publication)
+                if self._indexes is not None:
+                    self._indexes.update(publication_id, existing_publication)
         else:
-            self._publications[publication.id] = publication
+            self._publications[publication_id] = publication
+            if self._indexes is not None:
+                self._indexes.add(publication_id, publication)
 
         return self
 
@@ -88,89 +187,228 @@ class Bibliography:
 
         return self
 
+    def copy(self) -> Bibliography:
+        """
+        Returns a copy of this bibliography with copies of all publications, which is not affected by later changes to
+        this bibliography or its publications.
+        """
+
+        bibliography = Bibliography()
+        bibliography._publications = {
+            publication_id: publication.copy()
+            for publication_id, publication in self._publications.items()
+        }
+        return bibliography
+
+    def find(
+            self,
+            keyword: Optional[str] = None,
+            author: Optional[str] = None,
+            min_year: Optional[int] = None,
+            max_year: Optional[int] = None
+    ) -> list[Publication]:
+        """
+        Returns all publications that have the keyword, the author, and a year in the given range, in the order they
+        were inserted. Criteria that are None are ignored. Authors are compared with the names as they are written in
+        the bibtex entries.
+
+        The lookups use indexes that are built on the first query and kept up to date by all methods of this
+        bibliography. Changes made directly to publications are only picked up after calling reindex.
+        """
+
+        if self._indexes is None:
+            self._indexes = _PublicationIndexes(self._publications)
+
+        publication_ids = self._indexes.find(keyword, author, min_year, max_year)
+        return [self._publications[publication_id] for publication_id in publication_ids]
+
+    def reindex(self) -> Bibliography:
+        """
+        Discards the indexes used by find, so they are rebuilt on the next query. This is needed after publications of
+        this bibliography were changed directly. Returns this bibliography.
+        """
+
+        self._indexes = None
+        return self
+
+    def write_snapshot(self, file: BinaryIO, source_digest: bytes) -> None:
+        """
+        Writes a binary snapshot of this bibliography that can be loaded with from_snapshot much faster than parsing
+        bibtex, since it also contains the derived fields of all publications. The digest identifies the source the
+        bibliography was read from, e.g. the SHA-256 digest of the bibtex file.
+        """
+
+        states = [
+            (publication_id, publication._snapshot_state())
+            for publication_id, publication in self._publications.items()
+        ]
+        file.write(_SNAPSHOT_HEADER.pack(_SNAPSHOT_MAGIC, _SNAPSHOT_VERSION, marshal.version, source_digest))
+        marshal.dump(states, file)
+
     def to_bibtex(self) -> str:
         """
         Returns a bibtex string representation of this bibliography.
         """
 
-        if len(self._publications) == 0:
-            return ""
+        output = io.StringIO()
+        self.write_bibtex(output)
+        return output.getvalue()
+
+    def write_bibtex(self, file: TextIO) -> None:
+        """
+        Writes a bibtex representation of this bibliography to the given file one entry at a time. Entries are sorted by
+        their bibtex key and values are aligned, like bibtexparser's BibTexWriter with align_values does.
+        """
+
+        publications = sorted(self._publications.values(), key=Publication._bibtex_sort_key)
+        if len(publications) == 0:
+            return
 
-        db = BibDatabase()
-        db.entries = [publication.bibtex_dict for publication in self._publications.values()]
+        # Like BibTexWriter, the field width includes the internal keys ENTRYTYPE and ID.
+        field_width = max(publication._field_width() for publication in publications)
 
-        return _create_bibtex_writer().write(db)
+        for index, publication in enumerate(publications):
+            if index > 0:
+                file.write("\n")
+            file.write(publication._to_bibtex(field_width))
 
 
 class Publication:
+    """
+    A publication with the properties of a bibtex entry. Keywords are kept as a set and the ID, the year, and whether
+    the publication is an arXiv preprint are derived once whenever the underlying properties change. The bibtex
+    dictionary is only assembled on request, e.g. for output. The content hash is computed on request as well and kept
+    until the publication changes.
+
+    Parameters
+    ----------
+    bibtex_dict:
+        The properties of the publication as created by the bibtex parser. Keywords may be given as "keywords" or
+        "keyword" and be separated by commas or whitespace.
+    """
+
+    __slots__ = ("_properties", "_keywords", "_keywords_string", "_id", "_year", "_is_arxiv_preprint", "_content_hash")
+
     def __init__(self, bibtex_dict: dict[str, str]):
-        self.bibtex_dict: dict[str, str] = bibtex_dict
-        self._normalize_keywords()
+        keywords_string = bibtex_dict.get("keywords")
+        if keywords_string is None:
+            keywords_string = bibtex_dict.get("keyword")
+
+        self._properties: dict[str, str] = {
+            key: value
+            for key, value in bibtex_dict.items()
+            if key not in _KEYWORD_KEYS
+        }
+        self._keywords: frozenset[str] = _parse_keywords(keywords_string)
+        self._keywords_string: Optional[str] = None
+        self._content_hash: Optional[str] = None
+
+        self._id: Optional[str] = None
+        self._year: Optional[int] = None
+        self._is_arxiv_preprint: bool = False
+        self._update_derived_fields(self._properties.keys())
 
-    def _normalize_keywords(self) -> None:
+    @property
+    def author(self) -> Optional[str]:
+        return self._properties.get("author")
+
+    @property
+    def authors(self) -> list[str]:
         """
-        Ensures the "keywords" property exists, that keywords are separated by commas, and that they are sorted.
+        Returns the individual names in the author property, with line breaks and repeated whitespace collapsed.
         """
 
-        sorted_keywords = sorted(self.keywords)
-        self.bibtex_dict["keywords"] = ", ".join(sorted_keywords)
+        author = self.author
+        if author is None:
+            return []
 
-        if "keyword" in self.bibtex_dict:
-            del self.bibtex_dict["keyword"]
+        return [" ".join(name.split()) for name in _AUTHOR_SEPARATOR.split(author) if name.strip() != ""]
 
     @property
-    def author(self) -> Optional[str]:
-        return self.bibtex_dict.get("author")
+    def bibtex_dict(self) -> dict[str, str]:
+        """
+        Returns a new dictionary with all properties of this publication, including the sorted, comma-separated
+        keywords. Changes to it are not reflected in this publication, use set_property instead.
+        """
+
+        result = dict(self._properties)
+        result["keywords"] = self._serialized_keywords()
+        return result
+
+    @property
+    def content_hash(self) -> str:
+        """
+        Returns the SHA-256 hash of the bibtex dictionary of this publication. Publications with the same properties and
+        keywords have the same hash.
+        """
+
+        if self._content_hash is None:
+            content = json.dumps(self.bibtex_dict, sort_keys=True)
+            self._content_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+        return self._content_hash
 
     @property
     def eprinttype(self) -> Optional[str]:
-        return self.bibtex_dict.get("eprinttype")
+        return self._properties.get("eprinttype")
 
     @property
     def id(self) -> Optional[str]:
-        if self.title is None:
-            return None
-
-        return normalized_title(self.title)
+        return self._id
 
     @property
     def journal(self) -> Optional[str]:
-        return self.bibtex_dict.get("journal")
+        return self._properties.get("journal")
 
     @property
-    def keywords(self) -> set[str]:
-        keywords_string = self.bibtex_dict.get("keywords")
-        if keywords_string is None:
-            keywords_string = self.bibtex_dict.get("keyword")
-        if keywords_string is None:
-            return set()
-
-        keyword_list = re.split(r"[,\s]", keywords_string)
-        non_empty_keyword_list = [keyword for keyword in keyword_list if keyword != ""]
-        return set(non_empty_keyword_list)
+    def keywords(self) -> frozenset[str]:
+        return self._keywords
 
     @property
     def title(self) -> Optional[str]:
-        return self.bibtex_dict.get("title")
+        return self._properties.get("title")
 
     @property
     def year(self) -> Optional[int]:
-        year_string = self.bibtex_dict.get("year")
-        if year_string is None:
-            return None
+        return self._year
+
+    def get_property(self, key: str) -> Optional[str]:
+        """
+        Returns the value of the property with the given key, or None if it does not exist.
+        """
+
+        if key in _KEYWORD_KEYS:
+            return self._serialized_keywords()
+
+        return self._properties.get(key)
+
+    def set_property(self, key: str, value: str) -> Publication:
+        """
+        Sets the property with the given key. Setting "keywords" replaces all keywords. Returns this publication.
+        """
+
+        if key in _KEYWORD_KEYS:
+            keywords = _parse_keywords(value)
+            if keywords != self._keywords:
+                self._keywords = keywords
+                self._keywords_string = None
+                self._content_hash = None
+        elif self._properties.get(key) != value:
+            self._properties[key] = value
+            self._update_derived_fields((key,))
+            self._content_hash = None
 
-        return year_from_string(year_string)
+        return self
 
     def add_keyword(self, keyword: str) -> Publication:
         """
         Adds a keyword to this publication. Returns this publication.
         """
 
-        keyword_set = self.keywords
-        keyword_set.add(keyword)
-
-        sorted_keywords = sorted(keyword_set)
-        self.bibtex_dict["keywords"] = ", ".join(sorted_keywords)
+        if keyword not in self._keywords:
+            self._keywords = self._keywords | {keyword}
+            self._keywords_string = None
+            self._content_hash = None
 
         return self
 
@@ -179,34 +417,262 @@ class Publication:
         Removes the property with the given key. Returns this publication.
         """
 
-        if key in self.bibtex_dict:
-            del self.bibtex_dict[key]
+        if key in _KEYWORD_KEYS:
+            if len(self._keywords) > 0:
+                self._keywords = frozenset()
+                self._keywords_string = None
+                self._content_hash = None
+        elif key in self._properties:
+            del self._properties[key]
+            self._update_derived_fields((key,))
+            self._content_hash = None
 
         return self
 
     def update(self, other: Publication) -> Publication:
         """
-        Updates this publication with the properties of the other publication. Returns this publication.
+        Updates this publication with the properties of the other publication. Only properties with a different value
+        are written, so the publication is left untouched if it already contains the other one. Returns this
+        publication.
         """
 
         # Keywords are merged, everything else is overwritten.
-        old_keywords = self.keywords
-        self.bibtex_dict.update(other.bibtex_dict)
-        for keyword in old_keywords:
-            self.add_keyword(keyword)
+        changed_keys = [key for key, value in other._properties.items() if self._properties.get(key) != value]
+        if len(changed_keys) > 0:
+            for key in changed_keys:
+                self._properties[key] = other._properties[key]
+            self._update_derived_fields(changed_keys)
+            self._content_hash = None
+
+        if not other._keywords <= self._keywords:
+            self._keywords = self._keywords | other._keywords
+            self._keywords_string = None
+            self._content_hash = None
 
         return self
 
+    def copy(self) -> Publication:
+        """
+        Returns a copy of this publication, which is not affected by later changes to this publication.
+        """
+
+        publication = Publication.__new__(Publication)
+        publication._properties = dict(self._properties)
+        publication._keywords = self._keywords
+        publication._keywords_string = self._keywords_string
+        publication._content_hash = self._content_hash
+        publication._id = self._id
+        publication._year = self._year
+        publication._is_arxiv_preprint = self._is_arxiv_preprint
+        return publication
+
     def is_arxiv_preprint(self) -> bool:
-        eprinttype = self.eprinttype
-        if eprinttype is not None and eprinttype.lower() == "arxiv":
-            return True
+        return self._is_arxiv_preprint
+
+    def _bibtex_sort_key(self) -> str:
+        """
+        Returns the key publications are sorted by in bibtex output, i.e. their lowercase bibtex key.
+        """
+
+        return str(self._properties.get("ID", "")).lower()
 
-        journal = self.journal
-        if journal is not None and journal.lower() == "corr":
-            return True
+    def _field_width(self) -> int:
+        """
+        Returns the length of the longest field name in the bibtex dictionary of this publication.
+        """
+
+        return max(len("keywords"), max((len(key) for key in self._properties), default=0))
+
+    def _to_bibtex(self, field_width: int) -> str:
+        """
+        Returns the bibtex representation of this publication without assembling its bibtex dictionary. Fields are
+        sorted alphabetically, indented by two spaces, and their names are padded to the given width.
+        """
+
+        lines = [f"@{self._properties['ENTRYTYPE']}{{{self._properties['ID']}"]
+        for field in sorted([*self._properties.keys(), "keywords"]):
+            if field not in ("ENTRYTYPE", "ID"):
+                value = self._serialized_keywords() if field == "keywords" else self._properties[field]
+                lines.append(f"  {field:<{field_width}} = {{{value}}}")
+
+        return ",\n".join(lines) + "\n}\n"
+
+    def _snapshot_state(self) -> tuple:
+        """
+        Returns the state of this publication as a tuple of types that marshal supports.
+        """
+
+        return self._properties, tuple(sorted(self._keywords)), self._id, self._year, self._is_arxiv_preprint
+
+    @staticmethod
+    def _from_snapshot_state(state: tuple) -> Publication:
+        """
+        Restores a publication from the result of _snapshot_state without deriving its fields again.
+        """
+
+        publication = Publication.__new__(Publication)
+        properties, keywords, publication._id, publication._year, publication._is_arxiv_preprint = state
+        publication._properties = properties
+        publication._keywords = frozenset(keywords)
+        publication._keywords_string = None
+        publication._content_hash = None
+        return publication
+
+    def _serialized_keywords(self) -> str:
+        if self._keywords_string is None:
+            self._keywords_string = ", ".join(sorted(self._keywords))
 
-        return False
+        return self._keywords_string
+
+    def _update_derived_fields(self, changed_keys: Iterable[str]) -> None:
+        """
+        Recomputes the fields that are derived from the properties with the given keys.
+        """
+
+        changed_keys = set(changed_keys)
+
+        if "title" in changed_keys:
+            title = self.title
+            self._id = normalized_title(title) if title is not None else None
+
+        if "year" in changed_keys:
+            year_string = self._properties.get("year")
+            self._year = year_from_string(year_string) if year_string is not None else None
+
+        if "eprinttype" in changed_keys or "journal" in changed_keys:
+            eprinttype = self.eprinttype
+            journal = self.journal
+            self._is_arxiv_preprint = (eprinttype is not None and eprinttype.lower() == "arxiv") or \
+                                      (journal is not None and journal.lower() == "corr")
+
+
+class _PublicationIndexes:
+    """
+    Maps keywords, authors, and years to the IDs of the publications that have them, and remembers the insertion order
+    of the IDs.
+
+    Parameters
+    ----------
+    publications:
+        The publications to index, by their ID.
+    """
+
+    def __init__(self, publications: dict[str, Publication]):
+        self._positions: dict[str, int] = {}
+        self._next_position: int = 0
+        self._by_keyword: dict[str, set[str]] = {}
+        self._by_author: dict[str, set[str]] = {}
+        self._by_year: dict[int, set[str]] = {}
+
+        # The indexed values of each publication, so they can be removed again after the publication changed.
+        self._indexed: dict[str, tuple[frozenset[str], list[str], Optional[int]]] = {}
+
+        for publication_id, publication in publications.items():
+            self.add(publication_id, publication)
+
+    def add(self, publication_id: str, publication: Publication) -> None:
+        self._positions[publication_id] = self._next_position
+        self._next_position += 1
+        self._index(publication_id, publication)
+
+    def update(self, publication_id: str, publication: Publication) -> None:
+        self._unindex(publication_id)
+        self._index(publication_id, publication)
+
+    def remove(self, publication_id: str) -> None:
+        self._unindex(publication_id)
+        del self._positions[publication_id]
+
+    def find(
+            self,
+            keyword: Optional[str],
+            author: Optional[str],
+            min_year: Optional[int],
+            max_year: Optional[int]
+    ) -> list[str]:
+        """
+        Returns the IDs of all publications that match the criteria, in insertion order.
+        """
+
+        candidate_sets = []
+        if keyword is not None:
+            candidate_sets.append(self._by_keyword.get(keyword, set()))
+        if author is not None:
+            candidate_sets.append(self._by_author.get(" ".join(author.split()), set()))
+
+        has_year_range = min_year is not None or max_year is not None
+        if min_year is None:
+            min_year = -float("inf")
+        if max_year is None:
+            max_year = float("inf")
+
+        if len(candidate_sets) > 0:
+            # Start with the smallest set and check the years of the remaining candidates directly.
+            candidate_sets.sort(key=len)
+            result = set(candidate_sets[0]).intersection(*candidate_sets[1:])
+            if has_year_range:
+                result = {
+                    publication_id
+                    for publication_id in result
+                    if self._indexed[publication_id][2] is not None and
+                    min_year <= self._indexed[publication_id][2] <= max_year
+                }
+        elif has_year_range:
+            result = set().union(*(
+                publication_ids
+                for year, publication_ids in self._by_year.items()
+                if min_year <= year <= max_year
+            ))
+        else:
+            result = self._positions.keys()
+
+        return sorted(result, key=self._positions.__getitem__)
+
+    def _index(self, publication_id: str, publication: Publication) -> None:
+        keywords = publication.keywords
+        authors = publication.authors
+        year = publication.year
+        self._indexed[publication_id] = (keywords, authors, year)
+
+        for keyword in keywords:
+            self._by_keyword.setdefault(keyword, set()).add(publication_id)
+        for author in authors:
+            self._by_author.setdefault(author, set()).add(publication_id)
+        if year is not None:
+            self._by_year.setdefault(year, set()).add(publication_id)
+
+    def _unindex(self, publication_id: str) -> None:
+        keywords, authors, year = self._indexed.pop(publication_id)
+
+        for keyword in keywords:
+            _discard(self._by_keyword, keyword, publication_id)
+        for author in authors:
+            _discard(self._by_author, author, publication_id)
+        if year is not None:
+            _discard(self._by_year, year, publication_id)
+
+
+def _discard(index: dict, key, publication_id: str) -> None:
+    """
+    Removes the ID from the set of the key in the index, and the key if its set becomes empty.
+    """
+
+    publication_ids = index.get(key)
+    if publication_ids is not None:
+        publication_ids.discard(publication_id)
+        if len(publication_ids) == 0:
+            del index[key]
+
+
+def _parse_keywords(keywords_string: Optional[str]) -> frozenset[str]:
+    """
+    Splits a string of keywords separated by commas or whitespace.
+    """
+
+    if keywords_string is None:
+        return frozenset()
+
+    return frozenset(keyword for keyword in re.split(r"[,\s]", keywords_string) if keyword != "")
 
 
 def _create_bibtex_parser() -> BibTexParser:
@@ -219,14 +685,3 @@ def _create_bibtex_parser() -> BibTexParser:
     bibtex_parser.homogenize_fields = True
     bibtex_parser.customization = homogenize_latex_encoding
     return bibtex_parser
-
-
-def _create_bibtex_writer() -> BibTexWriter:
-    """
-    Returns a BibTexWriter instance with custom settings.
-    """
-
-    writer = BibTexWriter()
-    writer.align_values = True
-    writer.indent = "  "
-    return writer
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+from typing import Iterable, Optional, TextIO
+
+from ._publications import Bibliography, Publication
+
+# Increased whenever the schema changes. Stores with another version are rejected instead of being misread.
+_SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS metadata (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS publications (
+    id TEXT PRIMARY KEY,
+    year INTEGER,
+    entry TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS publications_year ON publications (year);
+CREATE TABLE IF NOT EXISTS publication_keywords (
+    publication_id TEXT NOT NULL REFERENCES publications (id) ON DELETE CASCADE,
+    keyword TEXT NOT NULL,
+    PRIMARY KEY (publication_id, keyword)
+);
+CREATE INDEX IF NOT EXISTS publication_keywords_keyword ON publication_keywords (keyword);
+CREATE TABLE IF NOT EXISTS publication_authors (
+    publication_id TEXT NOT NULL REFERENCES publications (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    author TEXT NOT NULL,
+    PRIMARY KEY (publication_id, position)
+);
+CREATE INDEX IF NOT EXISTS publication_authors_author ON publication_authors (author);
+"""
+
+
+class BibliographyStore:
+    """
+    Persists publications in an SQLite database, keyed by their ID. Besides the complete bibtex entry, the year, the
+    keywords, and the authors are stored in indexed columns, so publications can be queried without loading all of
+    them. All writes happen in a transaction, so the store is never left half updated. The store may be used from any
+    thread, but not from several threads at the same time.
+
+    Parameters
+    ----------
+    path:
+        The database file. It is created if it does not exist.
+    """
+
+    def __init__(self, path: str):
+        self._connection: sqlite3.Connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA foreign_keys = ON")
+
+        with self._connection:
+            self._connection.executescript(_SCHEMA)
+            row = self._connection.execute("SELECT value FROM metadata WHERE key = 'schema_version'").fetchone()
+            if row is None:
+                self._connection.execute(
+                    "INSERT INTO metadata (key, value) VALUES ('schema_version', ?)",
+                    (str(_SCHEMA_VERSION),)
+                )
+            elif row[0] != str(_SCHEMA_VERSION):
+                self._connection.close()
+                raise ValueError(f"Unsupported schema version {row[0]} of bibliography store {path}")
+
+    def __enter__(self) -> BibliographyStore:
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def __len__(self) -> int:
+        return self._connection.execute("SELECT COUNT(*) FROM publications").fetchone()[0]
+
+    def load(self) -> Bibliography:
+        """
+        Returns a bibliography with all stored publications, in the order they were first stored.
+        """
+
+        rows = self._connection.execute("SELECT entry FROM publications ORDER BY rowid")
+        return Bibliography(Publication(json.loads(entry)) for entry, in rows)
+
+    def get(self, publication_id: str) -> Optional[Publication]:
+        """
+        Returns the stored publication with the given ID, or None if there is none.
+        """
+
+        row = self._connection.execute("SELECT entry FROM publications WHERE id = ?", (publication_id,)).fetchone()
+        return Publication(json.loads(row[0])) if row is not None else None
+
+    def find(
+            self,
+            keyword: Optional[str] = None,
+            author: Optional[str] = None,
+            min_year: Optional[int] = None,
+            max_year: Optional[int] = None
+    ) -> list[Publication]:
+        """
+        Returns all stored publications that have the keyword, the author, and a year in the given range. Criteria that
+        are None are ignored. Authors are compared with the names as they are written in the bibtex entries.
+        """
+
+        conditions = []
+        parameters = []
+        if keyword is not None:
+            conditions.append("id IN (SELECT publication_id FROM publication_keywords WHERE keyword = ?)")
+            parameters.append(keyword)
+        if author is not None:
+            conditions.append("id IN (SELECT publication_id FROM publication_authors WHERE author = ?)")
+            parameters.append(author)
+        if min_year is not None:
+            conditions.append("year >= ?")
+            parameters.append(min_year)
+        if max_year is not None:
+            conditions.append("year <= ?")
+            parameters.append(max_year)
+
+        where = f"WHERE {' AND '.join(conditions)}" if len(conditions) > 0 else ""
+        rows = self._connection.execute(f"SELECT entry FROM publications {where} ORDER BY rowid", parameters)
+        return [Publication(json.loads(entry)) for entry, in rows]
+
+    def upsert_publications(self, publications: Iterable[Publication]) -> int:
+        """
+        Stores the publications in one transaction, replacing stored publications with the same ID. Publications that
+        are stored unchanged are not written again. Returns the number of written publications.
+        """
+
+        written = 0
+        with self._connection:
+            for publication in publications:
+                if self._upsert(publication):
+                    written += 1
+        return written
+
+    def remove_publications(self, publication_ids: Iterable[str]) -> int:
+        """
+        Removes the publications with the given IDs in one transaction. Returns the number of removed publications.
+        """
+
+        with self._connection:
+            cursor = self._connection.executemany(
+                "DELETE FROM publications WHERE id = ?",
+                ((publication_id,) for publication_id in publication_ids)
+            )
+            return cursor.rowcount
+
+    def save(self, bibliography: Bibliography) -> tuple[int, int]:
+        """
+        Makes the store contain exactly the publications of the bibliography in one transaction. Only new and changed
+        publications are written, and only publications that are no longer in the bibliography are removed. Returns the
+        number of written and removed publications.
+        """
+
+        publications = [publication for publication in bibliography.publications if publication.id is not None]
+        current_ids = {publication.id for publication in publications}
+
+        with self._connection:
+            stored_ids = [row[0] for row in self._connection.execute("SELECT id FROM publications")]
+            removed_ids = [publication_id for publication_id in stored_ids if publication_id not in current_ids]
+            self._connection.executemany(
+                "DELETE FROM publications WHERE id = ?",
+                ((publication_id,) for publication_id in removed_ids)
+            )
+
+            written = 0
+            for publication in publications:
+                if self._upsert(publication):
+                    written += 1
+
+        return written, len(removed_ids)
+
+    def export_bibtex(self, file: TextIO) -> None:
+        """
+        Writes all stored publications to the given file, in the same format as Bibliography.write_bibtex.
+        """
+
+        self.load().write_bibtex(file)
+
+    def _upsert(self, publication: Publication) -> bool:
+        """
+        Stores a single publication unless it is already stored unchanged. Must be called within a transaction. Returns
+        whether the publication was written.
+        """
+
+        publication_id = publication.id
+        if publication_id is None:
+            raise ValueError("Cannot store a publication without a title")
+
+        entry = json.dumps(publication.bibtex_dict, ensure_ascii=False, sort_keys=True)
+        row = self._connection.execute("SELECT entry FROM publications WHERE id = ?", (publication_id,)).fetchone()
+        if row is not None and row[0] == entry:
+            return False
+
+        # An upsert instead of a replace keeps the rowid, and with it the order of the publications.
+        self._connection.execute(
+            "INSERT INTO publications (id, year, entry) VALUES (?, ?, ?) "
+            "ON CONFLICT (id) DO UPDATE SET year = excluded.year, entry = excluded.entry",
+            (publication_id, publication.year, entry)
+        )
+        self._connection.execute("DELETE FROM publication_keywords WHERE publication_id = ?", (publication_id,))
+        self._connection.executemany(
+            "INSERT INTO publication_keywords (publication_id, keyword) VALUES (?, ?)",
+            ((publication_id, keyword) for keyword in publication.keywords)
+        )
+        self._connection.execute("DELETE FROM publication_authors WHERE publication_id = ?", (publication_id,))
+        self._connection.executemany(
+            "INSERT INTO publication_authors (publication_id, position, author) VALUES (?, ?, ?)",
+            ((publication_id, position, author) for position, author in enumerate(publication.authors))
+        )
+        return True
+
@@ -1,3 +1,9 @@
-from ._conversion import normalized_title, url_from_string, year_from_string
-from ._google_sheets import fetch_data_from_google_sheets, fetch_google_credentials
+from ._conversion import TITLE_NORMALIZATION_VERSION, normalized_title, url_from_string, year_from_string
+from ._files import atomic_write
+from ._google_sheets import SCOPE_METADATA_READONLY, SCOPE_READONLY, fetch_data_from_google_sheets, \
+    fetch_google_credentials, fetch_spreadsheet_revision
+from ._http_cache import CachedResponse, HttpCache
+from ._metrics import MetricsRegistry, TimerStatistics, metrics
+from ._rate_limiting import RateLimiter
+from ._substitutions import SubstitutionEngine
 from ._validation import is_valid_year
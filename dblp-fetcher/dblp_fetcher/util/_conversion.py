@@ -1,20 +1,26 @@
-import re
+from functools import lru_cache
 from typing import Optional
 
-from bibtexparser.latexenc import latex_to_unicode
 from validators.url import url as is_url
 
+from ._latex import normalize_latex_title
 from ._validation import is_valid_year
 
+# Maximum number of titles whose normalized version is memoized.
+_NORMALIZED_TITLE_CACHE_SIZE = 1 << 16
 
+# Increased whenever normalized_title returns different results, so persisted normalized titles are computed again.
+TITLE_NORMALIZATION_VERSION = 1
+
+
+@lru_cache(maxsize=_NORMALIZED_TITLE_CACHE_SIZE)
 def normalized_title(title: str) -> str:
     """
-    Returns a normalized version of the given title. Particularly, special characters are removed.
+    Returns a normalized version of the given title. Particularly, special characters are removed. Results are
+    memoized, since the same titles are normalized many times while merging bibliographies.
     """
 
-    lower_unicode = latex_to_unicode(title).lower()
-    letters_only = re.sub(r"[^a-z\d]", "", lower_unicode)
-    return letters_only
+    return normalize_latex_title(title)
 
 
 def url_from_string(url_string: str) -> Optional[str]:
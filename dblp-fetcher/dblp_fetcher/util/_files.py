@@ -0,0 +1,54 @@
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import IO, Iterator
+
+
+@contextmanager
+def atomic_write(path: str, mode: str = "w", encoding: str = None) -> Iterator[IO]:
+    """
+    Opens a temporary file next to the given path for writing. When the context is left without an exception, the
+    temporary file is flushed to disk and renamed to the path, replacing the file there. Otherwise, the temporary file
+    is removed and the file at the path stays untouched. Readers therefore either see the old or the complete new file.
+    """
+
+    directory = os.path.dirname(path) or "."
+    file = tempfile.NamedTemporaryFile(
+        mode=mode,
+        encoding=encoding,
+        dir=directory,
+        prefix=f".{os.path.basename(path)}.",
+        suffix=".tmp",
+        delete=False
+    )
+
+    try:
+        with file:
+            yield file
+            file.flush()
+            os.fsync(file.fileno())
+
+        # Temporary files are only readable by their owner, so keep the permissions of the replaced file, or give a new
+        # file the permissions open() would have given it.
+        if os.path.exists(path):
+            os.chmod(file.name, os.stat(path).st_mode)
+        else:
+            os.chmod(file.name, 0o666 & ~_umask())
+
+        os.replace(file.name, path)
+    except BaseException:
+        try:
+            os.remove(file.name)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def _umask() -> int:
+    """
+    Returns the umask of the process. It can only be read by setting it, so it is set back right away.
+    """
+
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
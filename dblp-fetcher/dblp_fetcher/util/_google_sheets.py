@@ -1,12 +1,15 @@
+import logging
 import os
 import pickle
-from typing import Any
+from typing import Any, Optional
 
 from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
 
 SCOPE_READONLY = 'https://www.googleapis.com/auth/spreadsheets.readonly'
+SCOPE_METADATA_READONLY = 'https://www.googleapis.com/auth/drive.metadata.readonly'
 
 
 def fetch_data_from_google_sheets(
@@ -22,6 +25,21 @@ def fetch_data_from_google_sheets(
     return result.get('values', [])
 
 
+def fetch_spreadsheet_revision(spreadsheet_id: str, credentials: any) -> Optional[str]:
+    """
+    Returns the time the spreadsheet was last modified according to Google Drive, which changes with every edit, or
+    None if it cannot be read, e.g. because the credentials lack the scope SCOPE_METADATA_READONLY.
+    """
+
+    service = build('drive', 'v3', credentials=credentials)
+    try:
+        result = service.files().get(fileId=spreadsheet_id, fields='modifiedTime').execute()
+    except HttpError as error:
+        logging.warning(f"Could not read the revision of spreadsheet {spreadsheet_id}: {error}")
+        return None
+    return result.get('modifiedTime')
+
+
 def fetch_google_credentials(
         credentials_path: str,
         token_path: str,
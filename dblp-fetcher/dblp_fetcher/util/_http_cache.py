@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from ._files import atomic_write
+
+
+@dataclass
+class CachedResponse:
+    """
+    Parameters
+    ----------
+    url:
+        The URL of the request.
+    body:
+        The body of the response.
+    etag:
+        The ETag header of the response. Set to None if the server did not send one.
+    last_modified:
+        The Last-Modified header of the response. Set to None if the server did not send one.
+    stored_at:
+        When the response was last stored or revalidated, as seconds since the epoch.
+    """
+
+    url: str
+    body: bytes
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    stored_at: float = 0
+
+    def conditional_headers(self) -> dict[str, str]:
+        """
+        Returns the headers that ask the server to only send the body if it changed since this response was stored.
+        """
+
+        headers = {}
+        if self.etag is not None:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified is not None:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class HttpCache:
+    """
+    An on-disk cache for HTTP responses, keyed by URL. Each response is stored as a body file and a JSON metadata file.
+
+    Parameters
+    ----------
+    directory:
+        The directory the responses are stored in. It is created if it does not exist.
+    ttl:
+        Responses that have not been stored or revalidated for this many seconds are considered expired and are removed
+        by evict. Until then, they can still be revalidated. Set to None to keep responses forever.
+    max_size:
+        The maximum total size of all stored responses in bytes. If it is exceeded, the least recently used responses
+        are evicted. Set to None to disable the limit.
+    """
+
+    def __init__(self, directory: str, ttl: Optional[float] = None, max_size: Optional[int] = None):
+        self._directory: str = directory
+        self._ttl: Optional[float] = ttl
+        self._max_size: Optional[int] = max_size
+
+        os.makedirs(directory, exist_ok=True)
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        """
+        Returns the stored response for the given URL, or None if there is none. Expired responses are returned as
+        well until evict removes them, so they can still be revalidated.
+        """
+
+        metadata_path, body_path = self._paths(url)
+
+        try:
+            with open(metadata_path, "r", encoding="UTF-8") as metadata_file:
+                metadata = json.load(metadata_file)
+            with open(body_path, "rb") as body_file:
+                body = body_file.read()
+        except (OSError, ValueError):
+            return None
+
+        # The modification time of the body file tracks when the response was last used.
+        os.utime(body_path)
+
+        return CachedResponse(
+            url=url,
+            body=body,
+            etag=metadata.get("etag"),
+            last_modified=metadata.get("last_modified"),
+            stored_at=metadata.get("stored_at", 0)
+        )
+
+    def put(self, url: str, body: bytes, etag: Optional[str] = None, last_modified: Optional[str] = None) -> None:
+        """
+        Stores the response for the given URL, replacing any previously stored response.
+        """
+
+        metadata_path, body_path = self._paths(url)
+
+        with atomic_write(body_path, "wb") as body_file:
+            body_file.write(body)
+        self._write_metadata(metadata_path, url, etag, last_modified)
+
+    def revalidate(self, response: CachedResponse) -> None:
+        """
+        Marks the given stored response as fresh again, e.g. because the server answered with 304 Not Modified.
+        """
+
+        metadata_path, _ = self._paths(response.url)
+        self._write_metadata(metadata_path, response.url, response.etag, response.last_modified)
+
+    def evict(self) -> None:
+        """
+        Removes all expired responses and then the least recently used responses until the total size is at most
+        max_size.
+        """
+
+        entries = []
+        for name in os.listdir(self._directory):
+            if not name.endswith(".json"):
+                continue
+
+            key = name[:-len(".json")]
+            metadata_path = os.path.join(self._directory, name)
+            body_path = os.path.join(self._directory, f"{key}.body")
+
+            try:
+                with open(metadata_path, "r", encoding="UTF-8") as metadata_file:
+                    stored_at = json.load(metadata_file).get("stored_at", 0)
+                body_stat = os.stat(body_path)
+            except (OSError, ValueError):
+                _remove_files(metadata_path, body_path)
+                continue
+
+            if self._ttl is not None and time.time() - stored_at > self._ttl:
+                _remove_files(metadata_path, body_path)
+            else:
+                size = body_stat.st_size + os.path.getsize(metadata_path)
+                entries.append((body_stat.st_mtime, size, metadata_path, body_path))
+
+        if self._max_size is None:
+            return
+
+        total_size = sum(size for _, size, _, _ in entries)
+        for _, size, metadata_path, body_path in sorted(entries):
+            if total_size <= self._max_size:
+                break
+
+            _remove_files(metadata_path, body_path)
+            total_size -= size
+
+    def _paths(self, url: str) -> tuple[str, str]:
+        """
+        Returns the paths of the metadata file and the body file for the given URL.
+        """
+
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return os.path.join(self._directory, f"{key}.json"), os.path.join(self._directory, f"{key}.body")
+
+    @staticmethod
+    def _write_metadata(path: str, url: str, etag: Optional[str], last_modified: Optional[str]) -> None:
+        metadata = {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "stored_at": time.time()
+        }
+        with atomic_write(path, encoding="UTF-8") as metadata_file:
+            json.dump(metadata, metadata_file)
+
+
+def _remove_files(*paths: str) -> None:
+    for path in paths:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,104 @@
+import itertools
+import re
+import unicodedata
+from typing import Optional
+
+from bibtexparser import latexenc
+from bibtexparser.latexenc import latex_to_unicode
+
+_NON_ALPHANUMERIC = re.compile(r"[^a-z\d]")
+_ALPHANUMERIC = re.compile(r"[A-Za-z\d]")
+
+# The LaTeX forms DBLP and homogenize_latex_encoding emit: accents with a letter or dotless i/j as argument, e.g. \"u,
+# \"{u}, \c c, or \'\i, empty accents like \^{}, named commands like \ss or \textquotesingle, and escaped characters.
+_LATEX_TOKEN = re.compile(
+    r"""
+    \\[`'^"~=.]\s*(?:\{(?:\\[ij](?![A-Za-z])|[A-Za-z])\}|\\[ij](?![A-Za-z])|[A-Za-z]|\{\})
+    | \\[uvHckrdbt](?:\s*\{(?:\\[ij](?![A-Za-z])|[A-Za-z])\}|\s+(?:\\[ij](?![A-Za-z])|[A-Za-z]))
+    | \\[A-Za-z]+
+    | \\[&%_#$]
+    """,
+    re.VERBOSE
+)
+
+# The replacements of latex_to_unicode that do not start with a backslash, in the order it applies them. They are also
+# applied to titles without LaTeX commands, as long as the title contains a brace.
+_PLAIN_REPLACEMENTS: list[tuple[str, str]] = [
+    (latex.rstrip(), character)
+    for character, latex in itertools.chain(latexenc.unicode_to_crappy_latex1, latexenc.unicode_to_latex)
+    if "\\" not in latex
+]
+
+# Translations of the tokens that were seen so far. None marks tokens that latex_to_unicode does not translate into
+# plain characters, e.g. because it depends on the following text.
+_token_translations: dict[str, Optional[str]] = {}
+
+
+def normalize_latex_title(title: str) -> str:
+    """
+    Returns the lowercase letters and digits of the title after its LaTeX markup was converted to Unicode. The result is
+    the same as that of removing everything but letters and digits from latex_to_unicode(title).lower(), but common
+    titles are handled without latex_to_unicode: Pure ASCII titles without LaTeX markup are only lowercased and
+    filtered. The LaTeX commands DBLP emits are translated with a table, and only other commands fall back to
+    latex_to_unicode.
+    """
+
+    if "\\" in title:
+        translated = _translate_tokens(title)
+        if translated is None or "\\" in translated or any(latex in translated for latex, _ in _PLAIN_REPLACEMENTS):
+            return _NON_ALPHANUMERIC.sub("", latex_to_unicode(title).lower())
+        title = translated
+    elif "{" in title:
+        for latex, character in _PLAIN_REPLACEMENTS:
+            if latex in title:
+                title = title.replace(latex, character)
+
+    # Braces are dropped with all other punctuation, but they must be gone before combining characters are composed.
+    if not title.isascii():
+        title = unicodedata.normalize("NFC", title.replace("{", "").replace("}", ""))
+
+    return _NON_ALPHANUMERIC.sub("", title.lower())
+
+
+def _translate_tokens(title: str) -> Optional[str]:
+    """
+    Returns the title with all LaTeX tokens translated, or None if a token has no translation or if two tokens are
+    only separated by punctuation. latex_to_unicode has replacements for some sequences of commands, e.g.
+    \\cyrchar\\CYRA, which must not be translated token by token.
+    """
+
+    parts = []
+    end = None
+    for match in _LATEX_TOKEN.finditer(title):
+        if end is not None and _ALPHANUMERIC.search(title, end, match.start()) is None:
+            return None
+
+        token = match.group(0)
+        translation = _token_translations.get(token)
+        if translation is None and token not in _token_translations:
+            translation = _compute_translation(token)
+            _token_translations[token] = translation
+        if translation is None:
+            return None
+
+        parts.append(title[end or 0:match.start()])
+        parts.append(translation)
+        end = match.end()
+
+    parts.append(title[end or 0:])
+    return "".join(parts)
+
+
+def _compute_translation(token: str) -> Optional[str]:
+    """
+    Translates the token with latex_to_unicode. The translation is rejected if it still contains markup or combining
+    characters, or if the token is translated differently between letters, since latex_to_unicode attaches some accents
+    to the following text.
+    """
+
+    translation = latex_to_unicode(token)
+    if any(character in "\\{}" or unicodedata.combining(character) for character in translation):
+        return None
+    if latex_to_unicode(f"a{token}b") != unicodedata.normalize("NFC", f"a{translation}b"):
+        return None
+    return translation
@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Iterator, TextIO
+
+# Prefix of all metric names in the Prometheus text format.
+_PROMETHEUS_PREFIX = "dblp_fetcher_"
+
+# A metric is identified by its name and its sorted label pairs.
+_Key = tuple[str, tuple[tuple[str, str], ...]]
+
+
+@dataclass
+class TimerStatistics:
+    """
+    Parameters
+    ----------
+    count:
+        The number of observations.
+    total:
+        The sum of all observed durations in seconds.
+    max:
+        The longest observed duration in seconds.
+    """
+
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+
+class MetricsRegistry:
+    """
+    Collects counters and timers of a run, e.g. the wall time per stage or the number of parsed entries. Metrics have a
+    name and optional labels, e.g. the stage or the author. All methods are thread-safe, so metrics can be recorded from
+    worker threads. The metrics can be exported as JSON or in the Prometheus text format.
+    """
+
+    def __init__(self):
+        self._counters: dict[_Key, float] = {}
+        self._timers: dict[_Key, TimerStatistics] = {}
+        self._lock = threading.Lock()
+
+    def increment(self, name: str, value: float = 1, **labels: str) -> None:
+        """
+        Adds the value to the counter with the given name and labels.
+        """
+
+        key = _key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name: str, seconds: float, **labels: str) -> None:
+        """
+        Records a duration in the timer with the given name and labels.
+        """
+
+        key = _key(name, labels)
+        with self._lock:
+            statistics = self._timers.setdefault(key, TimerStatistics())
+            statistics.count += 1
+            statistics.total += seconds
+            statistics.max = max(statistics.max, seconds)
+
+    @contextmanager
+    def timer(self, name: str, **labels: str) -> Iterator[None]:
+        """
+        Records the wall time of the context in the timer with the given name and labels, even if it raises.
+        """
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def counter(self, name: str, **labels: str) -> float:
+        """
+        Returns the value of the counter with the given name and labels, or 0 if it was never incremented.
+        """
+
+        with self._lock:
+            return self._counters.get(_key(name, labels), 0)
+
+    def timer_statistics(self, name: str, **labels: str) -> TimerStatistics:
+        """
+        Returns the statistics of the timer with the given name and labels. They are empty if nothing was recorded.
+        """
+
+        with self._lock:
+            statistics = self._timers.get(_key(name, labels), TimerStatistics())
+            return TimerStatistics(statistics.count, statistics.total, statistics.max)
+
+    def reset(self) -> None:
+        """
+        Removes all metrics.
+        """
+
+        with self._lock:
+            self._counters.clear()
+            self._timers.clear()
+
+    def to_json(self) -> dict:
+        """
+        Returns all metrics as a JSON-serializable dictionary with a list of counters and a list of timers.
+        """
+
+        with self._lock:
+            return {
+                "counters": [
+                    {"name": name, "labels": dict(labels), "value": value}
+                    for (name, labels), value in sorted(self._counters.items())
+                ],
+                "timers": [
+                    {
+                        "name": name,
+                        "labels": dict(labels),
+                        "count": statistics.count,
+                        "total_seconds": statistics.total,
+                        "max_seconds": statistics.max
+                    }
+                    for (name, labels), statistics in sorted(self._timers.items())
+                ],
+            }
+
+    def to_prometheus(self) -> str:
+        """
+        Returns all metrics in the Prometheus text format. Counters get the suffix "_total", and timers are exported as
+        summaries with a sum and a count in seconds.
+        """
+
+        lines = []
+        with self._lock:
+            counters = sorted(self._counters.items())
+            timers = sorted(self._timers.items())
+
+        for name, samples in _group_by_name(counters):
+            metric = f"{_PROMETHEUS_PREFIX}{name}_total"
+            lines.append(f"# TYPE {metric} counter")
+            for labels, value in samples:
+                lines.append(f"{metric}{_prometheus_labels(labels)} {_prometheus_value(value)}")
+
+        for name, samples in _group_by_name(timers):
+            metric = f"{_PROMETHEUS_PREFIX}{name}_seconds"
+            lines.append(f"# TYPE {metric} summary")
+            for labels, statistics in samples:
+                lines.append(f"{metric}_sum{_prometheus_labels(labels)} {_prometheus_value(statistics.total)}")
+                lines.append(f"{metric}_count{_prometheus_labels(labels)} {statistics.count}")
+
+        return "".join(f"{line}\n" for line in lines)
+
+    def write(self, file: TextIO, metrics_format: str = "json") -> None:
+        """
+        Writes all metrics to the file in the given format, either "json" or "prometheus".
+        """
+
+        if metrics_format == "json":
+            json.dump(self.to_json(), file, indent=2)
+            file.write("\n")
+        elif metrics_format == "prometheus":
+            file.write(self.to_prometheus())
+        else:
+            raise ValueError(f"Unknown metrics format {metrics_format}")
+
+
+# The registry that the pipeline records its metrics in.
+metrics = MetricsRegistry()
+
+
+def _key(name: str, labels: dict[str, str]) -> _Key:
+    return name, tuple(sorted((label, str(value)) for label, value in labels.items()))
+
+
+def _group_by_name(items: list[tuple[_Key, object]]) -> Iterator[tuple[str, list[tuple[tuple, object]]]]:
+    """
+    Groups the sorted metrics by their name, so each name gets a single TYPE line.
+    """
+
+    groups: dict[str, list] = {}
+    for (name, labels), value in items:
+        groups.setdefault(name, []).append((labels, value))
+    return iter(groups.items())
+
+
+def _prometheus_labels(labels: tuple[tuple[str, str], ...]) -> str:
+    if len(labels) == 0:
+        return ""
+    return "{" + ",".join(f'{label}="{_escaped_label_value(value)}"' for label, value in labels) + "}"
+
+
+def _escaped_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _prometheus_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
@@ -0,0 +1,43 @@
+import threading
+import time
+from typing import Optional
+from urllib.parse import urlparse
+
+
+class RateLimiter:
+    """
+    Limits the rate of requests per host. It can be shared between threads.
+
+    Parameters
+    ----------
+    requests_per_second:
+        The maximum number of requests per second that are sent to the same host. Set to None or a value of at most 0 to
+        disable rate limiting.
+    """
+
+    def __init__(self, requests_per_second: Optional[float] = None):
+        limited = requests_per_second is not None and requests_per_second > 0
+        self._min_interval: float = 1 / requests_per_second if limited else 0
+        self._next_slot_by_host: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url: str) -> None:
+        """
+        Blocks until a request to the host of the given URL may be sent.
+        """
+
+        if self._min_interval == 0:
+            return
+
+        host = urlparse(url).netloc
+
+        # Reserve the next free slot for this host while holding the lock, but sleep outside of it, so requests to
+        # other hosts are not blocked.
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot_by_host.get(host, now))
+            self._next_slot_by_host[host] = slot + self._min_interval
+
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
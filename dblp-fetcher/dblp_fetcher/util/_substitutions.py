@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import json
+import re
+from typing import Optional
+
+# Characters that have a special meaning at the start of a regular expression.
+_SPECIAL_CHARACTERS = set(".^$*+?{}[]|()")
+
+
+class SubstitutionEngine:
+    """
+    Replaces all matches of a list of regular expressions in a single pass. The patterns are combined into one compiled
+    alternation, and the rule that matched is looked up in a dispatch table. Values that cannot contain a match, because
+    they lack the first character of every pattern, are returned without running the regular expression at all.
+
+    Like the alternation, the engine prefers the earliest rule if several rules match at the same position. As long as
+    no replacement creates a new match of another rule, the result is the same as applying the rules one after another
+    with re.sub.
+
+    Parameters
+    ----------
+    rules:
+        Pairs of a pattern and its replacement, which may use the same escapes and group references as in re.sub.
+    """
+
+    @staticmethod
+    def from_file(path: str) -> SubstitutionEngine:
+        """
+        Reads the rules from a JSON file that contains a list of [pattern, replacement] pairs.
+        """
+
+        with open(path, "r", encoding="UTF-8") as file:
+            return SubstitutionEngine([(pattern, replacement) for pattern, replacement in json.load(file)])
+
+    def __init__(self, rules: list[tuple[str, str]]):
+        self._rules: list[tuple[re.Pattern, str]] = [
+            (re.compile(pattern), replacement)
+            for pattern, replacement in rules
+        ]
+
+        # Each rule becomes a named group, so the group that matched identifies the rule.
+        self._dispatch: dict[str, tuple[re.Pattern, str]] = {
+            f"rule{index}": rule
+            for index, rule in enumerate(self._rules)
+        }
+        combined = "|".join(f"(?P<rule{index}>{pattern})" for index, (pattern, _) in enumerate(rules))
+        self._combined: Optional[re.Pattern] = re.compile(combined) if len(rules) > 0 else None
+
+        first_characters = [_first_literal_character(pattern) for pattern, _ in rules]
+        self._trigger_characters: Optional[set[str]] = None if None in first_characters else set(first_characters)
+
+    def apply(self, value: str) -> str:
+        """
+        Returns the value with all matches replaced. If nothing matched, the given string itself is returned.
+        """
+
+        if self._combined is None:
+            return value
+        triggers = self._trigger_characters
+        if triggers is not None and not any(character in value for character in triggers):
+            return value
+
+        return self._combined.sub(self._replace, value)
+
+    def _replace(self, match: re.Match) -> str:
+        pattern, replacement = self._dispatch[match.lastgroup]
+        return pattern.fullmatch(match.group()).expand(replacement)
+
+
+def _first_literal_character(pattern: str) -> Optional[str]:
+    """
+    Returns the character every match of the pattern starts with, or None if it cannot be determined easily.
+    """
+
+    if pattern == "":
+        return None
+    if pattern[0] == "\\":
+        if len(pattern) > 1 and not pattern[1].isalnum():
+            return pattern[1]
+        return None
+    if pattern[0] in _SPECIAL_CHARACTERS:
+        return None
+    if len(pattern) > 1 and pattern[1] in "*?{":
+        return None
+    return pattern[0]
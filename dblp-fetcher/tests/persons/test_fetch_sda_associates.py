@@ -0,0 +1,114 @@
+from typing import Optional
+
+import pytest
+
+from dblp_fetcher.persons import RosterSnapshot, _fetch_sda_associates, read_sda_associates
+from dblp_fetcher.persons.model import Person
+
+
+class _FakeResolver:
+    def __init__(self, pids: dict[str, str]):
+        self.pids = pids
+        self.batches = []
+
+    def resolve(self, names: list[str]) -> dict[str, Optional[str]]:
+        self.batches.append(names)
+        return {name: self.pids.get(name) for name in names}
+
+
+@pytest.mark.parametrize("author_id,expected", [
+    ("ChristophLange2", "Christoph Lange"),
+    ("jens-lehmann", "Jens Lehmann"),
+    ("jens_lehmann", "Jens Lehmann"),
+    ("lehmann", "Lehmann"),
+])
+def test_name_from_author_id(author_id: str, expected: str):
+    assert _fetch_sda_associates._name_from_author_id(author_id) == expected
+
+
+def test_resolve_dblp_urls():
+    persons = [Person("71-4882"), Person("l-ChristophLange2"), Person("jens-lehmann"), Person("unknown")]
+    resolver = _FakeResolver({"Jens Lehmann": "71/4882"})
+
+    _fetch_sda_associates._resolve_dblp_urls(persons, resolver)
+
+    assert [person.dblp_url for person in persons] == [
+        "https://dblp.org/pid/71/4882",
+        "https://dblp.org/pid/l/ChristophLange2",
+        "https://dblp.org/pid/71/4882",
+        None,
+    ]
+    assert resolver.batches == [["Jens Lehmann", "Unknown"]]
+
+
+def test_fetch_sda_associates_uses_snapshot(tmp_path, monkeypatch):
+    requests = []
+
+    def fetch_data_from_google_sheets(spreadsheet_id, range_name, credentials):
+        requests.append(range_name)
+        return [["https://dblp.org/pid/71/4882", "2016", "", "lehmann"]]
+
+    monkeypatch.setattr(_fetch_sda_associates, "fetch_google_credentials", lambda **_: None)
+    monkeypatch.setattr(_fetch_sda_associates, "fetch_spreadsheet_revision", lambda **_: None)
+    monkeypatch.setattr(_fetch_sda_associates, "fetch_data_from_google_sheets", fetch_data_from_google_sheets)
+    snapshot = RosterSnapshot(str(tmp_path / "roster.json"))
+
+    first = _fetch_sda_associates.fetch_sda_associates("sheet", "Data!B2:E", "", "", snapshot=snapshot, max_age=60)
+    second = _fetch_sda_associates.fetch_sda_associates("sheet", "Data!B2:E", "", "", snapshot=snapshot, max_age=60)
+    offline = _fetch_sda_associates.fetch_sda_associates("sheet", "Data!B2:E", "", "", snapshot=snapshot, offline=True)
+
+    assert requests == ["Data!B2:E"]
+    assert first == second == offline == [Person("lehmann", "https://dblp.org/pid/71/4882", 2016)]
+
+
+def test_fetch_sda_associates_reads_spreadsheet_if_revision_changed(tmp_path, monkeypatch):
+    requests = []
+    revisions = ["2020-01-01T00:00:00.000Z", "2020-01-01T00:00:00.000Z", "2020-02-01T00:00:00.000Z", None]
+
+    def fetch_data_from_google_sheets(spreadsheet_id, range_name, credentials):
+        requests.append(range_name)
+        return [["https://dblp.org/pid/71/4882", "2016", "", f"lehmann{len(requests)}"]]
+
+    monkeypatch.setattr(_fetch_sda_associates, "fetch_google_credentials", lambda **_: None)
+    monkeypatch.setattr(_fetch_sda_associates, "fetch_spreadsheet_revision", lambda **_: revisions.pop(0))
+    monkeypatch.setattr(_fetch_sda_associates, "fetch_data_from_google_sheets", fetch_data_from_google_sheets)
+    snapshot = RosterSnapshot(str(tmp_path / "roster.json"))
+
+    author_ids = [
+        _fetch_sda_associates.fetch_sda_associates("sheet", "Data!B2:E", "", "", snapshot=snapshot)[0].author_id
+        for _ in range(4)
+    ]
+
+    # Without a revision, the spreadsheet is always read.
+    assert author_ids == ["lehmann1", "lehmann1", "lehmann2", "lehmann3"]
+    assert len(requests) == 3
+
+
+def test_fetch_sda_associates_warns_about_token_without_drive_scope(tmp_path, monkeypatch, caplog):
+    class _Credentials:
+        scopes = ["https://www.googleapis.com/auth/spreadsheets.readonly"]
+
+    def fetch_spreadsheet_revision(**_):
+        raise AssertionError("The revision must not be requested without the scope.")
+
+    monkeypatch.setattr(_fetch_sda_associates, "fetch_google_credentials", lambda **_: _Credentials())
+    monkeypatch.setattr(_fetch_sda_associates, "fetch_spreadsheet_revision", fetch_spreadsheet_revision)
+    monkeypatch.setattr(
+        _fetch_sda_associates,
+        "fetch_data_from_google_sheets",
+        lambda **_: [["https://dblp.org/pid/71/4882", "2016", "", "lehmann"]]
+    )
+    snapshot = RosterSnapshot(str(tmp_path / "roster.json"))
+
+    _fetch_sda_associates.fetch_sda_associates("sheet", "Data!B2:E", "", "token.pickle", snapshot=snapshot)
+
+    assert "Delete token.pickle to log in again." in caplog.text
+
+
+def test_read_sda_associates(tmp_path):
+    path = tmp_path / "roster.csv"
+    path.write_text(",2019,2021,jens-lehmann\n", encoding="UTF-8")
+
+    assert read_sda_associates(str(path), resolver=_FakeResolver({"Jens Lehmann": "71/4882"})) == [
+        Person("jens-lehmann", "https://dblp.org/pid/71/4882", 2019, 2021)
+    ]
@@ -0,0 +1,65 @@
+import json
+
+import pytest
+
+from dblp_fetcher.persons import RosterSnapshot, read_roster_file
+
+_ROWS = [
+    ["https://dblp.org/pid/71/4882", "2016", "", "lehmann"],
+    ["", "2019", "2021", "ChristophLange2"],
+]
+
+
+def test_roster_snapshot(tmp_path):
+    snapshot = RosterSnapshot(str(tmp_path / "cache" / "roster.json"))
+    assert snapshot.load("sheet", "Data!B2:E") is None
+
+    assert snapshot.store("sheet", "Data!B2:E", _ROWS)
+    assert not snapshot.store("sheet", "Data!B2:E", _ROWS)
+
+    assert snapshot.load("sheet", "Data!B2:E") == _ROWS
+    assert snapshot.load("sheet", "Data!B2:E", max_age=60) == _ROWS
+    assert snapshot.load("sheet", "Data!B2:E", max_age=-1) is None
+    assert snapshot.load("other", "Data!B2:E") is None
+    assert snapshot.load("sheet", "Data!A1:D") is None
+
+
+def test_roster_snapshot_with_revision(tmp_path):
+    snapshot = RosterSnapshot(str(tmp_path / "roster.json"))
+    snapshot.store("sheet", "Data!B2:E", _ROWS, revision="2020-01-01T00:00:00.000Z")
+
+    assert snapshot.load("sheet", "Data!B2:E", revision="2020-01-01T00:00:00.000Z") == _ROWS
+    assert snapshot.load("sheet", "Data!B2:E", revision="2020-02-01T00:00:00.000Z") is None
+    assert snapshot.load("sheet", "Data!B2:E", max_age=-1, revision="2020-01-01T00:00:00.000Z") is None
+
+
+def test_roster_snapshot_ignores_corrupt_file(tmp_path):
+    path = tmp_path / "roster.json"
+    path.write_text("{", encoding="UTF-8")
+
+    assert RosterSnapshot(str(path)).load("sheet", "Data!B2:E") is None
+
+
+@pytest.mark.parametrize("file_name,content", [
+    ("roster.csv", "https://dblp.org/pid/71/4882,2016,,lehmann\n,2019,2021,ChristophLange2\n"),
+    ("roster.csv", "dblp_url,start_year,end_year,author_id\n"
+                   "https://dblp.org/pid/71/4882,2016,,lehmann\n\n,2019,2021,ChristophLange2\n"),
+    ("roster.json", json.dumps(_ROWS)),
+    ("roster.json", json.dumps([
+        {"dblp_url": "https://dblp.org/pid/71/4882", "start_year": 2016, "author_id": "lehmann"},
+        {"start_year": 2019, "end_year": 2021, "author_id": "ChristophLange2"},
+    ])),
+])
+def test_read_roster_file(tmp_path, file_name: str, content: str):
+    path = tmp_path / file_name
+    path.write_text(content, encoding="UTF-8")
+
+    assert read_roster_file(str(path)) == _ROWS
+
+
+def test_read_roster_file_with_missing_columns(tmp_path):
+    path = tmp_path / "roster.csv"
+    path.write_text("https://dblp.org/pid/71/4882,2016\n", encoding="UTF-8")
+
+    with pytest.raises(ValueError):
+        read_roster_file(str(path))
@@ -0,0 +1,46 @@
+from _pytest.fixtures import fixture
+
+from dblp_fetcher.postprocessing import PostprocessingPipeline, filter_stage, transform_stage
+from dblp_fetcher.publications.model import Bibliography, Publication
+
+
+@fixture
+def pipeline() -> PostprocessingPipeline:
+    return PostprocessingPipeline([
+        filter_stage(lambda publication: publication.year is not None),
+        transform_stage(lambda publication: publication.add_keyword("processed")),
+    ])
+
+
+@fixture
+def publications() -> list[Publication]:
+    return [
+        Publication({"title": "Title 1", "year": "2020"}),
+        Publication({"title": "Title 2"}),
+        Publication({"title": "Title 3", "year": "2021"}),
+    ]
+
+
+def test_process_keeps_publication(pipeline: PostprocessingPipeline, publications: list[Publication]):
+    assert pipeline.process(publications[0]).keywords == {"processed"}
+
+
+def test_process_drops_publication(pipeline: PostprocessingPipeline, publications: list[Publication]):
+    assert pipeline.process(publications[1]) is None
+
+
+def test_run(pipeline: PostprocessingPipeline, publications: list[Publication]):
+    bibliography = Bibliography(publications)
+
+    pipeline.run(bibliography)
+
+    assert [publication.id for publication in bibliography.publications] == ["title1", "title3"]
+    assert all(publication.keywords == {"processed"} for publication in bibliography.publications)
+
+
+def test_stream_is_lazy(pipeline: PostprocessingPipeline, publications: list[Publication]):
+    processed = pipeline.stream(iter(publications))
+
+    assert next(processed).id == "title1"
+    assert "processed" not in publications[2].keywords
+    assert next(processed).id == "title3"
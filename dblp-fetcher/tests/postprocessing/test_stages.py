@@ -0,0 +1,35 @@
+import pytest
+
+from dblp_fetcher.postprocessing import remove_property, remove_unwanted_publications, run_substitutions
+from dblp_fetcher.publications.model import Publication, TitleBlacklist
+from dblp_fetcher.util import SubstitutionEngine
+
+
+@pytest.mark.parametrize(
+    "bibtex_dict,expected", [
+        ({"author": "John Doe", "title": "Title"}, True),
+        ({"title": "Title"}, False),
+        ({"author": "John Doe"}, False),
+        ({"author": "John Doe", "title": "Blacklisted title"}, False),
+        ({"author": "John Doe", "title": "Title", "journal": "CoRR"}, False),
+    ]
+)
+def test_remove_unwanted_publications(bibtex_dict: dict[str, str], expected: bool):
+    stage = remove_unwanted_publications(TitleBlacklist(["Blacklisted title"]))
+
+    assert (stage(Publication(bibtex_dict)) is not None) == expected
+
+
+def test_remove_property():
+    publication = Publication({"title": "Title", "editor": "Jane Doe"})
+
+    assert remove_property("editor")(publication).get_property("editor") is None
+
+
+def test_run_substitutions():
+    publication = Publication({"title": "A\\ast B", "keywords": "k"})
+
+    run_substitutions(SubstitutionEngine([("\\\\ast\\s*", "* ")]))(publication)
+
+    assert publication.title == "A* B"
+    assert publication.keywords == {"k"}
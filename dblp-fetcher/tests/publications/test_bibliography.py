@@ -1,4 +1,10 @@
+import io
+from pathlib import Path
+
+import pytest
 from _pytest.fixtures import fixture
+from bibtexparser.bibdatabase import BibDatabase
+from bibtexparser.bwriter import BibTexWriter
 
 from dblp_fetcher.publications.model import Bibliography, Publication
 
@@ -126,3 +132,169 @@ def test_to_bibtex(bibliography: Bibliography):
   year      = {2021}
 }
 """
+
+
+def test_from_bibtex_with_bibtexparser_engine(bibtex_string: str):
+    bibliography = Bibliography.from_bibtex(bibtex_string, engine="bibtexparser")
+
+    assert bibliography.to_bibtex() == Bibliography.from_bibtex(bibtex_string).to_bibtex()
+
+
+def test_from_bibtex_file(bibtex_string: str):
+    bibliography = Bibliography.from_bibtex_file(io.BytesIO(bibtex_string.encode("utf-8")))
+
+    assert bibliography.to_bibtex() == Bibliography.from_bibtex(bibtex_string).to_bibtex()
+
+
+def test_to_bibtex_with_empty_bibliography():
+    assert Bibliography().to_bibtex() == ""
+
+
+def test_to_bibtex_matches_bibtex_writer():
+    bibliography = Bibliography.from_bibtex("""
+    @article{b, title = {Second}, author = {John Doe}, year = {2020}}
+    @inproceedings{A, title = {First}, booktitle = {Proceedings}, keywords = {k}}
+    @misc{c, title = {Third}}
+    """)
+
+    database = BibDatabase()
+    database.entries = [publication.bibtex_dict for publication in bibliography.publications]
+    writer = BibTexWriter()
+    writer.align_values = True
+    writer.indent = "  "
+
+    assert bibliography.to_bibtex() == writer.write(database)
+
+
+def test_write_bibtex(bibliography: Bibliography):
+    output = io.StringIO()
+
+    bibliography.write_bibtex(output)
+
+    assert output.getvalue() == bibliography.to_bibtex()
+
+
+def test_map_publications(bibliography: Bibliography):
+    bibliography.upsert_publication(Publication({"title": "Title 2"}))
+
+    bibliography.map_publications(lambda publication: publication if publication.author is not None else None)
+
+    assert [publication.id for publication in bibliography.publications] == ["title"]
+
+
+@fixture
+def query_bibliography() -> Bibliography:
+    return Bibliography.from_bibtex("""
+    @article{id1, title = {Title 1}, author = {John Doe and Jane Roe}, year = {2019}, keywords = {sda-pub, doe}}
+    @article{id2, title = {Title 2}, author = {Jane
+        Roe}, year = {2021}, keywords = {sda-pub, roe}}
+    @article{id3, title = {Title 3}, author = {Max Mustermann}, year = {2022}, keywords = {mustermann}}
+    @article{id4, title = {Title 4}, author = {Max Mustermann}}
+    """)
+
+
+def _find_ids(bibliography: Bibliography, **criteria) -> list[str]:
+    return [publication.id for publication in bibliography.find(**criteria)]
+
+
+@pytest.mark.parametrize(
+    "criteria,expected", [
+        ({}, ["title1", "title2", "title3", "title4"]),
+        ({"keyword": "sda-pub"}, ["title1", "title2"]),
+        ({"keyword": "unknown"}, []),
+        ({"author": "Jane Roe"}, ["title1", "title2"]),
+        ({"author": "Max  Mustermann"}, ["title3", "title4"]),
+        ({"min_year": 2020}, ["title2", "title3"]),
+        ({"max_year": 2021}, ["title1", "title2"]),
+        ({"keyword": "sda-pub", "min_year": 2020, "max_year": 2021}, ["title2"]),
+        ({"author": "Max Mustermann", "min_year": 2000}, ["title3"]),
+        ({"keyword": "sda-pub", "author": "John Doe"}, ["title1"]),
+    ]
+)
+def test_find(criteria: dict, expected: list[str], query_bibliography: Bibliography):
+    assert _find_ids(query_bibliography, **criteria) == expected
+
+
+def test_find_after_changes(query_bibliography: Bibliography):
+    _find_ids(query_bibliography)
+
+    query_bibliography.update(Bibliography.from_bibtex("""
+    @article{id3, title = {Title 3}, year = {2020}, keywords = {sda-pub}}
+    @article{id5, title = {Title 5}, author = {Jane Roe}, year = {2020}, keywords = {sda-pub}}
+    """))
+    query_bibliography.remove_publication_by_id("title1")
+
+    assert _find_ids(query_bibliography, keyword="sda-pub") == ["title2", "title3", "title5"]
+    assert _find_ids(query_bibliography, min_year=2020, max_year=2020) == ["title3", "title5"]
+    assert _find_ids(query_bibliography, min_year=2022) == []
+    assert _find_ids(query_bibliography, author="Jane Roe") == ["title2", "title5"]
+
+    query_bibliography.map_publications(lambda publication: publication.add_keyword("mapped"))
+    assert _find_ids(query_bibliography, keyword="mapped") == ["title2", "title3", "title4", "title5"]
+
+
+def test_reindex(query_bibliography: Bibliography):
+    _find_ids(query_bibliography)
+    query_bibliography.get_publication_by_id("title4").add_keyword("sda-pub")
+
+    assert _find_ids(query_bibliography, keyword="sda-pub") == ["title1", "title2"]
+    assert _find_ids(query_bibliography.reindex(), keyword="sda-pub") == ["title1", "title2", "title4"]
+
+
+def test_snapshot(query_bibliography: Bibliography):
+    snapshot = io.BytesIO()
+    query_bibliography.write_snapshot(snapshot, b"d" * 32)
+    snapshot.seek(0)
+
+    loaded_bibliography = Bibliography.from_snapshot(snapshot, b"d" * 32)
+
+    assert loaded_bibliography.to_bibtex() == query_bibliography.to_bibtex()
+    assert [publication.id for publication in loaded_bibliography.publications] == \
+           [publication.id for publication in query_bibliography.publications]
+    assert loaded_bibliography.get_publication_by_id("title1").year == 2019
+    assert _find_ids(loaded_bibliography, keyword="sda-pub") == ["title1", "title2"]
+
+
+def test_snapshot_of_other_source(query_bibliography: Bibliography):
+    snapshot = io.BytesIO()
+    query_bibliography.write_snapshot(snapshot, b"d" * 32)
+    snapshot.seek(0)
+
+    assert Bibliography.from_snapshot(snapshot, b"e" * 32) is None
+
+
+@pytest.mark.parametrize(
+    "corrupt", [
+        lambda snapshot: b"X" + snapshot[1:],
+        lambda snapshot: snapshot[:20],
+        lambda snapshot: snapshot[:-10],
+        lambda snapshot: b"",
+    ]
+)
+def test_corrupt_snapshot(corrupt, query_bibliography: Bibliography):
+    snapshot = io.BytesIO()
+    query_bibliography.write_snapshot(snapshot, b"d" * 32)
+
+    assert Bibliography.from_snapshot(io.BytesIO(corrupt(snapshot.getvalue())), b"d" * 32) is None
+
+
+def test_copy_is_independent(bibliography: Bibliography):
+    copy = bibliography.copy()
+    bibliography.get_publication_by_id("title").set_property("year", "2022")
+    bibliography.upsert_publication(Publication({"title": "Other"}))
+
+    assert len(copy.publications) == 1
+    assert copy.get_publication_by_id("title").year == 2021
+
+
+
+def test_update_with_identical_bibliography_changes_nothing():
+    with open(Path(__file__).parents[2] / "data" / "sda.bib", "rb") as bib:
+        bibliography = Bibliography.from_bibtex_file(bib)
+    content_hashes = [publication.content_hash for publication in bibliography.publications]
+    incoming = Bibliography([Publication(publication.bibtex_dict) for publication in bibliography.publications])
+
+    bibliography.update(incoming)
+
+    # Updates that change nothing keep the cached hashes, which are only cleared on an actual change.
+    assert [publication._content_hash for publication in bibliography.publications] == content_hashes
@@ -0,0 +1,50 @@
+import io
+
+import pytest
+
+from dblp_fetcher.publications.model import iter_bibtex_entries
+from dblp_fetcher.publications.model import _bibtex_parser
+from dblp_fetcher.publications.model._publications import _create_bibtex_parser
+
+
+@pytest.mark.parametrize(
+    "bibtex_string", [
+        "@article{id, title = {Title}}",
+        "@article{id, title = {Title},}",
+        "@ARTICLE(id, TITLE = {Title})",
+        "@article{id, title = \"A {\"}quoted{\"} title\", year = 2020}",
+        "@article{id, title = {Nested {B}races {\\\"u}ber}, pages = {1--2}}",
+        "@article{id, title = {Multi\n      line\n  title}}",
+        "@article{id, month = jan # { 1st}}",
+        "@string{venue = {Conference}}\n@inproceedings{id, booktitle = venue # \" 2020\", title = {T}}",
+        "@article{id, keywords = {a, b}, link = {https://example.org}, editors = {E}}",
+        "@article{id, title = {First}, title = {Second}, Title = {Third}}",
+        "@article{id, title = {}, note = {{}}}",
+        "@article{id, author = {J{\\\"o}rg M{\\\"u}ller and Ren{\\'e} Doe}, title = {{\\\"U}ber {\\$}}}",
+        "comment\n@comment{ignored}\n@preamble{\"\\newcommand{\\x}{x}\"}\n@misc{id, title = {T}}",
+        "@article{broken title = {T}}\n@article{id, title = {T}}",
+        "\ufeff@article{id, title = {T}}\n\n@book{id2, title = {U}}",
+    ]
+)
+def test_iter_bibtex_entries_matches_bibtexparser(bibtex_string: str):
+    expected = _create_bibtex_parser().parse(bibtex_string, partial=True).entries
+
+    assert list(iter_bibtex_entries(bibtex_string)) == expected
+
+
+def test_iter_bibtex_entries_from_binary_file_in_small_chunks(monkeypatch):
+    bibtex_string = "".join(
+        f"@article{{id{index}, title = {{T{index} \"{{\\\"o}}\"}}, month = feb, year = {2000 + index}}}\n\n"
+        for index in range(50)
+    )
+    monkeypatch.setattr(_bibtex_parser, "_CHUNK_SIZE", 7)
+
+    entries = list(iter_bibtex_entries(io.BytesIO(bibtex_string.encode("utf-8"))))
+
+    assert entries == _create_bibtex_parser().parse(bibtex_string).entries
+
+
+def test_iter_bibtex_entries_is_lazy():
+    entries = iter_bibtex_entries(io.StringIO("@article{id1, title = {T}}\n@article{id2, title = {U}}"))
+
+    assert next(entries)["ID"] == "id1"
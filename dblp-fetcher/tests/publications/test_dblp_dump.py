@@ -0,0 +1,140 @@
+import gzip
+
+import pytest
+from _pytest.fixtures import fixture
+
+from dblp_fetcher.persons.model import Person
+from dblp_fetcher.publications import read_bibliographies_from_dump, read_person_names_from_dump
+from dblp_fetcher.publications.model import Bibliography
+
+_DUMP = """<?xml version="1.0" encoding="ISO-8859-1"?>
+<!DOCTYPE dblp SYSTEM "dblp.dtd">
+<dblp>
+<inproceedings key="conf/esws/DoeR20" mdate="2020-05-28">
+<author>John Doe 0002</author>
+<author>Jane R&ouml;e</author>
+<title>Linked Data &amp; <i>Quality</i>.</title>
+<pages>61-76</pages>
+<year>2020</year>
+<booktitle>ESWC</booktitle>
+<ee>https://doi.org/10.1007/978-3-319-12024-9_8</ee>
+<crossref>conf/esws/2020</crossref>
+</inproceedings>
+<article key="journals/corr/abs-2101-00001" mdate="2021-01-05" publtype="informal">
+<author>John Doe 0002</author>
+<title>A Preprint.</title>
+<journal>CoRR</journal>
+<volume>abs/2101.00001</volume>
+<year>2021</year>
+<ee type="oa">https://arxiv.org/abs/2101.00001</ee>
+</article>
+<article key="journals/other/X21" mdate="2021-01-05">
+<author>Someone Else</author>
+<title>Unrelated.</title>
+<year>2021</year>
+</article>
+<proceedings key="conf/esws/2020" mdate="2020-05-28">
+<editor>Max Mustermann</editor>
+<title>The Semantic Web - 17th International Conference, ESWC 2020</title>
+<publisher>Springer</publisher>
+<series href="db/series/lncs/index.html">Lecture Notes in Computer Science</series>
+<volume>12123</volume>
+<year>2020</year>
+</proceedings>
+<www key="homepages/272/2782" mdate="2020-01-01">
+<author>John Doe 0002</author>
+<author>Johnny Doe</author>
+<title>Home Page</title>
+</www>
+</dblp>
+"""
+
+
+@fixture
+def person() -> Person:
+    return Person(author_id="272-2782", dblp_url="https://dblp.org/pid/272/2782", start_year=2021)
+
+
+@fixture(params=["dblp.xml", "dblp.xml.gz"])
+def dump_path(request, tmp_path) -> str:
+    path = tmp_path / request.param
+    content = _DUMP.encode("ISO-8859-1")
+    path.write_bytes(gzip.compress(content) if request.param.endswith(".gz") else content)
+    return str(path)
+
+
+def test_read_person_names_from_dump(dump_path: str):
+    assert read_person_names_from_dump(dump_path, ["272/2782", "1/1"]) == {"272/2782": ["John Doe 0002", "Johnny Doe"]}
+
+
+def test_read_bibliographies_from_dump_matches_dblp_export(dump_path: str, person: Person):
+    # The bibtex DBLP exports for the same records.
+    expected = Bibliography.from_bibtex(r"""
+    @inproceedings{DBLP:conf/esws/DoeR20,
+      author    = {John Doe and
+                   Jane R{\"{o}}e},
+      editor    = {Max Mustermann},
+      title     = {Linked Data {\&} Quality},
+      booktitle = {The Semantic Web - 17th International Conference, ESWC 2020},
+      series    = {Lecture Notes in Computer Science},
+      volume    = {12123},
+      pages     = {61--76},
+      publisher = {Springer},
+      year      = {2020},
+      url       = {https://doi.org/10.1007/978-3-319-12024-9\_8},
+      doi       = {10.1007/978-3-319-12024-9\_8},
+      biburl    = {https://dblp.org/rec/conf/esws/DoeR20.bib},
+      bibsource = {dblp computer science bibliography, https://dblp.org}
+    }
+
+    @article{DBLP:journals/corr/abs-2101-00001,
+      author     = {John Doe},
+      title      = {A Preprint},
+      journal    = {CoRR},
+      volume     = {abs/2101.00001},
+      year       = {2021},
+      url        = {https://arxiv.org/abs/2101.00001},
+      eprinttype = {arXiv},
+      eprint     = {2101.00001},
+      biburl     = {https://dblp.org/rec/journals/corr/abs-2101-00001.bib},
+      bibsource  = {dblp computer science bibliography, https://dblp.org}
+    }
+    """)
+
+    bibliographies = read_bibliographies_from_dump(dump_path, [person])
+
+    assert len(bibliographies) == 1
+    publications = bibliographies[0].publications
+    assert [publication.id for publication in publications] == [publication.id for publication in expected.publications]
+    for publication, expected_publication in zip(publications, expected.publications):
+        expected_dict = expected_publication.bibtex_dict
+        expected_dict["author"] = " ".join(expected_dict["author"].split())
+        expected_dict["keywords"] = publication.get_property("keywords")
+        assert publication.bibtex_dict == expected_dict
+
+    assert publications[0].keywords == {"272-2782"}
+    assert publications[1].keywords == {"272-2782", "sda-pub"}
+
+
+@pytest.mark.parametrize(
+    "person_names,expected_count", [
+        ({"272/2782": ["John Doe 0002"]}, 2),
+        ({"272/2782": ["Someone Else"]}, 1),
+        ({}, 0),
+    ]
+)
+def test_read_bibliographies_from_dump_with_person_names(dump_path: str, person: Person, person_names, expected_count):
+    bibliographies = read_bibliographies_from_dump(dump_path, [person], person_names)
+
+    assert len(bibliographies[0].publications) == expected_count
+
+
+def test_read_bibliographies_from_dump_keeps_order_of_authors(dump_path: str, person: Person):
+    editor = Person(author_id="mustermann", dblp_url="https://dblp.org/pid/1/1")
+    without_profile = Person(author_id="unknown")
+    person_names = {"272/2782": ["John Doe 0002"], "1/1": ["Max Mustermann"]}
+
+    bibliographies = read_bibliographies_from_dump(dump_path, [without_profile, editor, person], person_names)
+
+    assert [len(bibliography.publications) for bibliography in bibliographies] == [0, 1, 2]
+    assert bibliographies[1].publications[0].get_property("ENTRYTYPE") == "proceedings"
@@ -0,0 +1,24 @@
+from typing import Optional
+
+import pytest
+
+from dblp_fetcher.publications._dblp_persons import pid_from_dblp_url, without_name_disambiguation
+
+
+@pytest.mark.parametrize("dblp_url,expected", [
+    ("https://dblp.org/pid/272/2782", "272/2782"),
+    ("https://dblp.org/pid/272/2782.html", "272/2782"),
+    ("https://dblp.org/pid/l/ChristophLange2", "l/ChristophLange2"),
+    ("https://dblp.org/db/conf/esws/index.html", None),
+])
+def test_pid_from_dblp_url(dblp_url: str, expected: Optional[str]):
+    assert pid_from_dblp_url(dblp_url) == expected
+
+
+@pytest.mark.parametrize("name,expected", [
+    ("John Doe 0002", "John Doe"),
+    ("John Doe", "John Doe"),
+    ("Agent 007", "Agent 007"),
+])
+def test_without_name_disambiguation(name: str, expected: str):
+    assert without_name_disambiguation(name) == expected
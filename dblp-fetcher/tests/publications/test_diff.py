@@ -0,0 +1,65 @@
+import json
+
+from _pytest.fixtures import fixture
+
+from dblp_fetcher.publications.model import Bibliography, FieldChange, Publication, diff_bibliographies
+
+
+@fixture
+def known_bibliography() -> Bibliography:
+    return Bibliography([
+        Publication({"ID": "a", "ENTRYTYPE": "article", "title": "Unchanged", "year": "2020", "keywords": "sda-pub"}),
+        Publication({"ID": "b", "ENTRYTYPE": "article", "title": "Changed", "year": "2020", "note": "Note"}),
+        Publication({"ID": "c", "ENTRYTYPE": "article", "title": "Removed", "year": "2020"}),
+    ])
+
+
+@fixture
+def updated_bibliography(known_bibliography: Bibliography) -> Bibliography:
+    bibliography = known_bibliography.copy()
+    bibliography.remove_publication_by_id("removed")
+    bibliography.upsert_publication(
+        Publication({"ID": "b2", "ENTRYTYPE": "article", "title": "Changed", "year": "2021", "keywords": "author"})
+    )
+    bibliography.get_publication_by_id("changed").remove_property("note")
+    bibliography.upsert_publication(Publication({"ID": "d", "ENTRYTYPE": "inproceedings", "title": "Added"}))
+    return bibliography
+
+
+def test_diff_bibliographies(known_bibliography: Bibliography, updated_bibliography: Bibliography):
+    diff = diff_bibliographies(known_bibliography, updated_bibliography)
+
+    assert [publication.id for publication in diff.added] == ["added"]
+    assert [publication.id for publication in diff.removed] == ["removed"]
+    assert len(diff.changed) == 1
+    assert diff.changed[0].new.id == "changed"
+    assert diff.changed[0].changes == [
+        FieldChange("ID", "b", "b2"),
+        FieldChange("keywords", "", "author"),
+        FieldChange("note", "Note", None),
+        FieldChange("year", "2020", "2021"),
+    ]
+
+
+def test_diff_bibliographies_of_equal_bibliographies(known_bibliography: Bibliography):
+    diff = diff_bibliographies(known_bibliography, known_bibliography.copy())
+
+    assert diff.is_empty()
+
+
+def test_diff_to_bibliography(known_bibliography: Bibliography, updated_bibliography: Bibliography):
+    bibliography = diff_bibliographies(known_bibliography, updated_bibliography).to_bibliography()
+
+    assert [publication.bibtex_dict["ID"] for publication in bibliography.publications] == ["d", "b2"]
+
+
+def test_diff_to_json(known_bibliography: Bibliography, updated_bibliography: Bibliography):
+    data = json.loads(json.dumps(diff_bibliographies(known_bibliography, updated_bibliography).to_json()))
+
+    assert data["added"] == [
+        {"id": "added", "entry": {"ID": "d", "ENTRYTYPE": "inproceedings", "title": "Added", "keywords": ""}}
+    ]
+    assert data["changed"][0]["id"] == "changed"
+    assert data["changed"][0]["entry"]["year"] == "2021"
+    assert data["changed"][0]["changes"][0] == {"field": "ID", "old": "b", "new": "b2"}
+    assert data["removed"] == [{"id": "removed"}]
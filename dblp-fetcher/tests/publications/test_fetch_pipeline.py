@@ -0,0 +1,125 @@
+import threading
+import time
+
+import pytest
+
+from dblp_fetcher.persons.model import Person
+from dblp_fetcher.publications import fetch_and_merge_bibliographies, fetch_bibliographies
+from dblp_fetcher.publications import _fetch_publications
+from dblp_fetcher.publications.model import Bibliography, Publication
+
+
+def _authors(count: int) -> list[Person]:
+    return [
+        Person(author_id=f"author-{index}", dblp_url=f"https://dblp.org/pid/{index}", start_year=2019)
+        for index in range(count)
+    ]
+
+
+def _known_bibliography() -> Bibliography:
+    return Bibliography([Publication({"ID": "known", "ENTRYTYPE": "article", "title": "Known", "year": "2020"})])
+
+
+def _bibtex(index: int) -> str:
+    # All authors share one publication, whose venue is that of the author who is merged last.
+    return (
+        f"@article{{id{index}, title = {{Title {index}}}, year = {{2020}}}}\n"
+        f"@article{{shared{index}, title = {{Shared}}, journal = {{Journal {index}}}, year = {{2020}}}}"
+    )
+
+
+def test_fetch_and_merge_bibliographies_merges_in_order_of_authors(monkeypatch):
+    authors = _authors(5)
+
+    def fetch_bibtex(dblp_url, *_):
+        # Later authors respond faster, so downloads finish in reverse order.
+        index = int(dblp_url.rsplit("/", 1)[1])
+        time.sleep(0.01 * (5 - index))
+        return _bibtex(index)
+
+    monkeypatch.setattr(_fetch_publications, "_fetch_bibtex_from_dblp", fetch_bibtex)
+
+    bibliography = fetch_and_merge_bibliographies(authors, _known_bibliography, max_workers=5)
+
+    expected = _known_bibliography()
+    for associate_bibliography in fetch_bibliographies(authors, max_workers=5):
+        expected.update(associate_bibliography)
+    assert bibliography.to_bibtex() == expected.to_bibtex()
+    assert [publication.title for publication in bibliography.publications][:6] == [
+        "Known", "{T}itle 0", "{S}hared", "{T}itle 1", "{T}itle 2", "{T}itle 3"
+    ]
+    assert bibliography.publications[2].bibtex_dict["journal"] == "Journal 4"
+
+
+def test_fetch_and_merge_bibliographies_only_reads_known_bibliography_if_needed(monkeypatch):
+    monkeypatch.setattr(_fetch_publications, "_fetch_bibtex_from_dblp", lambda *_: "")
+    reads = []
+
+    def read_known_bibliography():
+        reads.append(threading.current_thread())
+        return _known_bibliography()
+
+    assert fetch_and_merge_bibliographies(_authors(3), read_known_bibliography) is None
+    assert reads == []
+
+    monkeypatch.setattr(_fetch_publications, "_fetch_bibtex_from_dblp", lambda dblp_url, *_: _bibtex(0))
+
+    bibliography = fetch_and_merge_bibliographies(_authors(3), read_known_bibliography)
+
+    assert len(bibliography.publications) == 3
+    # The known bibliography is read in the parsing thread, so the event loop is not blocked meanwhile.
+    assert len(reads) == 1
+    assert reads[0] is not threading.current_thread()
+
+
+def test_fetch_and_merge_bibliographies_skips_failed_and_missing_profiles(monkeypatch):
+    authors = _authors(3)
+    authors[1].dblp_url = None
+
+    def fetch_bibtex(dblp_url, *_):
+        if dblp_url.endswith("/2"):
+            return None
+        return _bibtex(0)
+
+    monkeypatch.setattr(_fetch_publications, "_fetch_bibtex_from_dblp", fetch_bibtex)
+
+    bibliography = fetch_and_merge_bibliographies(authors, _known_bibliography)
+
+    assert [publication.title for publication in bibliography.publications] == ["Known", "{T}itle 0", "{S}hared"]
+
+
+def test_fetch_and_merge_bibliographies_bounds_pending_authors(monkeypatch):
+    lock = threading.Lock()
+    started = []
+    merged = []
+
+    def fetch_bibtex(dblp_url, *_):
+        with lock:
+            started.append(dblp_url)
+            # Every author that was started but not merged yet is pending.
+            assert len(started) - len(merged) <= 2
+        return _bibtex(int(dblp_url.rsplit("/", 1)[1]))
+
+    class _RecordingBibliography(Bibliography):
+        def update(self, other):
+            with lock:
+                merged.append(other)
+            super().update(other)
+
+    monkeypatch.setattr(_fetch_publications, "_fetch_bibtex_from_dblp", fetch_bibtex)
+
+    bibliography = fetch_and_merge_bibliographies(
+        _authors(10),
+        lambda: _RecordingBibliography(_known_bibliography().publications),
+        max_workers=8,
+        max_pending=2
+    )
+
+    assert len(started) == 10
+    assert len(merged) == 10
+    assert len(bibliography.publications) == 12
+
+
+def test_fetch_and_merge_bibliographies_rejects_invalid_max_pending():
+    with pytest.raises(ValueError):
+        fetch_and_merge_bibliographies(_authors(1), _known_bibliography, max_pending=0)
@@ -1,7 +1,12 @@
+import time
+
+import requests
 from _pytest.fixtures import fixture
 
 from dblp_fetcher.persons.model import Person
-from dblp_fetcher.publications import fetch_bibliography
+from dblp_fetcher.publications import fetch_bibliographies, fetch_bibliography
+from dblp_fetcher.publications import _fetch_publications
+from dblp_fetcher.util import HttpCache, metrics
 
 
 @fixture
@@ -29,3 +34,115 @@ def test_fetch_bibliography_with_no_dblp_profile():
     bibliography = fetch_bibliography(person)
 
     assert len(bibliography.publications) == 0
+
+
+def test_fetch_bibliographies_keeps_order_of_authors(monkeypatch):
+    authors = [
+        Person(author_id=f"author-{index}", dblp_url=f"https://dblp.org/pid/{index}", start_year=2019)
+        for index in range(5)
+    ]
+
+    def fetch_bibtex(dblp_url, *_):
+        # Later authors respond faster, so downloads finish in reverse order.
+        index = int(dblp_url.rsplit("/", 1)[1])
+        time.sleep(0.01 * (5 - index))
+        return f"@article{{id{index}, title = {{Title {index}}}, year = {{2020}}}}"
+
+    monkeypatch.setattr(_fetch_publications, "_fetch_bibtex_from_dblp", fetch_bibtex)
+
+    bibliographies = fetch_bibliographies(authors, max_workers=5)
+
+    assert [bibliography.publications[0].title for bibliography in bibliographies] == [
+        f"{{T}}itle {index}" for index in range(5)
+    ]
+    for author, bibliography in zip(authors, bibliographies):
+        assert bibliography.publications[0].keywords == {author.author_id, "sda-pub"}
+
+
+class _Response:
+    def __init__(self, status_code: int, content: bytes = b"", headers: dict[str, str] = None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Error")
+
+
+class _FakeSession:
+    def __init__(self, get):
+        self.get = get
+
+
+def test_fetch_bibliography_revalidates_cached_response(person: Person, tmp_path):
+    cache = HttpCache(str(tmp_path))
+    sent_headers = []
+
+    def get(_url, headers):
+        sent_headers.append(headers)
+        if "If-None-Match" in headers:
+            return _Response(304)
+        return _Response(200, b"@article{id, title = {Title}, year = {2020}}", {"ETag": '"v1"'})
+
+    session = _FakeSession(get)
+    first = fetch_bibliography(person, session, cache)
+    second = fetch_bibliography(person, session, cache)
+
+    assert sent_headers == [{}, {"If-None-Match": '"v1"'}]
+    assert first.to_bibtex() == second.to_bibtex()
+
+
+def test_fetch_bibliography_revalidates_expired_response(person: Person, tmp_path):
+    cache = HttpCache(str(tmp_path), ttl=-1)
+    cache.put(f"{person.dblp_url}.bib", b"@article{id, title = {Title}, year = {2020}}", etag='"v1"')
+    sent_headers = []
+
+    def get(_url, headers):
+        sent_headers.append(headers)
+        return _Response(304)
+
+    assert len(fetch_bibliography(person, _FakeSession(get), cache).publications) == 1
+    assert sent_headers == [{"If-None-Match": '"v1"'}]
+
+
+def test_fetch_bibliography_uses_cached_response_if_request_fails(person: Person, tmp_path):
+    cache = HttpCache(str(tmp_path), ttl=-1)
+    cache.put(f"{person.dblp_url}.bib", b"@article{id, title = {Title}, year = {2020}}")
+
+    def get(_url, headers):
+        raise requests.ConnectionError("Connection refused")
+
+    assert len(fetch_bibliography(person, _FakeSession(get), cache).publications) == 1
+    assert len(fetch_bibliography(person, _FakeSession(lambda _url, headers: _Response(503)), cache).publications) == 1
+
+
+def test_fetch_bibliography_offline(person: Person, tmp_path):
+    cache = HttpCache(str(tmp_path))
+    cache.put(f"{person.dblp_url}.bib", b"@article{id, title = {Title}, year = {2020}}")
+
+    def get(_url, headers):
+        raise AssertionError("No request must be sent in offline mode.")
+
+    session = _FakeSession(get)
+    other = Person("other", "https://dblp.org/pid/1")
+
+    assert len(fetch_bibliography(person, session, cache, offline=True).publications) == 1
+    assert len(fetch_bibliography(other, session, cache, offline=True).publications) == 0
+
+
+def test_fetch_bibliography_records_metrics(person: Person):
+    session = _FakeSession(lambda _url, headers: _Response(200, b"@article{id, title = {Title}, year = {2020}}"))
+    entries_parsed = metrics.counter("bibtex_entries_parsed")
+    fetches = metrics.timer_statistics("associate_fetch", author_id=person.author_id).count
+
+    fetch_bibliography(person, session)
+
+    assert metrics.counter("bibtex_entries_parsed") == entries_parsed + 1
+    assert metrics.timer_statistics("associate_fetch", author_id=person.author_id).count == fetches + 1
+
+
+def test_fetch_bibliography_with_failed_request(person: Person):
+    session = _FakeSession(lambda _url, headers: _Response(404))
+
+    assert len(fetch_bibliography(person, session).publications) == 0
@@ -0,0 +1,80 @@
+import pytest
+from _pytest.fixtures import fixture
+
+from dblp_fetcher.persons.model import Person
+from dblp_fetcher.publications import FingerprintStore, _fingerprints
+from dblp_fetcher.publications.model import Bibliography
+
+
+@fixture
+def person() -> Person:
+    return Person(author_id="272-2782", dblp_url="https://dblp.org/pid/272/2782", start_year=2019)
+
+
+@fixture
+def bibtex_string() -> str:
+    return """
+    @article{id1, title = {Title 1}, year = {2020}}
+    @article{id2, title = {Title 2}, year = {2021}}
+    """
+
+
+def test_is_unchanged_without_fingerprint(tmp_path, person: Person, bibtex_string: str):
+    store = FingerprintStore(str(tmp_path / "fingerprints.json"), "context")
+
+    assert not store.is_unchanged(person, bibtex_string)
+
+
+def test_is_unchanged_after_record(tmp_path, person: Person, bibtex_string: str):
+    store = FingerprintStore(str(tmp_path / "fingerprints.json"), "context")
+    store.record(person, bibtex_string, Bibliography.from_bibtex(bibtex_string))
+
+    assert store.is_unchanged(person, bibtex_string)
+    assert not store.is_unchanged(person, bibtex_string + " ")
+    assert not store.is_unchanged(Person(person.author_id, person.dblp_url, start_year=2020), bibtex_string)
+
+
+def test_record_returns_only_changed_publications(tmp_path, person: Person, bibtex_string: str):
+    store = FingerprintStore(str(tmp_path / "fingerprints.json"), "context")
+    store.record(person, bibtex_string, Bibliography.from_bibtex(bibtex_string))
+
+    changed_bibtex_string = bibtex_string.replace("2021", "2022")
+    changed = store.record(person, changed_bibtex_string, Bibliography.from_bibtex(changed_bibtex_string))
+
+    assert [publication.title for publication in changed.publications] == ["{T}itle 2"]
+
+
+def test_save_and_load_with_same_context(tmp_path, person: Person, bibtex_string: str):
+    path = str(tmp_path / "fingerprints.json")
+    store = FingerprintStore(path, "context")
+    store.record(person, bibtex_string, Bibliography.from_bibtex(bibtex_string))
+    store.save("context")
+
+    assert FingerprintStore(path, "context").is_unchanged(person, bibtex_string)
+
+
+def test_save_and_load_with_different_context(tmp_path, person: Person, bibtex_string: str):
+    path = str(tmp_path / "fingerprints.json")
+    store = FingerprintStore(path, "context")
+    store.record(person, bibtex_string, Bibliography.from_bibtex(bibtex_string))
+    store.save("context")
+
+    assert not FingerprintStore(path, "other context").is_unchanged(person, bibtex_string)
+
+
+def test_failed_save_keeps_previous_fingerprints(tmp_path, monkeypatch, person: Person, bibtex_string: str):
+    path = str(tmp_path / "fingerprints.json")
+    store = FingerprintStore(path, "context")
+    store.record(person, bibtex_string, Bibliography())
+    store.save("context")
+
+    def dump(data, file):
+        file.write("{")
+        raise OSError("No space left on device")
+
+    monkeypatch.setattr(_fingerprints.json, "dump", dump)
+    with pytest.raises(OSError):
+        store.save("other context")
+    monkeypatch.undo()
+
+    assert FingerprintStore(path, "context").is_unchanged(person, bibtex_string)
@@ -0,0 +1,131 @@
+import pytest
+
+from dblp_fetcher.publications.model import Bibliography, NearDuplicateIndex, Publication, merge_near_duplicates
+
+
+def _publication(title: str, author: str = "John Doe", year: str = "2021", keywords: str = "") -> Publication:
+    return Publication({
+        "ENTRYTYPE": "article",
+        "ID": title,
+        "title": title,
+        "author": author,
+        "year": year,
+        "keywords": keywords
+    })
+
+
+@pytest.mark.parametrize("first_title, second_title", [
+    ("A Framework for Linked Data Quality Assessment", "A Framework for Linked-Data Quality Assessments"),
+    ("Towards Veracity Assessment in RDF Knowledge Bases", "Toward Veracity Assessment in RDF Knowledge Bases"),
+    ("Combining Linked Data and Statistical Retrieval", "Combining Linked Data and Statistical Retrieval - A Survey"),
+    ("{I}deal {D}ownward {R}efinement in the \\emph{E}L {D}escription {L}ogic",
+     "Ideal Downward Refinement in the EL Description Logic"),
+])
+def test_find_near_duplicates(first_title: str, second_title: str):
+    index = NearDuplicateIndex().add_all([_publication(first_title), _publication(second_title)])
+    near_duplicates = index.find_near_duplicates()
+
+    assert len(near_duplicates) == 1
+    assert near_duplicates[0].first.title == first_title
+    assert near_duplicates[0].second.title == second_title
+
+
+@pytest.mark.parametrize("first, second", [
+    (_publication("Linked Data Quality"), _publication("Question Answering over Knowledge Graphs")),
+    (_publication("Results of the Evaluation Initiative 2018"),
+     _publication("Results of the Evaluation Initiative 2019")),
+    (_publication("{P}roceedings of the second workshop on services and applications over linked {A}PIs and data"),
+     _publication("{P}roceedings of the third workshop on services and applications over linked {A}PIs and data")),
+    (_publication("Proceedings of the 2nd Workshop on Linked Data Quality"),
+     _publication("Proceedings of the 3rd Workshop on Linked Data Quality")),
+    (_publication("A Framework for Quality Assessment", year="2015"),
+     _publication("A Framework for Quality Assessment", year="2019")),
+    (_publication("A Framework for Quality Assessment", author="Jane Roe"),
+     _publication("A Framework for Quality Assessment", author="Max Mustermann")),
+])
+def test_find_near_duplicates_rejects_different_publications(first: Publication, second: Publication):
+    assert NearDuplicateIndex().add_all([first, second]).find_near_duplicates() == []
+
+
+def test_find_near_duplicates_matches_author_last_names():
+    first = _publication("A Framework for Quality Assessment", author="Doe, John and Roe, Jane")
+    second = _publication("A Framework for Quality Assessments", author="J. Roe")
+
+    assert len(NearDuplicateIndex().add_all([first, second]).find_near_duplicates()) == 1
+
+
+def test_find_near_duplicates_matches_multi_line_dblp_author_fields():
+    bibliography = Bibliography.from_bibtex("""
+    @inproceedings{DBLP:conf/a/1,
+      author    = {Ricardo Usbeck and
+                   Michael R{\\"{o}}der and
+                   Axel{-}Cyrille Ngonga Ngomo},
+      title     = {A Framework for Quality Assessment},
+      year      = {2021}
+    }
+    @inproceedings{DBLP:conf/a/2,
+      author    = {Ricardo Usbeck},
+      title     = {A Framework for Quality Assessments},
+      year      = {2021}
+    }
+    """)
+
+    assert len(NearDuplicateIndex().add_all(bibliography.publications).find_near_duplicates()) == 1
+
+
+def test_statistics():
+    publications = [_publication(title) for title in [
+        "Linked Data Quality",
+        "Question Answering over Knowledge Graphs",
+        "Scalable Reasoning with Apache Spark",
+        "Semantic Publishing Challenge",
+        "Learning Description Logic Concepts",
+        "Knowledge Graph Embeddings",
+        "Entity Recognition in Noisy Data",
+        "Ontology Alignment Evaluation",
+        "Distributed SPARQL Evaluation",
+        "Open Course Ware Accessibility",
+    ]]
+    publications.append(_publication("A Framework for Quality Assessment"))
+    publications.append(_publication("A Framework for Quality Assessments"))
+
+    index = NearDuplicateIndex().add_all(publications)
+    index.find_near_duplicates()
+
+    assert index.statistics.publications == 12
+    assert 1 <= index.statistics.candidate_pairs < 12 * 11 / 2
+    assert index.statistics.near_duplicates == 1
+
+
+def test_merge_near_duplicates():
+    bibliography = Bibliography([
+        _publication("A Framework for Quality Assessment", keywords="sda"),
+        _publication("Something Else"),
+        _publication("A Framework for Quality Assessments", keywords="dblp"),
+        _publication("A Framework for Quality Assesment", keywords="other"),
+    ])
+    near_duplicates = NearDuplicateIndex().add_all(bibliography.publications).find_near_duplicates()
+
+    assert merge_near_duplicates(bibliography, near_duplicates) == 2
+    assert [publication.title for publication in bibliography.publications] == [
+        "A Framework for Quality Assessment",
+        "Something Else"
+    ]
+    assert bibliography.publications[0].keywords == {"sda", "dblp", "other"}
+
+
+def test_merge_near_duplicates_skips_prefix_matches():
+    # Pairs from data/sda.bib whose titles only share a prefix, but which are distinct publications.
+    bibliography = Bibliography([
+        _publication("{S}emantic {P}ublishing {C}hallenge", year="2015"),
+        _publication("{S}emantic {P}ublishing {C}hallenge - {A}ssessing the {Q}uality of {S}cientific\n{O}utput by "
+                     "{I}nformation {E}xtraction and {I}nterlinking", year="2015"),
+        _publication("{T}raining {R}estricted {B}oltzmann {M}achines", year="2015"),
+        _publication("{T}raining restricted {B}oltzmann machines: {A}n introduction", year="2014"),
+    ])
+    near_duplicates = NearDuplicateIndex().add_all(bibliography.publications).find_near_duplicates()
+
+    assert len(near_duplicates) == 2
+    assert all(near_duplicate.by_prefix for near_duplicate in near_duplicates)
+    assert merge_near_duplicates(bibliography, near_duplicates) == 0
+    assert len(bibliography.publications) == 4
@@ -0,0 +1,158 @@
+import json
+
+import requests
+
+from dblp_fetcher.persons.model import Person
+from dblp_fetcher.publications import PersonResolver, _dblp_dump, _person_resolver
+
+_DUMP = """<?xml version="1.0" encoding="ISO-8859-1"?>
+<dblp>
+<www key="homepages/71/4882" mdate="2020-01-01">
+<author>Jens Lehmann 0001</author>
+<author>J. Lehmann</author>
+<title>Home Page</title>
+</www>
+<www key="homepages/12/1" mdate="2020-01-01">
+<author>John Doe</author>
+<title>Home Page</title>
+</www>
+<www key="homepages/12/2" mdate="2020-01-01">
+<author>John Doe</author>
+<title>Home Page</title>
+</www>
+</dblp>
+"""
+
+
+class _Response:
+    def __init__(self, status_code: int, data: dict = None):
+        self.status_code = status_code
+        self._data = data
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Error")
+
+    def json(self):
+        return self._data
+
+
+class _FakeSession:
+    def __init__(self, hits_by_name: dict[str, list[tuple[str, str]]], status_code: int = 200):
+        self.hits_by_name = hits_by_name
+        self.status_code = status_code
+        self.queries = []
+
+    def get(self, url: str):
+        query = requests.utils.unquote(url.split("q=")[1].split("&")[0]).replace("+", " ")
+        self.queries.append(query)
+        hits = [
+            {"info": {"author": author, "url": f"https://dblp.org/pid/{pid}"}}
+            for author, pid in self.hits_by_name.get(query, [])
+        ]
+        return _Response(self.status_code, {"result": {"hits": {"hit": hits}}})
+
+
+def test_resolve_searches_each_name_once(tmp_path):
+    path = str(tmp_path / "persons.json")
+    session = _FakeSession({
+        "Jens Lehmann": [("Jens Lehmann 0001", "71/4882"), ("Jens Lehmanns", "99/1")],
+        "John Doe": [("John Doe", "12/1"), ("John Doe 0002", "12/2")],
+    })
+
+    resolver = PersonResolver(path, session=session)
+    assert resolver.resolve(["Jens Lehmann", "John Doe", "Nobody", "Jens  Lehmann"]) == {
+        "Jens Lehmann": "71/4882",
+        "John Doe": None,
+        "Nobody": None,
+        "Jens  Lehmann": "71/4882",
+    }
+    assert sorted(session.queries) == ["Jens Lehmann", "John Doe", "Nobody"]
+
+    resolver.save()
+    session.queries.clear()
+    assert PersonResolver(path, session=session).resolve(["Jens Lehmann", "Nobody"]) == {
+        "Jens Lehmann": "71/4882",
+        "Nobody": None,
+    }
+    assert session.queries == []
+
+
+def test_resolve_retries_unresolved_names(tmp_path):
+    path = str(tmp_path / "persons.json")
+    session = _FakeSession({})
+    PersonResolver(path, session=session).resolve(["Jens Lehmann"])
+
+    session.hits_by_name["Jens Lehmann"] = [("Jens Lehmann", "71/4882")]
+    assert PersonResolver(path, session=session, retry_after=0).resolve(["Jens Lehmann"]) == {"Jens Lehmann": "71/4882"}
+
+
+def test_resolve_does_not_remember_failed_searches(tmp_path):
+    path = str(tmp_path / "persons.json")
+    session = _FakeSession({"Jens Lehmann": [("Jens Lehmann", "71/4882")]}, status_code=500)
+    resolver = PersonResolver(path, session=session)
+
+    assert resolver.resolve(["Jens Lehmann"]) == {"Jens Lehmann": None}
+
+    session.status_code = 200
+    assert resolver.resolve(["Jens Lehmann"]) == {"Jens Lehmann": "71/4882"}
+
+
+def test_resolve_without_session(tmp_path):
+    assert PersonResolver(str(tmp_path / "persons.json")).resolve(["Jens Lehmann"]) == {"Jens Lehmann": None}
+
+
+def test_add_names_from_dump(tmp_path):
+    dump_path = tmp_path / "dblp.xml"
+    dump_path.write_text(_DUMP, encoding="ISO-8859-1")
+    path = str(tmp_path / "persons.json")
+    session = _FakeSession({})
+
+    resolver = PersonResolver(path, session=session)
+    resolver.add_names_from_dump(str(dump_path))
+
+    assert resolver.resolve(["Jens Lehmann", "J. Lehmann", "John Doe"]) == {
+        "Jens Lehmann": "71/4882",
+        "J. Lehmann": "71/4882",
+        "John Doe": None,
+    }
+    assert session.queries == []
+
+    resolver.save()
+    with open(path, encoding="UTF-8") as file:
+        assert json.load(file)["dump"]["path"] == str(dump_path)
+
+
+def test_person_names_from_dump_reuses_names_of_dump_pass(tmp_path, monkeypatch):
+    dump_path = tmp_path / "dblp.xml"
+    dump_path.write_text(_DUMP, encoding="ISO-8859-1")
+    path = str(tmp_path / "persons.json")
+    authors = [
+        Person(author_id="lehmann", dblp_url="https://dblp.org/pid/71/4882", start_year=2019),
+        Person(author_id="unknown", dblp_url="https://dblp.org/pid/99/1", start_year=2019),
+    ]
+    passes = []
+    read_profiles = _dblp_dump.iter_person_profiles_from_dump
+
+    def iter_person_profiles_from_dump(*args):
+        passes.append(args)
+        return read_profiles(*args)
+
+    monkeypatch.setattr(_dblp_dump, "iter_person_profiles_from_dump", iter_person_profiles_from_dump)
+    monkeypatch.setattr(_person_resolver, "iter_person_profiles_from_dump", _dblp_dump.iter_person_profiles_from_dump)
+
+    resolver = PersonResolver(path)
+    resolver.add_names_from_dump(str(dump_path))
+    assert resolver.person_names_from_dump(str(dump_path), authors) == {"71/4882": ["Jens Lehmann 0001", "J. Lehmann"]}
+    resolver.save()
+    assert len(passes) == 1
+
+    # Names from the same dump are kept in the index, also for persons without a profile in the dump.
+    resolver = PersonResolver(path)
+    resolver.add_names_from_dump(str(dump_path))
+    assert resolver.person_names_from_dump(str(dump_path), authors) == {"71/4882": ["Jens Lehmann 0001", "J. Lehmann"]}
+    assert len(passes) == 1
+
+    authors.append(Person(author_id="doe", dblp_url="https://dblp.org/pid/12/1", start_year=2019))
+    assert resolver.person_names_from_dump(str(dump_path), authors)["12/1"] == ["John Doe"]
+    assert len(passes) == 2
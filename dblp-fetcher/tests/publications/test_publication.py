@@ -1,3 +1,4 @@
+import pytest
 from _pytest.fixtures import fixture
 
 from dblp_fetcher.publications.model import Publication
@@ -127,3 +128,97 @@ def test_is_arxiv_preprint_complete(complete_publication: Publication):
 
 def test_is_arxiv_preprint_empty(empty_publication: Publication):
     assert not empty_publication.is_arxiv_preprint()
+
+
+def test_id_changes_with_title(complete_publication: Publication):
+    assert complete_publication.id == "atitlewithspecialcharacters2020"
+
+    complete_publication.set_property("title", "Another title")
+    assert complete_publication.id == "anothertitle"
+
+    complete_publication.remove_property("title")
+    assert complete_publication.id is None
+
+
+def test_bibtex_dict_is_a_copy(complete_publication: Publication):
+    complete_publication.bibtex_dict["title"] = "Another title"
+    assert complete_publication.title == "A 'title' - with_special - characters 2020"
+
+
+def test_copy_is_independent(complete_publication: Publication):
+    copy = complete_publication.copy()
+    complete_publication.set_property("title", "Another title")
+    complete_publication.add_keyword("keyword4")
+
+    assert copy.title == "A 'title' - with_special - characters 2020"
+    assert copy.id == "atitlewithspecialcharacters2020"
+    assert copy.keywords == {"keyword1", "keyword2", "keyword3"}
+    assert copy.is_arxiv_preprint()
+
+
+def test_content_hash_depends_only_on_content(complete_publication: Publication):
+    same_publication = Publication(complete_publication.bibtex_dict)
+
+    assert complete_publication.content_hash == same_publication.content_hash
+    assert complete_publication.content_hash != Publication({}).content_hash
+
+
+@pytest.mark.parametrize(
+    "change",
+    [
+        lambda publication: publication.set_property("title", "Another title"),
+        lambda publication: publication.set_property("keywords", "keyword4"),
+        lambda publication: publication.add_keyword("keyword4"),
+        lambda publication: publication.remove_property("journal"),
+        lambda publication: publication.remove_property("keywords"),
+        lambda publication: publication.update(Publication({"year": "2021"})),
+        lambda publication: publication.update(Publication({"keywords": "keyword4"})),
+    ]
+)
+def test_content_hash_changes_with_content(change, complete_publication: Publication):
+    content_hash = complete_publication.content_hash
+    change(complete_publication)
+
+    assert complete_publication.content_hash != content_hash
+    assert complete_publication.content_hash == Publication(complete_publication.bibtex_dict).content_hash
+
+
+@pytest.mark.parametrize(
+    "change",
+    [
+        lambda publication: publication.set_property("year", "2020"),
+        lambda publication: publication.set_property("keywords", "keyword2, keyword1 keyword3"),
+        lambda publication: publication.add_keyword("keyword1"),
+        lambda publication: publication.remove_property("editor"),
+        lambda publication: publication.update(Publication({"year": "2020", "keywords": "keyword1"})),
+    ]
+)
+def test_content_hash_is_kept_without_change(change, complete_publication: Publication):
+    content_hash = complete_publication.content_hash
+    change(complete_publication)
+
+    assert complete_publication._content_hash == content_hash
+
+
+def test_get_property(complete_publication: Publication):
+    assert complete_publication.get_property("author") == "John Doe"
+    assert complete_publication.get_property("keywords") == "keyword1, keyword2, keyword3"
+    assert complete_publication.get_property("editor") is None
+
+
+def test_set_property_updates_derived_fields(empty_publication: Publication):
+    empty_publication.set_property("year", "2019")
+    empty_publication.set_property("journal", "CoRR")
+    empty_publication.set_property("keywords", "keyword2 keyword1")
+
+    assert empty_publication.year == 2019
+    assert empty_publication.is_arxiv_preprint()
+    assert empty_publication.keywords == {"keyword1", "keyword2"}
+    assert empty_publication.bibtex_dict == {"year": "2019", "journal": "CoRR", "keywords": "keyword1, keyword2"}
+
+
+def test_authors():
+    publication = Publication({"author": "John Doe and\n  Jane   Roe and Max Mustermann"})
+
+    assert publication.authors == ["John Doe", "Jane Roe", "Max Mustermann"]
+    assert Publication({}).authors == []
@@ -0,0 +1,89 @@
+import gzip
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+from _pytest.fixtures import fixture
+
+from dblp_fetcher.publications import DblpSession
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # Status codes that are returned before the final 200 response, consumed front to back.
+    failures: list[tuple[int, dict[str, str]]] = []
+
+    def do_GET(self):
+        if self.path == "/slow":
+            threading.Event().wait(1)
+
+        if len(self.failures) > 0:
+            status_code, headers = self.failures.pop(0)
+            self.send_response(status_code)
+            for key, value in headers.items():
+                self.send_header(key, value)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        body = gzip.compress(b"@article{id, title = {Title}}" * 10)
+        self.send_response(200)
+        self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@fixture
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    _Handler.failures = []
+
+
+def test_get_decompresses_and_records_request(server_url: str):
+    session = DblpSession()
+
+    response = session.get(f"{server_url}/pid/1.bib")
+
+    assert response.content == b"@article{id, title = {Title}}" * 10
+    [record] = session.records
+    assert record.url == f"{server_url}/pid/1.bib"
+    assert record.status_code == 200
+    assert record.attempts == 1
+    assert 0 < record.bytes < len(response.content)
+
+
+def test_get_retries_and_honours_retry_after(server_url: str):
+    _Handler.failures = [(429, {"Retry-After": "0"}), (503, {})]
+    session = DblpSession(backoff_factor=0.01)
+
+    response = session.get(f"{server_url}/pid/1.bib")
+
+    assert response.status_code == 200
+    assert session.records[0].attempts == 3
+
+
+def test_get_returns_last_response_after_max_retries(server_url: str):
+    _Handler.failures = [(503, {})] * 3
+    session = DblpSession(max_retries=2, backoff_factor=0.01)
+
+    response = session.get(f"{server_url}/pid/1.bib")
+
+    assert response.status_code == 503
+    assert session.records[0].attempts == 3
+
+
+def test_get_with_timeout(server_url: str):
+    session = DblpSession(timeout=(1, 0.1), max_retries=0)
+
+    with pytest.raises(requests.Timeout):
+        session.get(f"{server_url}/slow")
+
+    assert session.records[0].status_code is None
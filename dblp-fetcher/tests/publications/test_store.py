@@ -0,0 +1,94 @@
+import io
+from concurrent.futures import ThreadPoolExecutor
+
+from _pytest.fixtures import fixture
+
+from dblp_fetcher.publications.model import Bibliography, BibliographyStore
+
+
+@fixture
+def bibliography() -> Bibliography:
+    return Bibliography.from_bibtex("""
+    @article{id1, title = {Title 1}, author = {John Doe and Jane Roe}, year = {2019}, keywords = {sda-pub, doe}}
+    @article{id2, title = {Title 2}, author = {Jane
+        Roe}, year = {2021}, keywords = {roe}}
+    @article{id3, title = {Title 3}, author = {Max Mustermann}, year = {2022}}
+    """)
+
+
+@fixture
+def store(tmp_path, bibliography: Bibliography) -> BibliographyStore:
+    store = BibliographyStore(str(tmp_path / "sda.sqlite"))
+    store.save(bibliography)
+    yield store
+    store.close()
+
+
+def test_load(store: BibliographyStore, bibliography: Bibliography):
+    assert len(store) == 3
+    assert store.load().to_bibtex() == bibliography.to_bibtex()
+    assert [publication.id for publication in store.load().publications] == ["title1", "title2", "title3"]
+
+
+def test_load_after_reopening(tmp_path, store: BibliographyStore, bibliography: Bibliography):
+    store.close()
+
+    with BibliographyStore(str(tmp_path / "sda.sqlite")) as reopened_store:
+        assert reopened_store.load().to_bibtex() == bibliography.to_bibtex()
+
+
+def test_load_in_another_thread(store: BibliographyStore, bibliography: Bibliography):
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        loaded = executor.submit(store.load).result()
+
+    assert loaded.to_bibtex() == bibliography.to_bibtex()
+
+
+def test_get(store: BibliographyStore):
+    assert store.get("title2").keywords == {"roe"}
+    assert store.get("unknown") is None
+
+
+def test_find(store: BibliographyStore):
+    def find(**criteria) -> list[str]:
+        return [publication.id for publication in store.find(**criteria)]
+
+    assert find() == ["title1", "title2", "title3"]
+    assert find(keyword="sda-pub") == ["title1"]
+    assert find(author="Jane Roe") == ["title1", "title2"]
+    assert find(min_year=2020) == ["title2", "title3"]
+    assert find(author="Jane Roe", min_year=2020, max_year=2021) == ["title2"]
+    assert find(keyword="unknown") == []
+
+
+def test_save_writes_only_changes(store: BibliographyStore, bibliography: Bibliography):
+    assert store.save(bibliography) == (0, 0)
+
+    bibliography.get_publication_by_id("title1").add_keyword("new")
+    bibliography.remove_publication_by_id("title3")
+
+    assert store.save(bibliography) == (1, 1)
+    assert [publication.id for publication in store.find(keyword="new")] == ["title1"]
+    assert store.get("title3") is None
+    assert store.find(author="Max Mustermann") == []
+
+
+def test_upsert_publications_keeps_order(store: BibliographyStore, bibliography: Bibliography):
+    publication = bibliography.get_publication_by_id("title1").set_property("year", "2020")
+
+    assert store.upsert_publications([publication]) == 1
+    assert [publication.id for publication in store.load().publications] == ["title1", "title2", "title3"]
+    assert [publication.id for publication in store.find(min_year=2020, max_year=2020)] == ["title1"]
+
+
+def test_remove_publications(store: BibliographyStore):
+    assert store.remove_publications(["title1", "unknown"]) == 1
+    assert len(store) == 2
+    assert store.find(keyword="sda-pub") == []
+
+
+def test_export_bibtex(store: BibliographyStore, bibliography: Bibliography):
+    output = io.StringIO()
+    store.export_bibtex(output)
+
+    assert output.getvalue() == bibliography.to_bibtex()
@@ -1,7 +1,9 @@
+import pickle
+
 import pytest
 from _pytest.fixtures import fixture
 
-from dblp_fetcher.publications.model import TitleBlacklist
+from dblp_fetcher.publications.model import Bibliography, Publication, TitleBlacklist
 
 
 @fixture
@@ -19,3 +21,106 @@ def blacklist() -> TitleBlacklist:
 )
 def test_is_blacklisted(title: str, expected: bool, blacklist: TitleBlacklist):
     assert blacklist.is_blacklisted(title) == expected
+
+
+@fixture
+def rule_blacklist() -> TitleBlacklist:
+    return TitleBlacklist([
+        "Exact Title",
+        "title:regex: A Title With A Rule Prefix",
+        "prefix:Proceedings of the",
+        "regex:^Front ?[Mm]atter",
+        "doi:10.1007/978-3-642-13489-0_15",
+        "dblp:conf/esws/DoeR20",
+    ])
+
+
+@pytest.mark.parametrize(
+    "bibtex_dict,expected", [
+        ({"title": "{E}xact {T}itle"}, True),
+        ({"title": "Exact Title, Extended"}, False),
+        ({"title": "Regex: A Title with a Rule Prefix"}, True),
+        ({"title": "{P}roceedings of the 1st Workshop"}, True),
+        ({"title": "Proceedings"}, False),
+        ({"title": "Frontmatter"}, True),
+        ({"title": "The Front Matter"}, False),
+        ({"title": "T", "doi": "https://doi.org/10.1007/978-3-642-13489-0\\_15"}, True),
+        ({"title": "T", "doi": "10.1007/978-3-642-13489-0_16"}, False),
+        ({"title": "T", "ID": "DBLP:conf/esws/DoeR20"}, True),
+        ({"title": "T", "biburl": "https://dblp.org/rec/conf/esws/DoeR20.bib"}, True),
+        ({"title": "T", "ID": "DBLP:conf/esws/DoeR21"}, False),
+        ({"doi": "10.1000/other"}, False),
+    ]
+)
+def test_matches(bibtex_dict: dict[str, str], expected: bool, rule_blacklist: TitleBlacklist):
+    assert rule_blacklist.matches(Publication(bibtex_dict)) == expected
+
+
+@pytest.mark.parametrize(
+    "title,expected", [
+        ("Front Matter", True),
+        ("Front\n    Matter", True),
+        ("Frontmatter", True),
+        ("The Front Matter", False),
+        ("Matter \\\"{U}ber Front", True),
+    ]
+)
+def test_regex_rules_match_parsed_titles(title: str, expected: bool):
+    blacklist = TitleBlacklist(["regex:^Front ?[Mm]atter", "regex:Über Front$"])
+    bibliography = Bibliography.from_bibtex(f"@article{{id, title = {{{title}}}, year = {{2020}}}}")
+
+    assert blacklist.matches(bibliography.publications[0]) == expected
+
+
+@pytest.mark.parametrize(
+    "rule,title,expected", [
+        ("regex:^Front Matter$", "front matter", True),
+        ("regex:(?i)front matter", "{F}ront {M}atter", True),
+        ("regex:(?s)^Front.Matter$", "Front Matter", True),
+        ("regex:(?s)^Front.Matter$", "The Front Matter", False),
+    ]
+)
+def test_regex_rules_ignore_case_and_allow_leading_flags(rule: str, title: str, expected: bool):
+    blacklist = TitleBlacklist(["regex:^Editorial$", rule])
+
+    assert blacklist.is_blacklisted(title) == expected
+
+
+@pytest.mark.parametrize("rule", ["regex:Front (?i)Matter", "regex:(Front", "regex:(?x)Front # Matter"])
+def test_invalid_regex_rules(rule: str):
+    with pytest.raises(ValueError):
+        TitleBlacklist([rule])
+
+
+def test_from_file(tmp_path):
+    path = tmp_path / "blacklist.txt"
+    path.write_text("# Comment\n\nExact Title\nprefix:Proceedings of\ntitle:#1 Title\n", encoding="UTF-8")
+
+    blacklist = TitleBlacklist.from_file(str(path))
+
+    assert blacklist.is_blacklisted("Exact Title")
+    assert blacklist.is_blacklisted("#1 Title")
+    assert blacklist.is_blacklisted("Proceedings of Something")
+    assert not blacklist.is_blacklisted("# Comment")
+
+
+def test_from_file_uses_cache(tmp_path):
+    path = tmp_path / "blacklist.txt"
+    cache_directory = tmp_path / "cache"
+    path.write_text("Exact Title\n", encoding="UTF-8")
+
+    TitleBlacklist.from_file(str(path), cache_directory=str(cache_directory))
+    cache_files = list(cache_directory.iterdir())
+    assert len(cache_files) == 1
+
+    # The cached blacklist is loaded as long as the file is unchanged.
+    with open(cache_files[0], "wb") as cache_file:
+        pickle.dump(TitleBlacklist(["Cached Title"]), cache_file)
+    assert TitleBlacklist.from_file(str(path), cache_directory=str(cache_directory)).is_blacklisted("Cached Title")
+
+    # Changing the file compiles it again and replaces the outdated cache file.
+    path.write_text("Other Title\n", encoding="UTF-8")
+    blacklist = TitleBlacklist.from_file(str(path), cache_directory=str(cache_directory))
+    assert blacklist.is_blacklisted("Other Title")
+    assert not blacklist.is_blacklisted("Cached Title")
+    assert len(list(cache_directory.iterdir())) == 1
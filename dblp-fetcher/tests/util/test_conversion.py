@@ -33,3 +33,12 @@ def test_url_from_string(url_string: str, expected: Optional[str]):
 )
 def test_year_from_string(year_string: str, expected: Optional[int]):
     assert year_from_string(year_string) == expected
+
+
+def test_normalized_title_is_memoized():
+    normalized_title.cache_clear()
+
+    normalized_title("A memoized title")
+    normalized_title("A memoized title")
+
+    assert normalized_title.cache_info().hits == 1
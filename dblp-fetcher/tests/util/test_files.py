@@ -0,0 +1,52 @@
+import os
+
+import pytest
+
+from dblp_fetcher.util import atomic_write
+
+
+def test_atomic_write_replaces_file(tmp_path):
+    path = tmp_path / "file.txt"
+    path.write_text("old")
+    os.chmod(path, 0o644)
+
+    with atomic_write(str(path), encoding="UTF-8") as file:
+        file.write("new")
+
+    assert path.read_text() == "new"
+    assert os.stat(path).st_mode & 0o777 == 0o644
+    assert os.listdir(tmp_path) == ["file.txt"]
+
+
+def test_atomic_write_creates_file(tmp_path):
+    path = tmp_path / "file.bin"
+
+    with atomic_write(str(path), "wb") as file:
+        file.write(b"new")
+
+    assert path.read_bytes() == b"new"
+
+
+def test_atomic_write_creates_file_with_umask_mode(tmp_path):
+    path = tmp_path / "file.txt"
+    umask = os.umask(0o022)
+    try:
+        with atomic_write(str(path), encoding="UTF-8") as file:
+            file.write("new")
+    finally:
+        os.umask(umask)
+
+    assert os.stat(path).st_mode & 0o777 == 0o644
+
+
+def test_atomic_write_keeps_old_file_on_error(tmp_path):
+    path = tmp_path / "file.txt"
+    path.write_text("old")
+
+    with pytest.raises(RuntimeError):
+        with atomic_write(str(path), encoding="UTF-8") as file:
+            file.write("partial")
+            raise RuntimeError()
+
+    assert path.read_text() == "old"
+    assert os.listdir(tmp_path) == ["file.txt"]
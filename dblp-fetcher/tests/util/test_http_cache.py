@@ -0,0 +1,76 @@
+import os
+import time
+
+from _pytest.fixtures import fixture
+
+from dblp_fetcher.util import HttpCache, CachedResponse
+
+
+@fixture
+def cache(tmp_path) -> HttpCache:
+    return HttpCache(str(tmp_path), ttl=60)
+
+
+def test_get_with_missing_response(cache: HttpCache):
+    assert cache.get("https://dblp.org/pid/1.bib") is None
+
+
+def test_put_and_get(cache: HttpCache):
+    cache.put("https://dblp.org/pid/1.bib", b"body", etag='"etag"', last_modified="yesterday")
+
+    response = cache.get("https://dblp.org/pid/1.bib")
+    assert response.body == b"body"
+    assert response.etag == '"etag"'
+    assert response.last_modified == "yesterday"
+    assert time.time() - response.stored_at < 60
+
+
+def test_conditional_headers():
+    response = CachedResponse("https://dblp.org/pid/1.bib", b"body", etag='"etag"', last_modified="yesterday")
+
+    assert response.conditional_headers() == {"If-None-Match": '"etag"', "If-Modified-Since": "yesterday"}
+
+
+def test_conditional_headers_without_validators():
+    response = CachedResponse("https://dblp.org/pid/1.bib", b"body")
+
+    assert response.conditional_headers() == {}
+
+
+def test_revalidate(cache: HttpCache):
+    cache.put("https://dblp.org/pid/1.bib", b"body")
+    response = cache.get("https://dblp.org/pid/1.bib")
+    response.stored_at = 0
+
+    cache.revalidate(response)
+
+    assert time.time() - cache.get("https://dblp.org/pid/1.bib").stored_at < 60
+
+
+def test_evict_removes_expired_responses(tmp_path):
+    cache = HttpCache(str(tmp_path), ttl=0)
+    cache.put("https://dblp.org/pid/1.bib", b"body")
+    time.sleep(0.01)
+
+    cache.evict()
+
+    assert cache.get("https://dblp.org/pid/1.bib") is None
+
+
+def test_evict_removes_least_recently_used_responses(tmp_path):
+    cache = HttpCache(str(tmp_path), max_size=1500)
+    for index in range(3):
+        cache.put(f"https://dblp.org/pid/{index}.bib", b"x" * 500)
+
+    # Mark the first response as the least recently used one.
+    body_files = sorted(tmp_path.glob("*.body"), key=lambda path: path.stat().st_mtime)
+    for age, body_file in enumerate(body_files):
+        os.utime(body_file, (age, age))
+    cache.get("https://dblp.org/pid/0.bib")
+    cache.get("https://dblp.org/pid/2.bib")
+
+    cache.evict()
+
+    assert cache.get("https://dblp.org/pid/0.bib") is not None
+    assert cache.get("https://dblp.org/pid/1.bib") is None
+    assert cache.get("https://dblp.org/pid/2.bib") is not None
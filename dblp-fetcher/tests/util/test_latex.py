@@ -0,0 +1,42 @@
+import re
+from pathlib import Path
+
+import pytest
+from bibtexparser.latexenc import latex_to_unicode
+
+from dblp_fetcher.publications.model import Bibliography
+from dblp_fetcher.util._latex import normalize_latex_title
+
+_NON_ALPHANUMERIC = re.compile(r"[^a-z\d]")
+_KNOWN_PUBLICATION_PATH = Path(__file__).parents[2] / "data" / "sda.bib"
+
+
+def _reference(title: str) -> str:
+    return _NON_ALPHANUMERIC.sub("", latex_to_unicode(title).lower())
+
+
+@pytest.mark.parametrize("title", [
+    "A plain ASCII title 2020",
+    "{S}oft{W}iki - f{\\\"u}r {S}oftwareprojekte mit einer gro{\\ss}en {A}nzahl",
+    "{D}etec{\\c c}{\\~a}o de ru{\\i}́dos em problemas de classifica{\\c c}{\\~a}o",
+    "{L}et\\textquotesingle s {T}eam {U}p",
+    "{T}he {P}rot{\\'e}g{\\'e}{V}OW{L} Plugin",
+    "D{C}\\textbackslash (\\^{}\\textbackslash mbox2\\textbackslash ){S}",
+    "{A} Refinement {O}perator for the \\textbackslash emph{A}LC {D}escription {L}ogic",
+    "{R}e{\\c S}ys challenge",
+    "Rock'n'Roll {D}ata",
+    "\\cyrchar\\CYRA and \\`{}n",
+    "été and K",
+    "{\\.n}{\\.I}{\\`n}",
+    "",
+])
+def test_normalize_latex_title(title: str):
+    assert normalize_latex_title(title) == _reference(title)
+
+
+def test_normalize_latex_title_matches_known_publications():
+    with open(_KNOWN_PUBLICATION_PATH, "rb") as bib:
+        bibliography = Bibliography.from_bibtex_file(bib)
+
+    values = [value for publication in bibliography.publications for value in publication.bibtex_dict.values()]
+    assert [normalize_latex_title(value) for value in values] == [_reference(value) for value in values]
@@ -0,0 +1,93 @@
+import io
+import json
+
+import pytest
+
+from dblp_fetcher.util import MetricsRegistry, TimerStatistics
+
+
+def test_counters():
+    registry = MetricsRegistry()
+    registry.increment("entries_parsed", 3)
+    registry.increment("entries_parsed")
+    registry.increment("requests", stage="fetch")
+
+    assert registry.counter("entries_parsed") == 4
+    assert registry.counter("requests", stage="fetch") == 1
+    assert registry.counter("requests", stage="other") == 0
+
+
+def test_timers():
+    registry = MetricsRegistry()
+    registry.observe("stage", 1.5, stage="fetch")
+    registry.observe("stage", 0.5, stage="fetch")
+    with registry.timer("stage", stage="write"):
+        pass
+
+    assert registry.timer_statistics("stage", stage="fetch") == TimerStatistics(2, 2.0, 1.5)
+    assert registry.timer_statistics("stage", stage="write").count == 1
+    assert registry.timer_statistics("stage", stage="merge") == TimerStatistics()
+
+
+def test_timer_records_exceptions():
+    registry = MetricsRegistry()
+    with pytest.raises(ValueError):
+        with registry.timer("stage", stage="fetch"):
+            raise ValueError()
+
+    assert registry.timer_statistics("stage", stage="fetch").count == 1
+
+
+def test_reset():
+    registry = MetricsRegistry()
+    registry.increment("requests")
+    registry.observe("stage", 1.0)
+    registry.reset()
+
+    assert registry.to_json() == {"counters": [], "timers": []}
+
+
+def test_to_json():
+    registry = MetricsRegistry()
+    registry.increment("requests", 2)
+    registry.observe("associate_fetch", 0.25, author_id="lehmann")
+
+    file = io.StringIO()
+    registry.write(file, "json")
+
+    assert json.loads(file.getvalue()) == {
+        "counters": [{"name": "requests", "labels": {}, "value": 2}],
+        "timers": [{
+            "name": "associate_fetch",
+            "labels": {"author_id": "lehmann"},
+            "count": 1,
+            "total_seconds": 0.25,
+            "max_seconds": 0.25
+        }],
+    }
+
+
+def test_to_prometheus():
+    registry = MetricsRegistry()
+    registry.increment("bytes_received", 1024)
+    registry.observe("stage", 0.25, stage="fetch")
+    registry.observe("stage", 1.0, stage="write")
+    registry.observe("associate_fetch", 0.5, author_id='a "quoted" id')
+
+    assert registry.to_prometheus() == (
+        "# TYPE dblp_fetcher_bytes_received_total counter\n"
+        "dblp_fetcher_bytes_received_total 1024\n"
+        "# TYPE dblp_fetcher_associate_fetch_seconds summary\n"
+        'dblp_fetcher_associate_fetch_seconds_sum{author_id="a \\"quoted\\" id"} 0.5\n'
+        'dblp_fetcher_associate_fetch_seconds_count{author_id="a \\"quoted\\" id"} 1\n'
+        "# TYPE dblp_fetcher_stage_seconds summary\n"
+        'dblp_fetcher_stage_seconds_sum{stage="fetch"} 0.25\n'
+        'dblp_fetcher_stage_seconds_count{stage="fetch"} 1\n'
+        'dblp_fetcher_stage_seconds_sum{stage="write"} 1\n'
+        'dblp_fetcher_stage_seconds_count{stage="write"} 1\n'
+    )
+
+
+def test_write_with_unknown_format():
+    with pytest.raises(ValueError):
+        MetricsRegistry().write(io.StringIO(), "xml")
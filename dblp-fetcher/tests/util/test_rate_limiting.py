@@ -0,0 +1,37 @@
+import time
+from typing import Optional
+
+import pytest
+
+from dblp_fetcher.util import RateLimiter
+
+
+def test_wait_limits_requests_to_same_host():
+    rate_limiter = RateLimiter(requests_per_second=20)
+
+    start = time.monotonic()
+    for _ in range(3):
+        rate_limiter.wait("https://dblp.org/pid/1")
+
+    assert time.monotonic() - start >= 0.09
+
+
+def test_wait_does_not_limit_requests_to_different_hosts():
+    rate_limiter = RateLimiter(requests_per_second=1)
+
+    start = time.monotonic()
+    rate_limiter.wait("https://dblp.org/pid/1")
+    rate_limiter.wait("https://example.org/pid/1")
+
+    assert time.monotonic() - start < 0.5
+
+
+@pytest.mark.parametrize("requests_per_second", [None, 0, -1])
+def test_wait_without_limit(requests_per_second: Optional[float]):
+    rate_limiter = RateLimiter(requests_per_second)
+
+    start = time.monotonic()
+    for _ in range(100):
+        rate_limiter.wait("https://dblp.org/pid/1")
+
+    assert time.monotonic() - start < 0.5
@@ -0,0 +1,50 @@
+import json
+import re
+from pathlib import Path
+
+import pytest
+
+from dblp_fetcher.util import SubstitutionEngine
+
+_DATA_PATH = Path(__file__).parents[2] / "data"
+
+
+def _apply_sequentially(rules: list[tuple[str, str]], value: str) -> str:
+    for pattern, replacement in rules:
+        value = re.sub(pattern, replacement, value)
+    return value
+
+
+@pytest.mark.parametrize(
+    "value,expected", [
+        ("no backslash", "no backslash"),
+        ("\\textendash  x", "\\textendash x"),
+        ("a\\ast b\\ast", "a* b* "),
+        ("\\textasciigrave\\textasciitilde x", "\\textasciigrave{}\\textasciitilde{}x"),
+        ("\\emph{unchanged}", "\\emph{unchanged}"),
+    ]
+)
+def test_apply_with_default_rules(value: str, expected: str):
+    engine = SubstitutionEngine.from_file(str(_DATA_PATH / "replacements.json"))
+
+    assert engine.apply(value) == expected
+
+
+def test_apply_with_group_references():
+    engine = SubstitutionEngine([(r"(\d+)-(\d+)", r"\1--\2"), (r"x(y)?", r"<\1>")])
+
+    assert engine.apply("pages 1-2, xy") == "pages 1--2, <y>"
+
+
+def test_apply_without_rules():
+    assert SubstitutionEngine([]).apply("value") == "value"
+
+
+def test_apply_matches_sequential_substitution_on_known_publications():
+    with open(_DATA_PATH / "replacements.json", "r", encoding="UTF-8") as file:
+        rules = [tuple(rule) for rule in json.load(file)]
+    engine = SubstitutionEngine(rules)
+
+    with open(_DATA_PATH / "sda.bib", "r", encoding="UTF-8") as bib:
+        for line in bib:
+            assert engine.apply(line) == _apply_sequentially(rules, line)